@@ -0,0 +1,292 @@
+'''
+Benchmarks.py
+Description: Performance suite for the game core and renderer. Times board construction and reset, mine placement,
+             flood fill on worst-case open boards, flag toggling and board rendering across a grid of board sizes and
+             mine densities. Results are written as JSON and can be compared against a saved baseline to catch
+             regressions. Also compares placing mines one at a time through BoardManager.set_mine against the bulk
+             BoardManager.place_mines path, and checks that both produce identical boards.
+Inputs: Command line options (benchmarks, board sizes, mine densities, repeat count, output and baseline files)
+Outputs: Timing table printed to stdout, optional JSON results file, non-zero exit code on regressions
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from BoardManager import BoardManager
+from GameLogic import GameLogic, GameState
+
+
+DEFAULT_SIZES = [10, 100, 500]
+DEFAULT_DENSITIES = [0.01, 0.1, 0.2]
+DEFAULT_THRESHOLD = 0.25 # slowdown against the baseline reported as a regression
+FLAG_TOGGLES = 10000 # toggles per toggle_flagged_cell measurement
+
+
+def best_time(func, repeat, setup=None):
+  '''return the fastest of repeat runs of func(state), in seconds, where state = setup() is rebuilt untimed each run'''
+  best = None
+  for _ in range(repeat):
+    state = setup() if setup is not None else None
+    start = time.perf_counter()
+    func(state)
+    elapsed = time.perf_counter() - start
+    if best is None or elapsed < best:
+      best = elapsed
+  return best
+
+
+def result(benchmark, size, density, seconds, operations=1):
+  '''one machine-readable measurement'''
+  return {
+    "benchmark": benchmark,
+    "size": size,
+    "density": density,
+    "seconds": seconds,
+    "ops_per_second": operations / seconds if seconds else None,
+  }
+
+
+# Board generation: incremental against bulk
+
+def place_incremental(board, positions):
+  '''place mines one at a time, updating neighbor counts per mine'''
+  board.clear_mines_and_counts()
+  for r, c in positions:
+    board.set_mine(r, c, True)
+
+
+def place_bulk(board, positions):
+  '''place all mines, then compute every neighbor count in one pass'''
+  board.place_mines(positions)
+
+
+def bench_generation(sizes, densities, repeat=3, seed=0):
+  '''time both generation paths for every (size, density) pair'''
+  rng = random.Random(seed)
+  results = []
+  for size in sizes:
+    incremental = BoardManager(size, size)
+    bulk = BoardManager(size, size)
+    for density in densities:
+      mines = int(size * size * density)
+      positions = [divmod(i, size) for i in rng.sample(range(size * size), k=mines)]
+
+      incremental_time = best_time(lambda _: place_incremental(incremental, positions), repeat)
+      bulk_time = best_time(lambda _: place_bulk(bulk, positions), repeat)
+
+      # both paths must produce the same board
+      if incremental.mines != bulk.mines or incremental.counts != bulk.counts:
+        raise AssertionError(f"bulk generation differs from incremental on {size}x{size} with {mines} mines")
+
+      results.append(result("generation_incremental", size, density, incremental_time, mines))
+      results.append(result("generation_bulk", size, density, bulk_time, mines))
+  return results
+
+
+# Board construction and reset
+
+def bench_board(sizes, densities, repeat=3, seed=0):
+  '''BoardManager construction and reset, neither depends on the mine density'''
+  results = []
+  for size in sizes:
+    results.append(result("board_construct", size, None,
+                          best_time(lambda _: BoardManager(size, size), repeat), size * size))
+    board = BoardManager(size, size)
+    results.append(result("board_reset", size, None, best_time(lambda _: board.reset(), repeat), size * size))
+  return results
+
+
+# Mine placement
+
+def bench_place_unique_mines(sizes, densities, repeat=3, seed=0):
+  '''BoardManager.place_unique_mines with a seeded generator'''
+  results = []
+  for size in sizes:
+    board = BoardManager(size, size)
+    for density in densities:
+      mines = int(size * size * density)
+      rng = random.Random(seed)
+      seconds = best_time(lambda _: board.place_unique_mines(mines, exclude=(0, 0), rng=rng), repeat)
+      results.append(result("place_unique_mines", size, density, seconds, mines))
+  return results
+
+
+# Flood fill
+
+def open_board(size, density, seed):
+  '''a game whose first click opens as much as possible: mines packed into the last rows, click in the far corner'''
+  game = GameLogic(size, size, seed=seed)
+  mines = min(int(size * size * density), size * size - size)
+  game.set_mines(mines)
+  game.state = GameState.Playing
+  game.board.place_mines(divmod(size * size - 1 - i, size) for i in range(mines))
+  return game
+
+
+def bench_uncover(sizes, densities, repeat=3, seed=0):
+  '''GameLogic.uncover_cell on worst-case open boards, one click opens every safe cell'''
+  results = []
+  for size in sizes:
+    for density in densities:
+      game = None
+
+      def setup():
+        nonlocal game
+        game = open_board(size, density, seed)
+        return game
+
+      seconds = best_time(lambda g: g.uncover_cell(0, 0), repeat, setup)
+      opened = size * size - game.covered_cells
+      results.append(result("uncover_open_board", size, density, seconds, opened))
+  return results
+
+
+# Flag toggling
+
+def bench_toggle_flags(sizes, densities, repeat=3, seed=0):
+  '''GameLogic.toggle_flagged_cell throughput on random covered cells'''
+  results = []
+  for size in sizes:
+    for density in densities:
+      game = GameLogic(size, size, seed=seed)
+      game.set_mines(max(int(size * size * density), 1))
+      game.start_game()
+      game.flags_remaining = FLAG_TOGGLES # never run out of flags during the measurement
+      rng = random.Random(seed)
+      cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(FLAG_TOGGLES)]
+
+      def toggle(_):
+        for row, col in cells:
+          game.toggle_flagged_cell(row, col)
+
+      results.append(result("toggle_flagged_cell", size, density, best_time(toggle, repeat), FLAG_TOGGLES))
+  return results
+
+
+# Rendering
+
+def bench_render(sizes, densities, repeat=3, seed=0):
+  '''UserInterface.render_board on an offscreen surface, at the default zoom and zoomed all the way out'''
+  os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+  try:
+    import pygame
+    import UserInterface as ui
+    from Viewport import Viewport, MIN_PITCH
+  except ImportError as error:
+    print(f"skipping render benchmarks: {error}", file=sys.stderr)
+    return []
+
+  screen = pygame.Surface((ui.SCREEN_WIDTH, ui.SCREEN_LENGTH))
+  results = []
+  for size in sizes:
+    for density in densities:
+      # half the board uncovered so every kind of tile is drawn
+      game = open_board(size, density, seed)
+      game.flood_fill(0, 0)
+      game.state = GameState.EndLose # also reveals the mines
+      for pitch, name in ((ui.DISTANCE_BETWEEN_CELLS, "render_board"), (MIN_PITCH, "render_board_zoomed_out")):
+        viewport = Viewport(ui.BOARD_AREA, size, size, pitch)
+        ui.screen, ui.game, ui.viewport = screen, game, viewport
+        viewport.sprites(ui.load_assets()) # scale outside the measurement, as after the first frame
+        first_row, end_row, first_col, end_col = viewport.visible_range()
+        cells = (end_row - first_row) * (end_col - first_col)
+        results.append(result(name, size, density, best_time(lambda _: ui.render_board(), repeat), cells))
+  return results
+
+
+SUITE = {
+  "generation": bench_generation,
+  "board": bench_board,
+  "place_unique_mines": bench_place_unique_mines,
+  "uncover": bench_uncover,
+  "toggle_flags": bench_toggle_flags,
+  "render": bench_render,
+}
+
+
+# Reporting
+
+def key(measurement):
+  return (measurement["benchmark"], measurement["size"], measurement["density"])
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+  '''add the baseline time and ratio to every result that has one, returns the results slower than the threshold'''
+  previous = {key(measurement): measurement for measurement in baseline}
+  regressions = []
+  for measurement in results:
+    old = previous.get(key(measurement))
+    if old is None or not old["seconds"]:
+      continue
+    measurement["baseline_seconds"] = old["seconds"]
+    measurement["ratio"] = measurement["seconds"] / old["seconds"]
+    if measurement["ratio"] > 1 + threshold:
+      regressions.append(measurement)
+  return regressions
+
+
+def print_results(results):
+  '''print results as a table'''
+  print(f"{'benchmark':<26} {'board':>11} {'density':>8} {'time':>12} {'ops/s':>14} {'vs base':>8}")
+  for measurement in results:
+    board = f"{measurement['size']}x{measurement['size']}"
+    density = "-" if measurement["density"] is None else f"{measurement['density']:.2f}"
+    ops = measurement["ops_per_second"]
+    ops = "-" if ops is None else f"{ops:,.0f}"
+    ratio = f"{measurement['ratio']:.2f}x" if "ratio" in measurement else "-"
+    print(f"{measurement['benchmark']:<26} {board:>11} {density:>8} {measurement['seconds'] * 1000:>10.3f}ms "
+          f"{ops:>14} {ratio:>8}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Minesweeper performance benchmarks")
+  parser.add_argument("--benchmarks", nargs="+", choices=sorted(SUITE), default=sorted(SUITE),
+                      help="benchmarks to run (default: all)")
+  parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="board side lengths")
+  parser.add_argument("--densities", type=float, nargs="+", default=DEFAULT_DENSITIES, help="mine densities (0-1)")
+  parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is kept")
+  parser.add_argument("--seed", type=int, default=0, help="seed for mine positions")
+  parser.add_argument("--output", help="write results to this JSON file")
+  parser.add_argument("--baseline", help="JSON results file to compare against")
+  parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                      help="allowed slowdown against the baseline before it counts as a regression")
+  args = parser.parse_args()
+
+  results = []
+  for name in args.benchmarks:
+    results.extend(SUITE[name](args.sizes, args.densities, args.repeat, args.seed))
+
+  regressions = []
+  if args.baseline:
+    with open(args.baseline) as file:
+      regressions = compare(results, json.load(file)["results"], args.threshold)
+
+  print_results(results)
+
+  if args.output:
+    with open(args.output, "w") as file:
+      json.dump({
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+      }, file, indent=2)
+
+  if regressions:
+    print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+    for measurement in regressions:
+      print(f"  {measurement['benchmark']} {measurement['size']}x{measurement['size']} "
+            f"density {measurement['density']}: {measurement['ratio']:.2f}x slower")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -1,6 +1,6 @@
 '''
 BoardManager.py
-Description: Manages the game board state for Minesweeper. Owns the Cell class representing each cell and the BoardManager class for the grid.
+Description: Manages the game board state for Minesweeper. Owns the Cell view class representing each cell and the BoardManager class for the grid.
 Inputs: None
 Outputs: None
 Author: Landon Bever
@@ -9,16 +9,75 @@ Creation Date: 09/10/2025
 '''
 
 import random
+from operator import add
+
+import Topology
+
+# place_mines updates counts per mine when there is less than one mine per this many cells, below about 10%
+# density that beats the bulk compute_counts pass
+SPARSE_MINE_RATIO = 10
+
+
+def sample_cells(rng, size, k, exclude=None):
+  """k unique flat indices from range(size), skipping exclude if given
+  uses Floyd's algorithm, so time and memory grow with k rather than with size"""
+  n = size if exclude is None else size - 1
+  if not 0 <= k <= n:
+    raise ValueError("sample larger than the number of available cells")
+  chosen = set()
+  order = [] # sets of ints iterate in hash order, keep draw order for a stable result
+  for j in range(n - k, n):
+    t = rng.randrange(j + 1)
+    if t in chosen:
+      t = j
+    chosen.add(t)
+    order.append(t)
+  if exclude is not None: # shift indices at or past the excluded cell up by one
+    order = [i + 1 if i >= exclude else i for i in order]
+  return order
 
 
 class Cell:
-  '''represents a single cell on the Minesweeper board'''
-  def __init__(self):
-    '''initialize cell properties'''
-    self.is_covered = True
-    self.flagged = False
-    self.is_mine = False
-    self.neighbor_count = 0
+  '''lightweight view of a single cell on the Minesweeper board
+  the cell state itself lives in the board's flat state planes'''
+  __slots__ = ("_board", "_index")
+
+  def __init__(self, board, r, c):
+    '''bind the view to cell (r,c) of board'''
+    self._board = board
+    self._index = r * board.cols + c
+
+  @property
+  def is_covered(self):
+    return self._board.covered[self._index] == 1
+
+  @is_covered.setter
+  def is_covered(self, value):
+    self._board.covered[self._index] = 1 if value else 0
+
+  @property
+  def flagged(self):
+    return self._board.flagged[self._index] == 1
+
+  @flagged.setter
+  def flagged(self, value):
+    self._board.flagged[self._index] = 1 if value else 0
+
+  @property
+  def is_mine(self):
+    return self._board.mines[self._index] == 1
+
+  @is_mine.setter
+  def is_mine(self, value):
+    self._board.mines[self._index] = 1 if value else 0
+
+  @property
+  def neighbor_count(self):
+    return self._board.counts[self._index]
+
+  @neighbor_count.setter
+  def neighbor_count(self, value):
+    self._board.counts[self._index] = value
 
   def reset(self):
     '''reset cell to initial state'''
@@ -28,20 +87,76 @@ class Cell:
     self.neighbor_count = 0
 
 
+class _GridRow:
+  '''row of cell views, supports grid[r][c]'''
+  __slots__ = ("_board", "_r")
+
+  def __init__(self, board, r):
+    self._board = board
+    self._r = r
+
+  def __len__(self):
+    return self._board.cols
+
+  def __getitem__(self, c):
+    if not 0 <= c < self._board.cols:
+      raise IndexError("column index out of range")
+    return Cell(self._board, self._r, c)
+
+  def __iter__(self):
+    for c in range(self._board.cols):
+      yield Cell(self._board, self._r, c)
+
+
+class _Grid:
+  '''list-of-rows view over the board planes, supports grid[r][c]'''
+  __slots__ = ("_board",)
+
+  def __init__(self, board):
+    self._board = board
+
+  def __len__(self):
+    return self._board.rows
+
+  def __getitem__(self, r):
+    if not 0 <= r < self._board.rows:
+      raise IndexError("row index out of range")
+    return _GridRow(self._board, r)
+
+  def __iter__(self):
+    for r in range(self._board.rows):
+      yield _GridRow(self._board, r)
+
+
 class BoardManager:
   '''manages the Minesweeper board'''
-  def __init__(self, rows=10, cols=10):
-    '''initialize board with given dimensions'''
+  def __init__(self, rows=10, cols=10, planes=None, topology=None):
+    '''initialize board with given dimensions
+    planes optionally supplies existing writable buffers (covered, flagged, mines, counts) of rows * cols bytes,
+    such as memoryviews over a memory-mapped save file, which are used in place without copying
+    topology is a Topology.Topology for the board's geometry, the square grid by default'''
     self.rows = rows
     self.cols = cols
-    self.grid = []
+    self.size = rows * cols
+    self.topology = topology if topology is not None else Topology.square(rows, cols)
+    if (self.topology.rows, self.topology.cols) != (rows, cols):
+      raise ValueError("topology was built for a different board size")
 
-    # create grid of cells
-    for r in range(rows):
-      row = []
-      for c in range(cols):
-        row.append(Cell())
-      self.grid.append(row)
+    # one byte per cell for each piece of cell state, indexed by r * cols + c
+    if planes is None:
+      self.covered = bytearray(b"\x01") * self.size
+      self.flagged = bytearray(self.size)
+      self.mines = bytearray(self.size)
+      self.counts = bytearray(self.size)
+    else:
+      if any(len(plane) != self.size for plane in planes):
+        raise ValueError("every state plane must hold rows * cols bytes")
+      self.covered, self.flagged, self.mines, self.counts = planes
+    # mmap backing the planes when they live in a save file (see SaveGame.load_game)
+    self.mapping = None
+
+    # grid[r][c] hands out Cell views into the planes above
+    self.grid = _Grid(self)
 
   def in_bounds(self, r, c):
     """check if (r,c) is within board"""
@@ -49,56 +164,34 @@ class BoardManager:
 
   def neighbors(self, r, c):
     """return a list of in bounds neighbors"""
-    result = []
-    nr = r - 1
-    while nr <= r + 1: # iterate through rows
-      nc = c - 1
-      while nc <= c + 1: # iterate through cols
-        if not (nr == r and nc == c) and self.in_bounds(nr, nc): # skip self and out of bounds
-          result.append((nr, nc))
-        nc += 1
-      nr += 1
-    return result
+    cols = self.cols
+    return [divmod(n, cols) for n in self.topology.neighbors(r * cols + c)]
 
   def reset(self):
     """reset all cells"""
-    r = 0
-    while r < self.rows: # iterate through rows
-      c = 0
-      while c < self.cols: # iterate through cols
-        self.grid[r][c].reset() # reset each cell
-        c += 1
-      r += 1
+    self.covered[:] = b"\x01" * self.size
+    self.flagged[:] = bytes(self.size)
+    self.clear_mines_and_counts()
 
   def clear_mines_and_counts(self):
     """remove all mines and set neighbor counts to 0"""
-    r = 0
-    while r < self.rows: # iterate through rows
-      c = 0
-      while c < self.cols: # iterate through cols
-        cell = self.grid[r][c] # get cell
-        cell.is_mine = False 
-        cell.neighbor_count = 0
-        c += 1
-      r += 1
+    self.mines[:] = bytes(self.size)
+    self.counts[:] = bytes(self.size)
 
   def adjust_neighbor_counts(self, r, c, amount):
-    """adjust neighbor_count in 3x3 area around (r,c)"""
-    nr = r - 1
-    while nr <= r + 1: # iterate through rows
-      nc = c - 1
-      while nc <= c + 1: # iterate through cols
-        if self.in_bounds(nr, nc): # skip out of bounds
-          self.grid[nr][nc].neighbor_count += amount # adjust count
-        nc += 1
-      nr += 1
+    """adjust neighbor_count of (r,c) and its neighbors"""
+    i = r * self.cols + c
+    counts = self.counts
+    counts[i] += amount
+    for d in self.topology.offsets(i):
+      counts[i + d] += amount
 
   def set_mine(self, r, c, value):
     """mine setter with neighbor count updates"""
-    cell = self.grid[r][c] # get cell
-    if cell.is_mine == value:
+    i = r * self.cols + c # flat index of cell
+    if self.mines[i] == value:
       return
-    cell.is_mine = value 
+    self.mines[i] = 1 if value else 0
     if value: # if placing a mine, increment neighbor counts
       self.adjust_neighbor_counts(r, c, 1)
     else: # if removing a mine, decrement neighbor counts
@@ -106,46 +199,98 @@ class BoardManager:
 
   def toggle_mine(self, r, c):
     """toggle mine"""
-    self.set_mine(r, c, not self.grid[r][c].is_mine)
+    self.set_mine(r, c, not self.mines[r * self.cols + c])
 
-  def place_unique_mines(self, total_mines, exclude=None):
-    """place mines at unique random locations, guarantee safe spot if exclude is given"""
+  def place_unique_mines(self, total_mines, exclude=None, rng=None):
+    """place mines at unique random locations, guarantee safe spot if exclude is given
+    draws from rng (a random.Random) when given, so the same seed always gives the same board"""
+    cols = self.cols
+    chosen = sample_cells(rng or random, self.size, total_mines, exclude=None if exclude is None else exclude[0] * cols + exclude[1])
+    self.place_mines(divmod(i, cols) for i in chosen)
+
+  def place_mines(self, positions):
+    """replace the current mines with mines at the given (r,c) positions, then compute all counts in one pass"""
     self.clear_mines_and_counts() # clear existing mines and counts
-    coords = []
+    mines = self.mines
+    cols = self.cols
+    placed = []
+    for r, c in positions:
+      i = r * cols + c
+      if not mines[i]:
+        mines[i] = 1
+        placed.append((r, c))
+
+    # on very sparse boards touching 9 cells per mine beats sweeping every row
+    if len(placed) * SPARSE_MINE_RATIO < self.size:
+      for r, c in placed:
+        self.adjust_neighbor_counts(r, c, 1)
+    else:
+      self.compute_counts()
+
+  def compute_counts(self):
+    """recompute every neighbor count from the mine plane
+    each count is the number of mines among the cell and its neighbors, like adjust_neighbor_counts"""
+    if self.topology.name != "square":
+      self.compute_counts_from_table()
+      return
+    # square grids: the count is the 3x3 box sum, built from shifted row sums so rows with no nearby mines are
+    # skipped entirely
+    rows, cols = self.rows, self.cols
+    mines, counts = self.mines, self.counts
+    zero = bytes(cols)
+
+    def row_sum(r):
+      """horizontal 3-wide sums of mine row r"""
+      if r < 0 or r >= rows:
+        return zero
+      row = bytes(mines[r * cols:(r + 1) * cols])
+      if row.find(1) < 0: # no mines in this row
+        return zero
+      left = b"\x00" + row[:-1]
+      right = row[1:] + b"\x00"
+      return bytes(map(add, map(add, left, row), right))
+
+    above, current = zero, row_sum(0)
     r = 0
-    while r < self.rows: # iterate through rows
-      c = 0
-      while c < self.cols: # iterate through cols
-        # only add to possible coords if not excluded
-        if exclude is None or not (r == exclude[0] and c == exclude[1]):
-          coords.append((r, c)) 
-        c += 1
+    while r < rows: # iterate through rows
+      below = row_sum(r + 1)
+      if above is zero and current is zero and below is zero:
+        counts[r * cols:(r + 1) * cols] = zero
+      else:
+        counts[r * cols:(r + 1) * cols] = bytes(map(add, map(add, above, current), below))
+      above, current = current, below
       r += 1
 
-    chosen = random.sample(coords, k=total_mines) # choose unique random coordinates
-
-    i = 0
-    while i < len(chosen): # place mines at chosen coordinates
-      rr, cc = chosen[i]
-      self.set_mine(rr, cc, True)
-      i += 1
+  def compute_counts_from_table(self):
+    """recompute every neighbor count by adding each mine to its neighbors through the topology table"""
+    mines, counts = self.mines, self.counts
+    row_tables, col_classes = self.topology.row_tables, self.topology.col_classes
+    counts[:] = mines
+    cols = self.cols
+    found = bytes(mines) # memoryview planes have no find
+    i = found.find(1)
+    while i >= 0:
+      r, c = divmod(i, cols)
+      for d in row_tables[r][col_classes[r][c]]:
+        counts[i + d] += 1
+      i = found.find(1, i + 1)
 
   def uncover(self, r, c):
     '''uncover cell at (r,c)'''
-    self.grid[r][c].is_covered = False
+    self.covered[r * self.cols + c] = 0
 
   def cover(self, r, c):
     '''cover cell at (r,c)'''
-    self.grid[r][c].is_covered = True
+    self.covered[r * self.cols + c] = 1
 
   def set_flag(self, r, c, value):
     '''set flag state at (r,c)'''
-    self.grid[r][c].flagged = value
+    self.flagged[r * self.cols + c] = 1 if value else 0
 
   def toggle_flag(self, r, c):
     '''toggle flag state at (r,c)'''
-    self.grid[r][c].flagged = not self.grid[r][c].flagged
+    self.flagged[r * self.cols + c] ^= 1
 
   def cell(self, r, c):
-    '''get cell at (r,c)'''
-    return self.grid[r][c]
\ No newline at end of file
+    '''get a view of the cell at (r,c)'''
+    return Cell(self, r, c)
@@ -0,0 +1,274 @@
+'''
+BoardPool.py
+Description: No-guess board generation. A board is accepted only if Solver can win it from the first click by
+             logic alone, which takes many rejected attempts, so boards are generated ahead of time in a background
+             process pool and kept in a bounded cache per (size, mine count, first click region). A first click
+             region is a cell together with its mirror images (and transposes on square boards): a board solvable
+             from one of them is flipped into a board solvable from any other. A new game queues boards for the
+             regions of the corners, edges and center; a first click anywhere else is queued when it happens and gets
+             an ordinary board if none arrives in time. NoGuessGame takes its board from the cache on the first click.
+Inputs: Board size, mine count, first click
+Outputs: Mine positions of boards solvable without guessing
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import multiprocessing
+import random
+import signal
+import threading
+import time
+from collections import OrderedDict, deque
+
+from BoardManager import sample_cells
+from GameLogic import GameLogic, GameState
+from Solver import Solver, play_forced
+
+
+MAX_ATTEMPTS = 2000 # boards tried per generation request before giving up
+BOARDS_PER_REGION = 4 # ready boards kept per cache key
+MAX_REGIONS = 256 # cache keys kept, least recently used keys are dropped first
+MAX_PENDING = 64 # generation tasks in flight per pool, further refills wait for a later take
+MISS_WAIT = 0.05 # seconds a first click with no ready board waits for the pool before settling for a guessing board
+RETRY_AFTER = 60.0 # seconds before a key no attempt could solve is tried again
+
+
+# Symmetry
+
+def transforms(rows, cols):
+  '''(transpose, flip rows, flip cols) combinations that map a rows x cols board onto itself'''
+  result = [(False, fr, fc) for fr in (False, True) for fc in (False, True)]
+  if rows == cols:
+    result += [(True, fr, fc) for fr in (False, True) for fc in (False, True)]
+  return result
+
+
+def apply(transform, rows, cols, r, c):
+  '''image of cell (r, c) under transform'''
+  transpose, flip_rows, flip_cols = transform
+  if transpose:
+    r, c = c, r
+  if flip_rows:
+    r = rows - 1 - r
+  if flip_cols:
+    c = cols - 1 - c
+  return r, c
+
+
+def canonical(rows, cols, r, c):
+  '''the representative of the first click region holding (r, c)'''
+  return min(apply(t, rows, cols, r, c) for t in transforms(rows, cols))
+
+
+def first_clicks(rows, cols):
+  '''the first clicks boards are generated for ahead of time: corners, middles of the edges and the center'''
+  last_row, last_col, mid_row, mid_col = rows - 1, cols - 1, rows // 2, cols // 2
+  return {(r, c) for r in (0, mid_row, last_row) for c in (0, mid_col, last_col)}
+
+
+def orient(positions, rows, cols, source, target):
+  '''map mine positions of a board solvable from source onto a board solvable from target (same region)'''
+  for t in transforms(rows, cols):
+    if apply(t, rows, cols, *source) == target:
+      return [apply(t, rows, cols, i // cols, i % cols) for i in positions]
+  raise ValueError(f"{source} and {target} are not in the same first click region")
+
+
+# Generation
+
+def generate(rows, cols, mines, click, seed, max_attempts=MAX_ATTEMPTS):
+  '''flat mine indices of a board that Solver wins from click without guessing, or None if no attempt worked
+  the click and its neighbors are kept free of mines so the first click always opens an area'''
+  rng = random.Random(seed)
+  size = rows * cols
+  r, c = click
+  game = GameLogic(rows, cols)
+  near = {r * cols + c, *game.board.topology.neighbors(r * cols + c)}
+  if size - len(near) < mines:
+    near = {r * cols + c} # too dense for an opening, only keep the clicked cell safe
+  allowed = [i for i in range(size) if i not in near]
+  if len(allowed) < mines:
+    return None
+
+  solver = Solver(game)
+  for _ in range(max_attempts):
+    game.reset_game(seed=0)
+    game.set_mines(mines)
+    game.state = GameState.Playing
+    positions = [allowed[j] for j in sample_cells(rng, len(allowed), mines)]
+    game.board.place_mines(divmod(i, cols) for i in positions)
+    game.uncover_cell(r, c)
+    if play_forced(game, solver):
+      return positions
+  return None
+
+
+def init_worker():
+  '''restore default SIGTERM handling in workers, a parent running pygame has SDL's handler installed, which
+  turns SIGTERM into a quit event and would keep Pool.terminate from stopping the worker'''
+  signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def timed_generate(rows, cols, mines, click, seed):
+  '''(generate's result, seconds it took)'''
+  start = time.perf_counter()
+  positions = generate(rows, cols, mines, click, seed)
+  return positions, time.perf_counter() - start
+
+
+def generate_task(task):
+  '''worker entry point, returns (key, positions or None, seconds taken)'''
+  key, seed = task
+  rows, cols, mines, click = key
+  return (key, *timed_generate(rows, cols, mines, click, seed))
+
+
+class BoardPool:
+  '''bounded cache of no-guess boards, refilled in the background by a process pool'''
+  def __init__(self, workers=None, per_region=BOARDS_PER_REGION, max_regions=MAX_REGIONS, max_pending=MAX_PENDING,
+               miss_wait=MISS_WAIT, seed=None):
+    self.per_region = per_region
+    self.max_regions = max_regions
+    self.max_pending = max_pending
+    self.miss_wait = miss_wait
+    self.rng = random.Random(seed)
+    self.cache = OrderedDict() # (rows, cols, mines, canonical click) -> deque of (mine indices, seconds taken)
+    self.pending = {} # key -> generation tasks in flight
+    self.in_flight = 0 # sum of pending
+    self.failed = {} # key -> time.monotonic() when no attempt could solve it, served with ordinary boards for a while
+    self.lock = threading.Lock() # the pool delivers results on its own thread
+    self.ready = threading.Condition(self.lock) # notified whenever a task finishes
+    self.workers = workers # 0 generates only on demand, in the calling process
+    self.pool = None # started with the first background request
+    self.hits = 0
+    self.misses = 0
+
+  def close(self):
+    if self.pool is not None:
+      self.pool.terminate()
+      self.pool = None
+    self.workers = 0
+
+  def key(self, rows, cols, mines, click):
+    return rows, cols, mines, canonical(rows, cols, *click)
+
+  def failing(self, key):
+    '''True if key failed recently, called with the lock held'''
+    failed = self.failed.get(key)
+    if failed is None:
+      return False
+    if time.monotonic() - failed < RETRY_AFTER:
+      return True
+    del self.failed[key]
+    return False
+
+  def store(self, result):
+    '''pool callback, files a generated board under its key'''
+    key, positions, seconds = result
+    with self.lock:
+      self.pending[key] -= 1
+      if not self.pending[key]:
+        del self.pending[key]
+      self.in_flight -= 1
+      self.ready.notify_all()
+      if positions is None:
+        self.failed[key] = time.monotonic()
+        return
+      boards = self.cache.get(key)
+      if boards is None:
+        boards = self.cache[key] = deque(maxlen=self.per_region)
+        if len(self.cache) > self.max_regions:
+          self.cache.popitem(last=False)
+      boards.append((positions, seconds))
+
+  def refill(self, key):
+    '''queue background work to bring key back up to per_region boards, as far as max_pending allows'''
+    if self.workers == 0:
+      return
+    if self.pool is None:
+      self.pool = multiprocessing.Pool(self.workers, initializer=init_worker)
+    with self.lock:
+      if self.failing(key):
+        return
+      have = len(self.cache.get(key, ())) + self.pending.get(key, 0)
+      missing = min(self.per_region - have, self.max_pending - self.in_flight)
+      if missing <= 0:
+        return
+      self.pending[key] = self.pending.get(key, 0) + missing
+      self.in_flight += missing
+      seeds = [self.rng.randrange(1 << 63) for _ in range(missing)]
+    for seed in seeds:
+      self.pool.apply_async(generate_task, ((key, seed),), callback=self.store)
+
+  def prefill(self, rows, cols, mines):
+    '''start generating boards for the first clicks most games open with (see first_clicks)'''
+    for click in first_clicks(rows, cols):
+      self.refill(self.key(rows, cols, mines, click))
+
+  def pop(self, key):
+    '''a ready board for key or None, called with the lock held'''
+    boards = self.cache.get(key)
+    if not boards:
+      return None
+    self.cache.move_to_end(key)
+    return boards.popleft()
+
+  def take(self, rows, cols, mines, click):
+    '''(mine positions (row, col), seconds generating it took) of a no-guess board for a first click, from the
+    cache when one is ready
+    on a miss the board is generated in the background and waited for at most miss_wait seconds (without workers
+    it is generated on the spot), returns None when no board is ready in time or the density is too high'''
+    key = self.key(rows, cols, mines, click)
+    with self.lock:
+      board = self.pop(key)
+    if board is not None:
+      self.hits += 1
+      self.refill(key)
+    elif self.workers == 0:
+      self.misses += 1
+      with self.lock:
+        if self.failing(key):
+          return None
+      board = timed_generate(rows, cols, mines, key[3], self.rng.randrange(1 << 63))
+      if board[0] is None:
+        with self.lock:
+          self.failed[key] = time.monotonic()
+        return None
+    else:
+      self.misses += 1
+      self.refill(key) # also leaves boards for the next game opening in this region
+      with self.ready:
+        self.ready.wait_for(lambda: self.cache.get(key) or key not in self.pending, self.miss_wait)
+        board = self.pop(key)
+      if board is None:
+        return None
+    positions, seconds = board
+    return orient(positions, rows, cols, key[3], tuple(click)), seconds
+
+
+class NoGuessGame(GameLogic):
+  '''GameLogic whose board is placed on the first click from a BoardPool, so it can be won without guessing
+  boards come from the pool rather than the game's seed, so from_seed and move log replay do not rebuild them'''
+  def __init__(self, rows: int = 10, cols: int = 10, pool: BoardPool = None, seed: int = None):
+    super().__init__(rows, cols, seed)
+    self.pool = pool or BoardPool(workers=0)
+
+  def initialize_board(self):
+    """no mines until the first click, start generating boards for it in the background"""
+    self.board.clear_mines_and_counts()
+    self.pool.prefill(self.board.rows, self.board.cols, self.total_mines)
+
+  def uncover_first_cell(self, row: int, col: int):
+    """place a no-guess board for this first click, or an ordinary one if none is ready
+    only called once per game, the dealt board stays when the first click is undone"""
+    board = self.board
+    taken = self.pool.take(board.rows, board.cols, self.total_mines, (row, col))
+    if taken is None:
+      start = time.perf_counter()
+      board.place_unique_mines(self.total_mines, exclude=(row, col), rng=self.rng)
+      self.board_generated("first_click", time.perf_counter() - start)
+    else:
+      positions, seconds = taken
+      board.place_mines(positions)
+      self.board_generated("pool", seconds)
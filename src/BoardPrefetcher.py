@@ -0,0 +1,66 @@
+'''
+BoardPrefetcher.py
+Description: Double-buffered boards for instant restarts. While a game is in progress a background thread resets
+             a spare BoardManager and lays out the next game's mines on it. Restarting swaps the spare in for the
+             current board in constant time, and the board it replaces becomes the next spare, so the two boards
+             are reused for the whole session instead of being reallocated.
+Inputs: GameLogic
+Outputs: Prepared boards swapped into the game
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import random
+import threading
+import time
+
+from BoardManager import BoardManager
+
+
+class BoardPrefetcher:
+  '''prepares the next board for a GameLogic in the background and swaps it in on restart
+  the prepared layout is the one GameLogic.from_seed would build from the prepared seed, so replays still work'''
+  def __init__(self, game):
+    self.game = game
+    self.spare = BoardManager(game.board.rows, game.board.cols)
+    self.thread = None
+    self.ready = None # (mine count, seed, rng, seconds taken) laid out on the spare board
+    self.swaps = 0
+
+  def prepare(self, mines, seed=None):
+    '''start preparing a board with mines mines in the background, usually right after a game starts'''
+    self.wait()
+    if seed is None:
+      seed = random.randrange(1 << 63)
+    self.ready = None
+    self.thread = threading.Thread(target=self.build, args=(mines, seed), name="board-prefetch", daemon=True)
+    self.thread.start()
+
+  def build(self, mines, seed):
+    '''runs on the background thread, touches only the spare board'''
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    self.spare.reset()
+    # the same call GameLogic.initialize_board makes, so the generator ends up in the same state
+    self.spare.place_unique_mines(mines, rng=rng)
+    self.ready = (mines, seed, rng, time.perf_counter() - start)
+
+  def wait(self):
+    '''block until the board being prepared is done'''
+    if self.thread is not None:
+      self.thread.join()
+      self.thread = None
+
+  def restart(self):
+    '''reset the game, swapping in the prepared board when there is one instead of clearing the current one
+    the prepared mines are kept if the next game asks for the same mine count'''
+    self.wait()
+    game = self.game
+    if self.ready is None:
+      game.reset_game()
+      return
+    prepared, self.ready = self.ready, None
+    self.spare = game.reset_game(seed=prepared[1], board=self.spare)
+    game.prepared = prepared
+    self.swaps += 1
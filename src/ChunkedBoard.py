@@ -0,0 +1,260 @@
+'''
+ChunkedBoard.py
+Description: Unbounded ("infinite") Minesweeper board. The plane is split into fixed-size square chunks whose mines
+             are derived on demand from a global seed and the chunk coordinates. Chunks the player has touched keep
+             their covered/flagged state in memory; chunks only read for mine counts are cached and can be evicted
+             and regenerated at any time. Also owns InfiniteGameLogic, the GameLogic counterpart for this board.
+Inputs: Seed, mine density, chunk size
+Outputs: None
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import random
+from collections import OrderedDict
+from operator import add
+
+from GameLogic import GameState, EndCondition
+
+
+CHUNK_SIZE = 32 # cells per chunk side
+MAX_CACHED_CHUNKS = 1024 # untouched chunks kept around for mine lookups
+MAX_FLOOD_CELLS = 250000 # cells a single click may open, low densities can have unbounded open regions
+
+
+class Chunk:
+  '''state of one touched chunk, each plane is chunk_size * chunk_size bytes indexed by local r * size + c'''
+  __slots__ = ("mines", "counts", "covered", "flagged")
+
+  def __init__(self, mines, counts):
+    self.mines = mines
+    self.counts = counts
+    self.covered = bytearray(b"\x01") * len(mines)
+    self.flagged = bytearray(len(mines))
+
+
+class ChunkedBoard:
+  '''manages an unbounded board made of lazily generated chunks'''
+  def __init__(self, seed=0, density=0.15, chunk_size=CHUNK_SIZE, max_cached=MAX_CACHED_CHUNKS, safe_cell=(0, 0)):
+    if not 0 <= density < 1:
+      raise ValueError("mine density must be in [0, 1)")
+    self.seed = seed
+    self.density = density
+    self.chunk_size = chunk_size
+    self.max_cached = max_cached
+    self.safe_cell = safe_cell # this cell and its neighbors never hold a mine, so the opening click is safe
+    self.mines_per_chunk = round(density * chunk_size * chunk_size)
+
+    self.chunks = {} # (chunk row, chunk col) -> Chunk, chunks with player state
+    self.cache = OrderedDict() # (chunk row, chunk col) -> mine plane, least recently used first
+    self.frontier = [] # uncovered cells a flood fill stopped at its limit before expanding, see resume_region
+
+  # Chunk management
+
+  def generate_mines(self, cr, cc):
+    '''derive the mine plane of chunk (cr, cc) from the seed, always the same for the same seed'''
+    size = self.chunk_size
+    rng = random.Random(f"{self.seed}:{cr}:{cc}")
+    mines = bytearray(size * size)
+    for i in rng.sample(range(size * size), k=self.mines_per_chunk):
+      mines[i] = 1
+
+    # keep the area around the safe cell clear
+    sr, sc = self.safe_cell
+    for r in range(sr - 1, sr + 2):
+      for c in range(sc - 1, sc + 2):
+        if r // size == cr and c // size == cc:
+          mines[(r % size) * size + c % size] = 0
+    return mines
+
+  def chunk_mines(self, cr, cc):
+    '''mine plane of chunk (cr, cc), from a touched chunk, the cache, or freshly generated'''
+    key = (cr, cc)
+    chunk = self.chunks.get(key)
+    if chunk is not None:
+      return chunk.mines
+    mines = self.cache.get(key)
+    if mines is not None:
+      self.cache.move_to_end(key)
+      return mines
+    mines = self.generate_mines(cr, cc)
+    self.cache[key] = mines
+    if len(self.cache) > self.max_cached:
+      self.cache.popitem(last=False) # evict the least recently used chunk, it can be regenerated
+    return mines
+
+  def touch(self, cr, cc):
+    '''return the Chunk at (cr, cc), creating its state and neighbor counts the first time it is touched'''
+    key = (cr, cc)
+    chunk = self.chunks.get(key)
+    if chunk is not None:
+      return chunk
+    mines = self.chunk_mines(cr, cc)
+    counts = self.compute_counts(cr, cc, mines)
+    self.cache.pop(key, None) # only after the counts, which read the chunk's own mines too
+    chunk = Chunk(mines, counts)
+    self.chunks[key] = chunk
+    return chunk
+
+  def compute_counts(self, cr, cc, mines=None):
+    '''3x3 mine sums for every cell of chunk (cr, cc), reading the edge rows and columns of the 8 chunks around it
+    like BoardManager.compute_counts, each count includes the cell itself
+    mines is the chunk's own mine plane when the caller already has it'''
+    center = mines
+    size = self.chunk_size
+    width = size + 2
+    padded = bytearray(width * width)
+    for dr in (-1, 0, 1):
+      for dc in (-1, 0, 1):
+        mines = center if center is not None and dr == dc == 0 else self.chunk_mines(cr + dr, cc + dc)
+        # rows and columns of the neighbor chunk that land inside the padded window
+        rows = range(size - 1, size) if dr < 0 else range(0, 1) if dr > 0 else range(size)
+        cols = (size - 1, size) if dc < 0 else (0, 1) if dc > 0 else (0, size)
+        for r in rows:
+          pr = r + dr * size + 1
+          pc = cols[0] + dc * size + 1
+          padded[pr * width + pc:pr * width + pc + cols[1] - cols[0]] = mines[r * size + cols[0]:r * size + cols[1]]
+
+    # horizontal 3-wide sums, then vertical 3-high sums of those
+    horizontal = []
+    for pr in range(width):
+      row = padded[pr * width:(pr + 1) * width]
+      horizontal.append(bytes(map(add, map(add, row[:-2], row[1:-1]), row[2:])))
+    counts = bytearray(size * size)
+    for r in range(size):
+      counts[r * size:(r + 1) * size] = bytes(map(add, map(add, horizontal[r], horizontal[r + 1]), horizontal[r + 2]))
+    return counts
+
+  def evict(self):
+    '''drop every cached untouched chunk, they will be regenerated when read again'''
+    self.cache.clear()
+
+  def loaded_chunks(self):
+    '''number of chunks holding player state'''
+    return len(self.chunks)
+
+  def memory_cells(self):
+    '''cells held in memory across touched and cached chunks'''
+    return (len(self.chunks) + len(self.cache)) * self.chunk_size * self.chunk_size
+
+  # Cell access, all coordinates are global and may be negative
+
+  def locate(self, r, c):
+    '''touched chunk holding (r, c) and the local index of the cell in it'''
+    size = self.chunk_size
+    return self.touch(r // size, c // size), (r % size) * size + c % size
+
+  def is_mine(self, r, c):
+    size = self.chunk_size
+    return self.chunk_mines(r // size, c // size)[(r % size) * size + c % size] == 1
+
+  def is_covered(self, r, c):
+    '''untouched chunks are entirely covered'''
+    size = self.chunk_size
+    chunk = self.chunks.get((r // size, c // size))
+    return chunk is None or chunk.covered[(r % size) * size + c % size] == 1
+
+  def is_flagged(self, r, c):
+    size = self.chunk_size
+    chunk = self.chunks.get((r // size, c // size))
+    return chunk is not None and chunk.flagged[(r % size) * size + c % size] == 1
+
+  def neighbor_count(self, r, c):
+    chunk, i = self.locate(r, c)
+    return chunk.counts[i]
+
+  def toggle_flag(self, r, c):
+    '''toggle flag state at (r,c)'''
+    chunk, i = self.locate(r, c)
+    chunk.flagged[i] ^= 1
+
+  def open_region(self, row, col, limit=MAX_FLOOD_CELLS):
+    '''uncover (row, col) and the safe cells reachable through zero-count cells, crossing chunk boundaries
+    stops after limit cells and keeps the cells it had not expanded yet in frontier, returns cells opened'''
+    chunk, i = self.locate(row, col)
+    opened = chunk.covered[i]
+    chunk.covered[i] = 0
+    return self.fill([(row, col)], limit, opened)
+
+  def resume_region(self, limit=MAX_FLOOD_CELLS):
+    '''keep opening from where flood fills stopped at their limit, returns cells opened'''
+    stack, self.frontier = self.frontier, []
+    return self.fill(stack, limit, 0)
+
+  def fill(self, stack, limit, opened):
+    '''expand the uncovered cells on stack until it is empty or limit cells are open, the rest go to frontier'''
+    size = self.chunk_size
+    # the fill mostly stays inside one chunk, so remember the last one looked up
+    last_key, last = None, None
+
+    while stack and opened < limit:
+      r, c = stack.pop()
+      key = (r // size, c // size)
+      if key != last_key:
+        last_key, last = key, self.touch(*key)
+      if last.counts[(r % size) * size + c % size] != 0:
+        continue
+
+      for nr in (r - 1, r, r + 1):
+        for nc in (c - 1, c, c + 1):
+          key = (nr // size, nc // size)
+          chunk = last if key == last_key else self.touch(*key)
+          n = (nr % size) * size + nc % size
+          # flagged and already uncovered cells stop the fill, just like a direct click would
+          if chunk.covered[n] and not chunk.flagged[n] and not chunk.mines[n]:
+            chunk.covered[n] = 0
+            opened += 1
+            stack.append((nr, nc))
+    self.frontier += stack
+    return opened
+
+
+class InfiniteGameLogic:
+  '''GameLogic counterpart for a ChunkedBoard, there is no win, the game runs until a mine is uncovered
+  a standalone engine for now, driven directly rather than through UserInterface'''
+  def __init__(self, seed=0, density=0.15, chunk_size=CHUNK_SIZE, max_cached=MAX_CACHED_CHUNKS):
+    self.state: GameState = GameState.Start
+    self.board = ChunkedBoard(seed, density, chunk_size, max_cached)
+    self.cells_opened: int = 0
+    self.flags_placed: int = 0
+
+  def start_game(self):
+    """moves the game to the playing state and opens the guaranteed safe starting cell"""
+    self.state = GameState.Playing
+    self.uncover_cell(*self.board.safe_cell)
+
+  def end_game(self, condition: EndCondition):
+    """ends game based on passed condition"""
+    self.state = GameState.EndWin if condition == EndCondition.Win else GameState.EndLose
+
+  def uncover_cell(self, row: int, col: int) -> int:
+    """uncover a selected cell, returns the number of cells opened
+    a flood fill an earlier click left at the cell limit continues first"""
+    if self.state != GameState.Playing:
+      return 0
+    opened = self.continue_fill()
+    if not self.board.is_covered(row, col) or self.board.is_flagged(row, col):
+      return opened
+    if self.board.is_mine(row, col):
+      self.end_game(EndCondition.Loss)
+      return opened
+    region = self.board.open_region(row, col)
+    self.cells_opened += region
+    return opened + region
+
+  def continue_fill(self) -> int:
+    """open more of a flood fill that stopped at the cell limit, for example when the view moves,
+    returns the number of cells opened"""
+    if self.state != GameState.Playing or not self.board.frontier:
+      return 0
+    opened = self.board.resume_region()
+    self.cells_opened += opened
+    return opened
+
+  def toggle_flagged_cell(self, row: int, col: int):
+    """toggles flagged state, flags are unlimited on an unbounded board"""
+    if not self.board.is_covered(row, col):
+      return
+    self.board.toggle_flag(row, col)
+    self.flags_placed += 1 if self.board.is_flagged(row, col) else -1
@@ -7,6 +7,7 @@
 
 import random
 import enum
+import time
 
 from BoardManager import BoardManager
 
@@ -28,13 +29,103 @@ class ToggleMine(enum.Enum):
   Remove = -1
 
 
+class Action(enum.Enum):
+  Uncover = 0
+  Flag = 1
+  Unflag = 2
+  Reset = 3
+  Start = 4
+  Undo = 5 # sent by UndoHistory, changed holds the cells it restored
+  Redo = 6
+
+
+class ChangeSet:
+  """what one action changed: the cells whose covered or flagged state changed, the resulting game state and
+  counters, and how the counters moved. an action that changed nothing returns one with no cells"""
+  __slots__ = ("action", "row", "col", "cells", "state", "state_changed", "flags_remaining", "flags_delta",
+               "covered_cells", "covered_delta")
+
+  def __init__(self, game, action, row, col, cells, state_before, flags_before, covered_before):
+    self.action: Action = action
+    self.row: int = row
+    self.col: int = col
+    self.cells: list = cells # flat indices, row * cols + col
+    self.state: GameState = game.state
+    self.state_changed: bool = game.state != state_before
+    self.flags_remaining: int = game.flags_remaining
+    self.flags_delta: int = game.flags_remaining - flags_before
+    self.covered_cells: int = game.covered_cells
+    self.covered_delta: int = game.covered_cells - covered_before
+
+  def __bool__(self):
+    """True if the action changed anything"""
+    return bool(self.cells) or self.state_changed
+
+  def __repr__(self):
+    return (f"ChangeSet({self.action.name} ({self.row}, {self.col}), {len(self.cells)} cells, {self.state.name}, "
+            f"flags {self.flags_delta:+d}, covered {self.covered_delta:+d})")
+
+
 class GameLogic:
-  def __init__(self):
+  def __init__(self, rows: int = 10, cols: int = 10, seed: int = None, board: BoardManager = None):
     self.state: GameState = GameState.Start
     self.total_mines: int = 0
     self.flags_remaining: int = 0
-    self.board = BoardManager()
+    # an existing board (for example one loaded from a save file) can be passed in instead of allocating one
+    self.board = board if board is not None else BoardManager(rows, cols)
     self.covered_cells: int = self.board.rows * self.board.cols
+    # every random choice for a game comes from its own seeded generator, so a game can be rebuilt from
+    # (seed, rows, cols, total_mines, first click)
+    self.seed: int = 0
+    self.rng = random.Random()
+    self.reseed(seed)
+    # callables observer(game, action, row, col, changed) run after every action that changed the game
+    # changed holds the flat indices (row * cols + col) whose covered or flagged state changed
+    self.observers: list = []
+    # callables hook(game, source, seconds) told how long laying out each board took, wherever that happened:
+    # "start" (initialize_board), "prefetch" (a BoardPrefetcher thread), "pool" or "first_click" (NoGuessGame)
+    self.generation_hooks: list = []
+    # (mine count, seed, rng, seconds taken) of mines already laid out on a swapped in board, used by the next
+    # start_game
+    self.prepared: tuple = None
+    # the first click has laid out the board, later clicks on a fully covered board (after undoing back to the
+    # start) play the board as dealt instead of dealing it again
+    self.dealt: bool = False
+
+  @classmethod
+  def from_seed(cls, seed: int, rows: int, cols: int, mines: int, first_click: tuple = None):
+    """rebuild a game from its seed, size, mine count and (optionally) first click"""
+    game = cls(rows, cols, seed)
+    game.set_mines(mines)
+    game.start_game()
+    if first_click is not None:
+      game.uncover_cell(*first_click)
+    return game
+
+  def reseed(self, seed: int = None):
+    """seed the game's random generator, picking a fresh seed when none is given"""
+    if seed is None:
+      seed = random.randrange(1 << 63)
+    self.seed = seed
+    self.rng.seed(seed)
+
+  def add_observer(self, observer):
+    """register a callable to be told about every action that changes the game"""
+    self.observers.append(observer)
+
+  def remove_observer(self, observer):
+    """stop notifying a previously registered observer"""
+    self.observers.remove(observer)
+
+  def notify(self, action: Action, row: int, col: int, changed: list):
+    """pass an action and the cells it changed to every observer"""
+    for observer in self.observers:
+      observer(self, action, row, col, changed)
+
+  def board_generated(self, source: str, seconds: float):
+    """pass the time laying out the current board took to every generation hook"""
+    for hook in self.generation_hooks:
+      hook(self, source, seconds)
 
   def set_mines(self, mines: int):
     """sets the total number of mines to be placed"""
@@ -44,7 +135,9 @@ class GameLogic:
   def start_game(self):
     """moves the game to the playing state and places mines"""
     self.state = GameState.Playing
+    self.dealt = False
     self.initialize_board()
+    self.notify(Action.Start, 0, 0, [])
 
   def end_game(self, condition: EndCondition):
     """ends game based on passed condition"""
@@ -53,20 +146,37 @@ class GameLogic:
     else:
       self.state = GameState.EndLose
 
-  def reset_game(self):
-    """resets the game state and the board state"""
-    self.board.reset()
+  def reset_game(self, seed: int = None, board: BoardManager = None) -> BoardManager:
+    """resets the game state and the board state, the next game uses seed (or a fresh one)
+    a clean board of the same size can be passed in to replace the current one instead of resetting it,
+    the replaced board is returned so its memory can be reused"""
+    replaced = None
+    if board is None:
+      self.board.reset()
+    else:
+      replaced, self.board = self.board, board
+    self.prepared = None
+    self.dealt = False
+    self.reseed(seed)
     self.state = GameState.Start
     self.total_mines = 0
     self.flags_remaining = 0
     self.covered_cells = self.board.rows * self.board.cols
+    self.notify(Action.Reset, 0, 0, [])
+    return replaced
 
   def initialize_board(self):
-    """samples and places mines in random locations"""
-    mines_coordinates = random.sample(range(100), k=self.total_mines)
-    for coord in mines_coordinates:
-      row, col = coord // 10, coord % 10
-      self.board.toggle_mine(row, col)
+    """samples and places mines in random locations
+    mines prepared in advance for this mine count are kept, along with the seed and generator that laid them out"""
+    if self.prepared is not None and self.prepared[0] == self.total_mines:
+      _, self.seed, self.rng, seconds = self.prepared
+      self.prepared = None
+      self.board_generated("prefetch", seconds)
+    else:
+      self.prepared = None
+      start = time.perf_counter()
+      self.board.place_unique_mines(self.total_mines, rng=self.rng)
+      self.board_generated("start", time.perf_counter() - start)
 
   def uncover_first_cell(self, old_row: int, old_col: int):
     """safely uncover the first cell"""
@@ -76,7 +186,7 @@ class GameLogic:
 
     while True:
       # pick a random cell
-      new_row, new_col = random.randrange(10), random.randrange(10)
+      new_row, new_col = self.rng.randrange(self.board.rows), self.rng.randrange(self.board.cols)
       new_cell = self.board.cell(new_row, new_col)
       # check that the cell does not already has a mine
       # prevents reselecting the same cell the user has
@@ -87,54 +197,85 @@ class GameLogic:
     # remove the mine at the original location
     self.board.toggle_mine(old_row, old_col)
 
-  def uncover_cell(self, row: int, col: int):
-    """uncover a selected cell"""
+  def uncover_cell(self, row: int, col: int) -> ChangeSet:
+    """uncover a selected cell, returns the ChangeSet with every cell it opened"""
     cell = self.board.cell(row, col)
+    state_before, covered_before = self.state, self.covered_cells
 
-    if not cell.is_covered:
-      return
-
-    if cell.flagged:
-      return
+    if not cell.is_covered or cell.flagged:
+      return ChangeSet(self, Action.Uncover, row, col, [], state_before, self.flags_remaining, covered_before)
     
-    if self.covered_cells == (self.board.rows * self.board.cols):  # was 100
+    if not self.dealt and self.covered_cells == (self.board.rows * self.board.cols):  # was 100
       self.uncover_first_cell(row, col)
+      self.dealt = True
       # refresh the cell reference after potential mine relocation
       cell = self.board.cell(row, col)
 
     if cell.is_mine:
       self.end_game(EndCondition.Loss)
-      return
+      self.notify(Action.Uncover, row, col, [])
+      return ChangeSet(self, Action.Uncover, row, col, [], state_before, self.flags_remaining, covered_before)
 
-    # uncover the cell
-    self.board.uncover(row, col)
-    self.covered_cells -= 1
-
-    # only continue flood fill if there are no neighboring mines
-    if cell.neighbor_count == 0:
-      # recursively uncover neighbors
-      for i in range(row - 1, row + 2):
-        for j in range(col - 1, col + 2):
-          if not self.board.in_bounds(i, j):
-            continue
-          cell = self.board.cell(i, j)
-          if not cell.is_mine:
-            self.uncover_cell(i, j)
+    opened = self.flood_fill(row, col)
+    self.covered_cells -= len(opened)
 
     # check whether the user has uncovered all cells
     if self.covered_cells == self.total_mines:
       self.end_game(EndCondition.Win)
 
-  def toggle_flagged_cell(self, row: int, col: int):
-    """toggles flagged state with flag count validation"""
+    self.notify(Action.Uncover, row, col, opened)
+    return ChangeSet(self, Action.Uncover, row, col, opened, state_before, self.flags_remaining, covered_before)
+
+  def flood_fill(self, row: int, col: int) -> list:
+    """uncover (row, col) and every safe cell reachable through zero-count cells, returns the opened flat indices
+    uses a worklist instead of recursion so large open regions cannot hit the recursion limit"""
+    cols = self.board.cols
+    covered, flagged = self.board.covered, self.board.flagged
+    mines, counts = self.board.mines, self.board.counts
+    row_tables, col_classes = self.board.topology.row_tables, self.board.topology.col_classes
+    # cells are uncovered as they are queued, so the covered plane doubles as the visited set
+    start = row * cols + col
+    covered[start] = 0
+    stack = [start]
+    opened = [start]
+
+    while stack:
+      i = stack.pop()
+
+      # only continue flood fill if there are no neighboring mines
+      if counts[i] != 0:
+        continue
+
+      # neighbor offsets come from the board's topology table, already clipped to the board
+      r, c = divmod(i, cols)
+      for d in row_tables[r][col_classes[r][c]]:
+        n = i + d
+        # flagged and already uncovered cells stop the fill, just like a direct click would
+        if covered[n] and not flagged[n] and not mines[n]:
+          covered[n] = 0
+          opened.append(n)
+          stack.append(n)
+
+    return opened
+
+  def toggle_flagged_cell(self, row: int, col: int) -> ChangeSet:
+    """toggles flagged state with flag count validation, returns the ChangeSet (no cells if nothing changed)"""
     cell = self.board.cell(row, col)
+    flags_before = self.flags_remaining
+    action = Action.Unflag if cell.flagged else Action.Flag
+    changed = []
 
     if not cell.is_covered:
-      return
-
-    if cell.flagged:
+      pass
+    elif cell.flagged:
       self.board.set_flag(row, col, False)
       self.flags_remaining += 1
+      changed = [row * self.board.cols + col]
+      self.notify(action, row, col, changed)
     elif self.flags_remaining > 0:
       self.board.set_flag(row, col, True)
       self.flags_remaining -= 1
+      changed = [row * self.board.cols + col]
+      self.notify(action, row, col, changed)
+
+    return ChangeSet(self, action, row, col, changed, self.state, flags_before, self.covered_cells)
@@ -0,0 +1,308 @@
+'''
+GameServer.py
+Description: Asyncio Minesweeper server. Hosts many independent GameLogic sessions behind a line-delimited JSON
+             protocol over TCP, answers every move with only the cells it changed, and evicts sessions that have
+             been idle too long or that push the server over its session limit (least recently used first).
+Inputs: Command line options (host, port, session limits), JSON requests from clients
+Outputs: JSON responses to clients
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+
+Protocol: one JSON object per line in each direction. Every request has an "op" and may carry an "id", which is
+echoed back. Responses have "ok": true plus the fields below, or "ok": false and an "error" message.
+  {"op": "create", "rows": 10, "cols": 10, "mines": 10, "seed": 1}  -> session, rows, cols, mines, seed, topology
+  {"op": "uncover", "session": s, "row": r, "col": c}            -> uncovered: [[row, col, count], ...]
+  {"op": "flag", "session": s, "row": r, "col": c}               -> flagged or unflagged: [[row, col]]
+  {"op": "reset", "session": s, "seed": 2}                       -> seed, a new game with the same size and mines
+  {"op": "close", "session": s}
+  {"op": "stats"}                                                -> sessions, created, evicted, requests
+Every game response also has state, flags_remaining and covered_cells, and mines: [[row, col], ...] once the game
+is over. The seed is optional everywhere, a fresh one is picked when it is missing. create also takes an optional
+"topology" (square, torus, hex or knight, square by default) that sets which cells count as neighbors.
+'''
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+
+import Topology
+from BoardManager import BoardManager, sample_cells
+from GameLogic import GameLogic, GameState, Action
+
+
+DEFAULT_PORT = 8765
+MAX_SESSIONS = 100000
+IDLE_TIMEOUT = 600.0 # seconds without a request before a session is evicted
+SWEEP_INTERVAL = 10.0 # seconds between idle session sweeps
+MAX_CELLS = 1 << 20 # largest board a client may create
+
+
+class RequestError(Exception):
+  '''a request that cannot be served, reported back to the client'''
+
+
+# every session draws from this one generator instead of owning a 2.5 KB Mersenne Twister of its own
+SHARED_RNG = random.Random()
+
+
+class SessionGame(GameLogic):
+  '''GameLogic that keeps only its seed, its random draws come from SHARED_RNG
+  the shared generator is seeded from the game's seed right before the game draws from it, so a session's board
+  depends on its seed alone and matches GameLogic.from_seed with the same seed and first click'''
+  def __init__(self, rows, cols, seed=None, board=None):
+    super().__init__(rows, cols, seed, board)
+    self.rng = SHARED_RNG
+
+  def reseed(self, seed=None):
+    if seed is None:
+      seed = random.randrange(1 << 63)
+    self.seed = seed
+
+  def initialize_board(self):
+    self.rng.seed(self.seed)
+    super().initialize_board()
+
+  def uncover_first_cell(self, row, col):
+    board = self.board
+    if board.mines[row * board.cols + col]:
+      # the mine is moved with the draws that follow laying out the board, replay those to get there
+      self.rng.seed(self.seed)
+      sample_cells(self.rng, board.size, self.total_mines)
+    super().uncover_first_cell(row, col)
+
+
+class Session:
+  '''one hosted game'''
+  __slots__ = ("id", "game", "last_used")
+
+  def __init__(self, session_id, game):
+    self.id = session_id
+    self.game = game
+    self.last_used = time.monotonic()
+
+
+class GameServer:
+  '''session table and request dispatch, independent of the transport'''
+  def __init__(self, max_sessions=MAX_SESSIONS, idle_timeout=IDLE_TIMEOUT):
+    self.max_sessions = max_sessions
+    self.idle_timeout = idle_timeout
+    self.sessions = OrderedDict() # session id -> Session, least recently used first
+    self.ids = itertools.count(1)
+    self.created = 0
+    self.evicted = 0
+    self.requests = 0
+    self.ops = {
+      "create": self.create,
+      "uncover": self.uncover,
+      "flag": self.flag,
+      "reset": self.reset,
+      "close": self.close,
+      "stats": self.stats,
+    }
+
+  # Sessions
+
+  def session(self, request):
+    '''the session named by the request, marked as just used'''
+    session = self.sessions.get(self.integer(request, "session"))
+    if session is None:
+      raise RequestError("unknown or expired session")
+    session.last_used = time.monotonic()
+    self.sessions.move_to_end(session.id)
+    return session
+
+  def evict_idle(self, now=None):
+    '''drop sessions idle longer than idle_timeout, returns how many were dropped'''
+    cutoff = (now if now is not None else time.monotonic()) - self.idle_timeout
+    evicted = 0
+    # least recently used sessions are at the front, stop at the first one still in use
+    while self.sessions:
+      session = next(iter(self.sessions.values()))
+      if session.last_used > cutoff:
+        break
+      del self.sessions[session.id]
+      evicted += 1
+    self.evicted += evicted
+    return evicted
+
+  # Operations
+
+  def create(self, request):
+    rows, cols, mines = (self.integer(request, name, 10) for name in ("rows", "cols", "mines"))
+    if not (0 < rows and 0 < cols and rows * cols <= MAX_CELLS):
+      raise RequestError(f"board must have between 1 and {MAX_CELLS} cells")
+    if not 0 < mines < rows * cols:
+      raise RequestError("mine count must leave at least one safe cell")
+
+    try:
+      topology = Topology.build(self.string(request, "topology", "square"), rows, cols)
+    except ValueError as error:
+      raise RequestError(str(error))
+
+    game = SessionGame(rows, cols, seed=self.seed(request), board=BoardManager(rows, cols, topology=topology))
+    game.set_mines(mines)
+    game.start_game()
+    session = Session(next(self.ids), game)
+    self.sessions[session.id] = session
+    self.created += 1
+    if len(self.sessions) > self.max_sessions:
+      self.sessions.popitem(last=False)
+      self.evicted += 1
+    return {"session": session.id, "rows": rows, "cols": cols, "mines": mines, "seed": game.seed,
+            "topology": topology.name, **self.game_fields(game)}
+
+  def uncover(self, request):
+    game = self.session(request).game
+    row, col = self.cell(game, request)
+    changes = game.uncover_cell(row, col)
+    cols, counts = game.board.cols, game.board.counts
+    uncovered = [[i // cols, i % cols, counts[i]] for i in changes.cells]
+    return {"uncovered": uncovered, **self.game_fields(game)}
+
+  def flag(self, request):
+    game = self.session(request).game
+    row, col = self.cell(game, request)
+    changes = game.toggle_flagged_cell(row, col)
+    key = "flagged" if changes.action == Action.Flag else "unflagged"
+    return {key: [[row, col]] if changes.cells else [], **self.game_fields(game)}
+
+  def reset(self, request):
+    game = self.session(request).game
+    mines = game.total_mines
+    game.reset_game(seed=self.seed(request))
+    game.set_mines(mines)
+    game.start_game()
+    return {"seed": game.seed, **self.game_fields(game)}
+
+  def close(self, request):
+    del self.sessions[self.session(request).id]
+    return {}
+
+  def stats(self, request):
+    return {"sessions": len(self.sessions), "created": self.created, "evicted": self.evicted,
+            "requests": self.requests}
+
+  # Helpers
+
+  @staticmethod
+  def integer(request, name, default=None):
+    '''integer field of the request, default when it is missing'''
+    value = request.get(name, default)
+    if not isinstance(value, int) or isinstance(value, bool):
+      raise RequestError(f"{name} must be an integer")
+    return value
+
+  @staticmethod
+  def string(request, name, default=None):
+    '''string field of the request, default when it is missing'''
+    value = request.get(name, default)
+    if not isinstance(value, str):
+      raise RequestError(f"{name} must be a string")
+    return value
+
+  def seed(self, request):
+    '''the request's seed, None when it has none'''
+    return None if request.get("seed") is None else self.integer(request, "seed")
+
+  def cell(self, game, request):
+    '''(row, col) from the request, checked against the board'''
+    if game.state != GameState.Playing:
+      raise RequestError(f"game is over ({game.state.name}), reset it to play again")
+    row, col = self.integer(request, "row"), self.integer(request, "col")
+    if not game.board.in_bounds(row, col):
+      raise RequestError("cell is outside the board")
+    return row, col
+
+  @staticmethod
+  def game_fields(game):
+    '''fields sent with every game response'''
+    fields = {"state": game.state.name, "flags_remaining": game.flags_remaining, "covered_cells": game.covered_cells}
+    if game.state in (GameState.EndWin, GameState.EndLose):
+      cols, mines = game.board.cols, game.board.mines
+      fields["mines"] = [[i // cols, i % cols] for i in range(game.board.size) if mines[i]]
+    return fields
+
+  def handle(self, request):
+    '''serve one decoded request, returns the response dict'''
+    self.requests += 1
+    response = {"id": request["id"]} if "id" in request else {}
+    try:
+      op = self.ops.get(request.get("op"))
+      if op is None:
+        raise RequestError(f"unknown op, expected one of {sorted(self.ops)}")
+      response.update(op(request))
+      response["ok"] = True
+    except RequestError as error:
+      response["ok"] = False
+      response["error"] = str(error)
+    except (TypeError, ValueError) as error: # a field of an unexpected type that slipped past the checks
+      response["ok"] = False
+      response["error"] = f"bad request: {error}"
+    return response
+
+  # Transport
+
+  async def serve_client(self, reader, writer):
+    '''answer one connection's requests in order until it closes'''
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    try:
+      while True:
+        line = await reader.readline()
+        if not line:
+          break
+        try:
+          request = json.loads(line)
+          if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        except ValueError as error:
+          response = {"ok": False, "error": f"bad request: {error}"}
+        else:
+          response = self.handle(request)
+        writer.write(encode(response).encode() + b"\n")
+        # only wait for the socket when the client is not reading fast enough
+        if writer.transport.get_write_buffer_size() > 1 << 16:
+          await writer.drain()
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+      pass
+    finally:
+      writer.close()
+
+  async def sweep(self, interval=SWEEP_INTERVAL):
+    '''evict idle sessions every interval seconds'''
+    while True:
+      await asyncio.sleep(interval)
+      self.evict_idle()
+
+  async def run(self, host="127.0.0.1", port=DEFAULT_PORT):
+    server = await asyncio.start_server(self.serve_client, host, port)
+    sweeper = asyncio.create_task(self.sweep())
+    print(f"serving on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+    try:
+      async with server:
+        await server.serve_forever()
+    finally:
+      sweeper.cancel()
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Minesweeper game server")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+  parser.add_argument("--max-sessions", type=int, default=MAX_SESSIONS, help="least recently used are evicted beyond this")
+  parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT, help="seconds before an idle session is evicted")
+  args = parser.parse_args()
+
+  server = GameServer(args.max_sessions, args.idle_timeout)
+  try:
+    asyncio.run(server.run(args.host, args.port))
+  except KeyboardInterrupt:
+    pass
+
+
+if __name__ == "__main__":
+  main()
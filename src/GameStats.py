@@ -0,0 +1,263 @@
+'''
+GameStats.py
+Description: Local store of finished games. Every completed game is one row in a SQLite database with its outcome,
+             board size, mine count, duration, clicks and seed. Rows are buffered and written in batches, one
+             transaction per batch, so headless runs do not pay for a commit per game. Each batch also updates small
+             summary tables (totals per board size and mine count, and duration histograms), so win rates by density
+             and duration percentiles read a few hundred rows however many games are stored, and best times come
+             straight off an index of the won games (only wins are indexed, which keeps inserts cheap).
+Inputs: GameLogic (recording), finished game records
+Outputs: SQLite database, aggregate queries
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import argparse
+import math
+import os
+import sqlite3
+import time
+
+from GameLogic import Action, GameState
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper", "stats.sqlite3")
+BATCH_SIZE = 1000 # buffered games written per transaction
+FLUSH_INTERVAL = 5.0 # seconds a buffered game waits at most, checked when the next game is added
+BUCKETS_PER_DOUBLING = 16 # duration histogram resolution, bucket edges grow by about 4.4%
+
+# a game record: finished (unix time), won (0 or 1), rows, cols, mines, duration (seconds), clicks, seed
+FIELDS = ("finished", "won", "rows", "cols", "mines", "duration", "clicks", "seed")
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+  id INTEGER PRIMARY KEY,
+  finished REAL NOT NULL,
+  won INTEGER NOT NULL,
+  rows INTEGER NOT NULL,
+  cols INTEGER NOT NULL,
+  mines INTEGER NOT NULL,
+  duration REAL NOT NULL,
+  clicks INTEGER NOT NULL,
+  seed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wins_by_time ON games (rows, cols, mines, duration) WHERE won = 1;
+CREATE TABLE IF NOT EXISTS totals (
+  rows INTEGER NOT NULL,
+  cols INTEGER NOT NULL,
+  mines INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  wins INTEGER NOT NULL,
+  duration REAL NOT NULL,
+  clicks INTEGER NOT NULL,
+  PRIMARY KEY (rows, cols, mines)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS durations (
+  rows INTEGER NOT NULL,
+  cols INTEGER NOT NULL,
+  mines INTEGER NOT NULL,
+  won INTEGER NOT NULL,
+  bucket INTEGER NOT NULL,
+  games INTEGER NOT NULL,
+  PRIMARY KEY (rows, cols, mines, won, bucket)
+) WITHOUT ROWID;
+'''
+
+
+def bucket(duration):
+  '''duration histogram bucket of a duration in seconds, durations are bucketed in milliseconds'''
+  milliseconds = duration * 1000
+  return int(math.log2(milliseconds) * BUCKETS_PER_DOUBLING) + 1 if milliseconds >= 1 else 0
+
+
+def bucket_middle(index):
+  '''representative duration in seconds of a bucket, the geometric middle of its edges'''
+  if index == 0:
+    return 0.0005
+  return 2 ** ((index - 0.5) / BUCKETS_PER_DOUBLING) / 1000
+
+
+class GameStats:
+  '''buffered writer and aggregate queries over a games database'''
+  def __init__(self, path=DEFAULT_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+    if path != ":memory:":
+      os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    self.path = path
+    self.batch_size = batch_size
+    self.flush_interval = flush_interval
+    self.connection = sqlite3.connect(path)
+    # the write-ahead log lets a stats screen read while a headless run writes, and commits without syncing the
+    # main database file
+    self.connection.execute("PRAGMA journal_mode=WAL")
+    self.connection.execute("PRAGMA synchronous=NORMAL")
+    self.connection.executescript(SCHEMA)
+    self.pending = [] # records not written yet
+    self.next_flush = None # time.monotonic() deadline of the oldest pending record
+
+  def add(self, record):
+    '''buffer one game record (see FIELDS), written with the next batch'''
+    self.pending.append(record)
+    if self.next_flush is None:
+      self.next_flush = time.monotonic() + self.flush_interval
+    if len(self.pending) >= self.batch_size or time.monotonic() >= self.next_flush:
+      self.flush()
+
+  def add_many(self, records):
+    self.pending.extend(records)
+    if len(self.pending) >= self.batch_size:
+      self.flush()
+    elif self.pending and self.next_flush is None:
+      self.next_flush = time.monotonic() + self.flush_interval
+
+  def flush(self):
+    '''write every buffered record and fold it into the summary tables, in one transaction'''
+    records, self.pending = self.pending, []
+    self.next_flush = None
+    if not records:
+      return
+    totals = {} # (rows, cols, mines) -> [games, wins, duration, clicks]
+    durations = {} # (rows, cols, mines, won, bucket) -> games
+    for _, won, rows, cols, mines, duration, clicks, _ in records:
+      total = totals.setdefault((rows, cols, mines), [0, 0, 0.0, 0])
+      total[0] += 1
+      total[1] += won
+      total[2] += duration
+      total[3] += clicks
+      key = (rows, cols, mines, won, bucket(duration))
+      durations[key] = durations.get(key, 0) + 1
+
+    with self.connection:
+      self.connection.executemany("INSERT INTO games (finished, won, rows, cols, mines, duration, clicks, seed) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", records)
+      self.connection.executemany(
+        "INSERT INTO totals VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (rows, cols, mines) DO UPDATE SET "
+        "games = games + excluded.games, wins = wins + excluded.wins, "
+        "duration = duration + excluded.duration, clicks = clicks + excluded.clicks",
+        [key + tuple(total) for key, total in totals.items()])
+      self.connection.executemany(
+        "INSERT INTO durations VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (rows, cols, mines, won, bucket) "
+        "DO UPDATE SET games = games + excluded.games",
+        [key + (games,) for key, games in durations.items()])
+
+  def close(self):
+    self.flush()
+    self.connection.close()
+
+  # Queries, each one writes the buffered records first so it sees every finished game
+
+  def totals(self, rows=None, cols=None, mines=None):
+    '''games, wins, total duration and total clicks, over every game matching the given board and mine count'''
+    self.flush()
+    where, parameters = self.config_filter(rows, cols, mines)
+    games, wins, duration, clicks = self.connection.execute(
+      f"SELECT TOTAL(games), TOTAL(wins), TOTAL(duration), TOTAL(clicks) FROM totals {where}", parameters).fetchone()
+    return {"games": int(games), "wins": int(wins), "win_rate": wins / games if games else 0.0,
+            "mean_duration": duration / games if games else 0.0, "mean_clicks": clicks / games if games else 0.0}
+
+  def win_rate_by_density(self, step=0.05):
+    '''(density, games, win rate) rows, densities (mines per cell) grouped into buckets step wide
+    buckets are found with integer division, a float division would put densities on a bucket edge (15 mines on
+    10 x 10 is 0.15) in the bucket below'''
+    self.flush()
+    per_unit = round(1 / step) # buckets per unit of density
+    rows = self.connection.execute(
+      "SELECT mines * ? / (rows * cols), TOTAL(games), TOTAL(wins) FROM totals "
+      "GROUP BY 1 ORDER BY 1", (per_unit,)).fetchall()
+    return [(index / per_unit, int(games), wins / games) for index, games, wins in rows if games]
+
+  def duration_percentiles(self, rows=None, cols=None, mines=None, won=True, percentiles=(50, 90, 99)):
+    '''{p: duration in seconds} over matching games (won or lost), to within half a histogram bucket (about 2%)'''
+    self.flush()
+    where, parameters = self.config_filter(rows, cols, mines, won=int(won))
+    counts = self.connection.execute(
+      f"SELECT bucket, SUM(games) FROM durations {where} GROUP BY bucket ORDER BY bucket", parameters).fetchall()
+    total = sum(games for _, games in counts)
+    result = {}
+    for p in percentiles:
+      rank = total * p / 100
+      seen = 0
+      for index, games in counts:
+        seen += games
+        if seen >= rank:
+          result[p] = bucket_middle(index)
+          break
+      else:
+        result[p] = 0.0
+    return result
+
+  def best_times(self, rows, cols, mines, limit=10):
+    '''fastest wins for a board size and mine count, as (duration, finished, clicks, seed), read off the index'''
+    self.flush()
+    return self.connection.execute(
+      "SELECT duration, finished, clicks, seed FROM games WHERE rows = ? AND cols = ? AND mines = ? AND won = 1 "
+      "ORDER BY duration LIMIT ?", (rows, cols, mines, limit)).fetchall()
+
+  def config_filter(self, rows=None, cols=None, mines=None, **columns):
+    '''WHERE clause and parameters for the columns that are not None'''
+    columns = {"rows": rows, "cols": cols, "mines": mines, **columns}
+    terms = [(f"{name} = ?", value) for name, value in columns.items() if value is not None]
+    if not terms:
+      return "", ()
+    return "WHERE " + " AND ".join(term for term, _ in terms), tuple(value for _, value in terms)
+
+
+class StatsRecorder:
+  '''GameLogic observer that hands a record of every finished game to sink (for example GameStats.add)
+  the clock starts at the first click, and only the first result of a game counts, undoing a loss and then
+  winning does not add a second record'''
+  def __init__(self, game, sink):
+    self.game = game
+    self.sink = sink
+    self.clicks = 0
+    self.started = None # time.perf_counter() of the first click
+    self.recorded = True # nothing to record until a game starts
+    game.add_observer(self.observe)
+
+  def detach(self):
+    self.game.remove_observer(self.observe)
+
+  def observe(self, game, action, row, col, changed):
+    if action == Action.Start:
+      self.clicks = 0
+      self.started = None
+      self.recorded = False
+    elif action in (Action.Uncover, Action.Flag, Action.Unflag):
+      if self.started is None:
+        self.started = time.perf_counter()
+      self.clicks += 1
+      if not self.recorded and game.state in (GameState.EndWin, GameState.EndLose):
+        self.recorded = True
+        board = game.board
+        self.sink((time.time(), int(game.state == GameState.EndWin), board.rows, board.cols, game.total_mines,
+                   time.perf_counter() - self.started, self.clicks, game.seed))
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Summary of recorded Minesweeper games")
+  parser.add_argument("--db", default=DEFAULT_PATH, help="statistics database")
+  parser.add_argument("--rows", type=int)
+  parser.add_argument("--cols", type=int)
+  parser.add_argument("--mines", type=int)
+  args = parser.parse_args()
+
+  stats = GameStats(args.db)
+  start = time.perf_counter()
+  totals = stats.totals(args.rows, args.cols, args.mines)
+  print(f"games: {totals['games']:,}  wins: {totals['wins']:,} ({totals['win_rate']:.2%})  "
+        f"mean duration: {totals['mean_duration']:.2f}s  mean clicks: {totals['mean_clicks']:.1f}")
+  percentiles = stats.duration_percentiles(args.rows, args.cols, args.mines)
+  print("win durations: " + "  ".join(f"p{p} {seconds:.2f}s" for p, seconds in percentiles.items()))
+  print("win rate by density:")
+  for density, games, rate in stats.win_rate_by_density():
+    print(f"  {density:4.2f}  {rate:7.2%}  of {games:,}")
+  if args.rows is not None and args.cols is not None and args.mines is not None:
+    print("best times:")
+    for duration, finished, clicks, seed in stats.best_times(args.rows, args.cols, args.mines):
+      print(f"  {duration:8.2f}s  {time.strftime('%Y-%m-%d', time.localtime(finished))}  {clicks} clicks  seed {seed}")
+  print(f"queried in {(time.perf_counter() - start) * 1000:.1f}ms")
+  stats.close()
+
+
+if __name__ == "__main__":
+  main()
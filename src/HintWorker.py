@@ -0,0 +1,223 @@
+'''
+HintWorker.py
+Description: Mine probabilities and hints worked out in a background process, so the frame loop keeps its frame rate
+             however long the solver takes on a large frontier (the solver is pure Python, a thread would compete with
+             the loop for the interpreter lock). Each job is a snapshot of what the player can see: the covered plane
+             and the numbers on uncovered cells. The worker streams estimates back as the solver works through the
+             frontier, one component at a time, and drops a job as soon as a newer one arrives, which happens every
+             time the player uncovers cells or undoes a move.
+Inputs: GameLogic
+Outputs: Mine probability planes and hinted cells
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+
+from BoardManager import BoardManager
+from GameLogic import Action, GameLogic, GameState
+from Solver import Solver
+
+
+UNKNOWN = 255 # probability plane value of uncovered cells and cells with no estimate
+LEVELS = 254 # plane values 0 to LEVELS stand for mine probabilities 0 to 1, 0 is kept for proven safe cells
+REPORT_INTERVAL = 0.1 # seconds between streamed estimates
+
+# translate tables over the covered plane
+SHOWN = bytes([255]) + bytes(255) # 0xff on uncovered cells, 0 on covered ones
+
+
+def snapshot(game):
+  '''what the player can see, as bytes: the covered plane and the numbers on uncovered cells (0 under covered ones)'''
+  board = game.board
+  covered = bytes(board.covered)
+  shown = int.from_bytes(covered.translate(SHOWN), "little")
+  numbers = (int.from_bytes(board.counts, "little") & shown).to_bytes(board.size, "little")
+  return covered, numbers
+
+
+def level(p):
+  '''plane value of probability p, 0 only for proven safe cells so a small chance still shows as a risk'''
+  if p <= 0:
+    return 0
+  return min(max(round(p * LEVELS), 1), LEVELS)
+
+
+def to_plane(covered, estimate):
+  '''(probability plane, hinted cell) of a Solver.estimates() estimate
+  the hint is the covered cell least likely to be a mine, a proven safe one when there is one'''
+  probabilities, rest = estimate
+  table = bytearray(256)
+  table[0] = UNKNOWN
+  table[1] = UNKNOWN if rest is None else level(rest)
+  plane = bytearray(covered.translate(table))
+  for i, p in probabilities.items():
+    plane[i] = level(p)
+
+  hint = min(probabilities, key=probabilities.get, default=None)
+  if rest is not None and (hint is None or rest < probabilities[hint]):
+    # any cell without its own estimate, the first covered cell with the shared value that is not listed
+    i = plane.find(table[1])
+    while i in probabilities:
+      i = plane.find(table[1], i + 1)
+    if i >= 0:
+      hint = i
+  return bytes(plane), hint
+
+
+def estimate(job, topology, latest, results):
+  '''work out one job, putting (job number, plane, hint, False) on results for every estimate
+  returns early once latest no longer holds the job number'''
+  number, rows, cols, mines, covered, numbers, _ = job
+  size = rows * cols
+  board = BoardManager(rows, cols, planes=(bytearray(covered), bytearray(size), bytearray(size), bytearray(numbers)),
+                       topology=topology)
+  game = GameLogic(rows, cols, board=board)
+  game.set_mines(mines)
+  game.state = GameState.Playing
+  game.covered_cells = covered.count(1)
+  solver = Solver(game)
+  for result in solver.estimates(interval=REPORT_INTERVAL):
+    if latest.value != number: # the player moved on
+      return
+    if result is not None:
+      results.put((number, *to_plane(covered, result), False))
+  results.put((number, None, None, True))
+
+
+def work(jobs, results, latest):
+  '''worker process loop, always takes the newest job waiting and stops at a None job'''
+  # same as BoardPool.init_worker, SDL's SIGTERM handler is inherited from a parent running pygame
+  signal.signal(signal.SIGTERM, signal.SIG_DFL)
+  if hasattr(os, "nice"): # on a machine with few cores the frame loop still gets the processor first
+    os.nice(10)
+  topology = None # jobs only carry the topology when it changed
+  while True:
+    job = jobs.get()
+    while job is not None:
+      if job[-1] is not None:
+        topology = job[-1]
+      try:
+        newer = jobs.get_nowait()
+      except queue.Empty:
+        break
+      job = newer
+    if job is None:
+      return
+    if job[0] == latest.value:
+      estimate(job, topology, latest, results)
+
+
+class HintWorker:
+  '''mine probabilities and a hint for a GameLogic, worked out by a background process
+  kept up to date through game.add_observer, a move cancels the job for the old position and, while following,
+  starts one for the new position
+  on_result is called on a listener thread after each streamed result, for example to wake an event loop'''
+  def __init__(self, game, on_result=None):
+    self.game = game
+    self.on_result = on_result
+    self.following = False # recompute after every move
+    self.fresh = False # the newest job is for the current position
+    self.job = 0 # number of the newest job
+    self.plane = None # probability plane of the newest estimate, one byte per cell (see LEVELS and UNKNOWN)
+    self.hint = None # flat index of the hinted cell in that estimate
+    self.done = False # the estimate is final
+    self.lock = threading.Lock() # results arrive on the listener thread
+    self.process = None # started with the first job
+    self.listener = None
+    self.jobs = None
+    self.results = None
+    self.latest = None # shared job number, the worker drops any job that is not the latest
+    self.sent_topology = None # topology the worker already has
+    game.add_observer(self.observe)
+
+  def start(self):
+    self.jobs = multiprocessing.Queue()
+    self.results = multiprocessing.Queue()
+    self.latest = multiprocessing.Value("q", self.job, lock=False)
+    self.process = multiprocessing.Process(target=work, args=(self.jobs, self.results, self.latest),
+                                           name="hint-worker", daemon=True)
+    self.process.start()
+    self.listener = threading.Thread(target=self.listen, name="hint-listener", daemon=True)
+    self.listener.start()
+
+  def close(self):
+    '''stop the worker process'''
+    self.game.remove_observer(self.observe)
+    if self.process is None:
+      return
+    self.latest.value = -1
+    self.jobs.put(None)
+    self.results.put(None)
+    self.process.join(1)
+    if self.process.is_alive():
+      self.process.terminate()
+    self.listener.join(1)
+    self.process = None
+
+  def follow(self, on):
+    '''keep the estimate up to date after every move, or only work one out when asked'''
+    self.following = on
+    if on:
+      self.request()
+
+  def request(self):
+    '''make sure the current position is being worked out, or already has been'''
+    if not self.fresh:
+      self.submit()
+
+  def submit(self):
+    self.cancel()
+    game = self.game
+    if game.state != GameState.Playing:
+      return
+    if self.process is None:
+      self.start()
+    board = game.board
+    covered, numbers = snapshot(game)
+    topology = board.topology if board.topology is not self.sent_topology else None
+    self.sent_topology = board.topology
+    self.jobs.put((self.job, board.rows, board.cols, game.total_mines, covered, numbers, topology))
+    self.fresh = True
+
+  def cancel(self):
+    '''drop the current job and its results'''
+    with self.lock:
+      self.job += 1
+      self.plane = None
+      self.hint = None
+      self.done = False
+    self.fresh = False
+    if self.latest is not None:
+      self.latest.value = self.job
+
+  def observe(self, game, action, row, col, changed):
+    if action in (Action.Flag, Action.Unflag):
+      return # flags are not trusted by the solver, so they change nothing
+    if action == Action.Uncover and not changed:
+      return
+    self.cancel()
+    if self.following:
+      self.submit()
+
+  def listen(self):
+    '''runs on the listener thread, keeps the newest result of the current job'''
+    while True:
+      result = self.results.get()
+      if result is None:
+        return
+      number, plane, hint, done = result
+      with self.lock:
+        if number != self.job:
+          continue
+        if done:
+          self.done = True
+        else:
+          self.plane, self.hint = plane, hint
+      if self.on_result is not None:
+        self.on_result()
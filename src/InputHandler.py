@@ -12,7 +12,7 @@ Created At: 9/10/2025 by Sam Suggs
 # Import required libraries and classes
 import pygame
 import enum
-from GameLogic import GameLogic, GameState
+from GameLogic import GameLogic, GameState, ChangeSet
 
 # enum class to handle the type of response given by the input handler
 class ResponseCode(enum.Enum):
@@ -22,12 +22,13 @@ class ResponseCode(enum.Enum):
     Ignored = 3
 
 # Response object designed to package and send input handling results
-# Inputs: game: GameLogic, response_code: ResponseCode, message: str
+# Inputs: game: GameLogic, response_code: ResponseCode, message: str, changes: ChangeSet (clicks only)
 class Response:
-    def __init__(self, game, response_code, message=''):
+    def __init__(self, game, response_code, message='', changes=None):
         self.game: GameLogic = game
         self.response_code: ResponseCode = response_code
         self.message: str = message
+        self.changes: ChangeSet = changes # what the click changed, None when nothing was attempted
 
 # input handler class for handling both keyboard inputs and mouse click inputs
 class InputHandler:
@@ -83,14 +84,14 @@ class InputHandler:
         if event.type == pygame.MOUSEBUTTONDOWN:
             # if left click -> uncover mine
             if event.button == 1:
-                game.uncover_cell(row=y, col=x)
-                 # return updated game
-                return Response(game, ResponseCode.Finished, f"Uncovered cell at ({x}, {y})")
+                changes = game.uncover_cell(row=y, col=x)
+                 # return updated game and what changed
+                return Response(game, ResponseCode.Finished, f"Uncovered cell at ({x}, {y})", changes)
             # if right click -> toggle flag
             elif event.button == 3:
-                game.toggle_flagged_cell(row=y, col=x)
-                # return updated game
-                return Response(game, ResponseCode.Finished, f"Toggled flag at ({x}, {y})")
+                changes = game.toggle_flagged_cell(row=y, col=x)
+                # return updated game and what changed
+                return Response(game, ResponseCode.Finished, f"Toggled flag at ({x}, {y})", changes)
             # if not a valid mouse click, return ignored response
             else:
                 return Response(game, ResponseCode.Ignored, "Ignored irrelevant input")
@@ -0,0 +1,323 @@
+'''
+InputLoadDriver.py
+Description: Load driver for the input path. Feeds long streams of synthetic KEYDOWN and MOUSEBUTTONDOWN events,
+             read from a script or generated at random from a seed, through the same steps as the UI event loop
+             (InputHandler.handle_keyboard_input, UserInterface.coords_to_index, InputHandler.handle_click, and
+             optionally the cell redraw) under the dummy SDL video driver, as fast as they can be handled. Reports
+             events per second and per-event latency percentiles, and checks that the game's counters, the board
+             planes and every returned ChangeSet stay consistent.
+Inputs: Command line options (board size, event count, seed or script, rendering, check interval)
+Outputs: Throughput, latency percentiles and invariant violations printed to stdout, exit status 1 on a violation
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+
+Script format: one event per line, blank lines and lines starting with # are skipped
+  type 15          a KEYDOWN per character
+  key RETURN       one KEYDOWN, by pygame key name (RETURN, BACKSPACE, r, LEFT, ...)
+  click ROW COL    left click in the middle of a cell at the current scroll position
+  flag ROW COL     right click in the middle of a cell
+  at X Y BUTTON    mouse button down at a window position
+'''
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+import UserInterface as ui
+from GameLogic import GameLogic, GameState, Action
+from InputHandler import InputHandler, ResponseCode
+from Instrumentation import Histogram
+from Viewport import Viewport
+
+
+MAX_VIOLATIONS = 20 # violations kept for the report, the rest are only counted
+PAN_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+
+
+def key_event(key, unicode=""):
+  return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0, scancode=0)
+
+
+def click_event(pos, button):
+  return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button)
+
+
+def type_events(text):
+  return [key_event(pygame.key.key_code(char), char) for char in text]
+
+
+# Event sources, each one is an iterator of events that may look at the driver's game to decide what comes next
+
+def random_events(driver, rng):
+  '''endless randomized input: mine counts (mostly valid) on the start screen, clicks all over the window while
+  playing (mostly on the board, some in the gaps or outside it, some with the middle button), the odd scroll key,
+  and a restart after every finished game'''
+  viewport = driver.viewport
+  while True:
+    state = driver.game.state
+    if state == GameState.Start:
+      if rng.random() < 0.8:
+        text = str(rng.randint(10, 20))
+      else:
+        text = rng.choice(["5", "99", "x", "1a", ""])
+      for event in type_events(text):
+        yield event
+      if rng.random() < 0.1:
+        yield key_event(pygame.K_BACKSPACE)
+      yield key_event(pygame.K_RETURN, "\r")
+    elif state == GameState.Playing:
+      roll = rng.random()
+      if roll < 0.02:
+        yield key_event(rng.choice(PAN_KEYS))
+      elif roll < 0.1:
+        yield click_event((rng.randrange(ui.SCREEN_WIDTH), rng.randrange(ui.SCREEN_LENGTH)), rng.choice((1, 2, 3)))
+      else:
+        first_row, end_row, first_col, end_col = viewport.visible_range()
+        rect = viewport.cell_rect(rng.randrange(first_row, max(end_row, first_row + 1)),
+                                  rng.randrange(first_col, max(end_col, first_col + 1)))
+        pos = (rect.x + rng.randrange(viewport.pitch), rect.y + rng.randrange(viewport.pitch))
+        yield click_event(pos, 1 if rng.random() < 0.7 else 3)
+    else:
+      yield key_event(pygame.K_r, "r")
+
+
+def script_events(driver, lines, repeat):
+  '''events from script lines (see the module docstring), played repeat times'''
+  for _ in range(repeat):
+    for number, line in enumerate(lines, 1):
+      words = line.split()
+      if not words or words[0].startswith("#"):
+        continue
+      command, arguments = words[0], words[1:]
+      try:
+        if command == "type":
+          yield from type_events(" ".join(arguments))
+        elif command == "key":
+          name = arguments[0]
+          yield key_event(pygame.key.key_code(name.lower() if len(name) > 1 else name), name if len(name) == 1 else "")
+        elif command in ("click", "flag"):
+          rect = driver.viewport.cell_rect(int(arguments[0]), int(arguments[1]))
+          yield click_event(rect.center, 1 if command == "click" else 3)
+        elif command == "at":
+          yield click_event((int(arguments[0]), int(arguments[1])), int(arguments[2]))
+        else:
+          raise ValueError(f"unknown command {command!r}")
+      except (IndexError, ValueError) as error:
+        raise ValueError(f"script line {number}: {error}") from None
+
+
+class InputLoadDriver:
+  '''runs events through the UI's input steps for one game and keeps timings and invariant results'''
+  def __init__(self, rows, cols, seed=0, render=False, check_every=1000):
+    self.game = GameLogic(rows, cols, seed)
+    self.handler = InputHandler()
+    self.viewport = Viewport(ui.BOARD_AREA, rows, cols, ui.DISTANCE_BETWEEN_CELLS)
+    # the UI functions read their state from module globals, point them at this driver's game
+    ui.game, ui.viewport = self.game, self.viewport
+    self.render = render
+    if render: # draw into an offscreen surface, the dummy driver has no window to present to
+      ui.screen = pygame.Surface((ui.SCREEN_WIDTH, ui.SCREEN_LENGTH))
+      ui.render_ui()
+      ui.dirty_rects.clear()
+    self.check_every = check_every
+    self.text = "" # mine count typed so far
+    self.latencies = {} # event kind -> Histogram of handling times in microseconds
+    self.counts = {} # response outcome -> events
+    self.events = 0
+    self.busy = 0.0 # seconds spent handling events
+    self.games = {GameState.EndWin: 0, GameState.EndLose: 0}
+    self.checks = 0
+    self.violations = []
+    self.violation_count = 0
+
+  # Dispatch, the same steps main() in UserInterface takes for each event
+
+  def dispatch(self, event):
+    '''handle one event, returns (kind, response or None)'''
+    game = self.game
+    if game.state == GameState.Start:
+      if event.type != pygame.KEYDOWN:
+        return "ignored", None
+      response = self.handler.handle_keyboard_input(game, event, self.text)
+      self.text = response.message if response.response_code == ResponseCode.InProgress else ""
+      if response.response_code == ResponseCode.Finished:
+        game.start_game()
+        if self.render:
+          ui.render_ui()
+      return "key", response
+
+    if event.type == pygame.KEYDOWN and event.key in PAN_KEYS:
+      if ui.handle_view_event(event) and self.render:
+        ui.render_ui()
+      return "scroll", None
+
+    if game.state == GameState.Playing:
+      if event.type != pygame.MOUSEBUTTONDOWN or event.button not in (1, 3):
+        return "ignored", None
+      coords = ui.coords_to_index(event.pos)
+      if not coords:
+        return "outside", None
+      x, y = coords
+      response = self.handler.handle_click(game, event, x, y)
+      if self.render:
+        if response.changes.state_changed:
+          ui.render_ui()
+        else:
+          ui.render_changes(response.changes.cells)
+      return "click", response
+
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_r: # finished game, restart like the UI does
+      game.reset_game()
+      if self.render:
+        ui.render_ui()
+      return "restart", None
+    return "ignored", None
+
+  def run(self, events, count=None, duration=None):
+    '''handle events until count events or duration seconds (or the source ends)'''
+    clock = time.perf_counter
+    deadline = clock() + duration if duration is not None else None
+    game = self.game
+    for event in events:
+      if count is not None and self.events >= count:
+        break
+      if deadline is not None and self.events % 256 == 0 and clock() >= deadline:
+        break
+      # counters before the event, for checking the response against them
+      before = (game.state, game.covered_cells, game.flags_remaining)
+      start = clock()
+      kind, response = self.dispatch(event)
+      elapsed = clock() - start
+      self.busy += elapsed
+      self.events += 1
+      histogram = self.latencies.get(kind)
+      if histogram is None:
+        histogram = self.latencies[kind] = Histogram()
+      histogram.record(elapsed * 1e6)
+      outcome = response.response_code.name if response is not None else kind
+      self.counts[outcome] = self.counts.get(outcome, 0) + 1
+      if ui.dirty_rects:
+        ui.dirty_rects.clear() # nothing presents them here
+
+      if kind == "click":
+        self.check_response(response, before)
+        if response.changes.state_changed and game.state in self.games:
+          self.games[game.state] += 1
+      if self.check_every and self.events % self.check_every == 0:
+        self.check_board()
+    self.check_board()
+
+  # Invariants
+
+  def violation(self, message):
+    self.violation_count += 1
+    if len(self.violations) < MAX_VIOLATIONS:
+      self.violations.append(f"event {self.events}: {message}")
+
+  def check_response(self, response, before):
+    '''a click's ChangeSet must agree with the counters before and after it'''
+    game, changes = self.game, response.changes
+    state, covered, flags = before
+    if response.game is not game:
+      self.violation("response carries a different game")
+    if changes.covered_cells != game.covered_cells or changes.flags_remaining != game.flags_remaining:
+      self.violation(f"{changes!r} does not match the game counters")
+    if changes.covered_delta != game.covered_cells - covered or changes.flags_delta != game.flags_remaining - flags:
+      self.violation(f"{changes!r} deltas do not match the counters before the click")
+    if changes.state_changed != (state != game.state):
+      self.violation(f"{changes!r} state_changed is wrong, {state.name} -> {game.state.name}")
+    if changes.action == Action.Uncover and changes.covered_delta != -len(changes.cells):
+      self.violation(f"{changes!r} opened {len(changes.cells)} cells")
+    if changes.action in (Action.Flag, Action.Unflag) and abs(changes.flags_delta) != len(changes.cells):
+      self.violation(f"{changes!r} flag count does not match its cells")
+
+  def check_board(self):
+    '''the counters must match the board planes, an O(board) check run every check_every events'''
+    self.checks += 1
+    game, board = self.game, self.game.board
+    covered, flagged, mines = board.covered, board.flagged, board.mines
+    if game.covered_cells != covered.count(1):
+      self.violation(f"covered_cells {game.covered_cells} but {covered.count(1)} cells are covered")
+    if game.state == GameState.Start:
+      return
+    if game.flags_remaining != game.total_mines - flagged.count(1):
+      self.violation(f"flags_remaining {game.flags_remaining} with {flagged.count(1)} flags "
+                     f"for {game.total_mines} mines")
+    if mines.count(1) != game.total_mines:
+      self.violation(f"{mines.count(1)} mines on the board for {game.total_mines}")
+    # the planes hold 0 or 1 per byte, so as big integers a bitwise and finds cells set in both
+    uncovered = ~int.from_bytes(covered, "little")
+    if int.from_bytes(flagged, "little") & uncovered:
+      self.violation("an uncovered cell is flagged")
+    if game.state != GameState.EndLose and int.from_bytes(mines, "little") & uncovered:
+      self.violation(f"a mine is uncovered in state {game.state.name}")
+    if game.state == GameState.EndWin and game.covered_cells != game.total_mines:
+      self.violation("won with safe cells still covered")
+
+  # Report
+
+  def report(self, elapsed):
+    print(f"events: {self.events:,} in {elapsed:.2f}s  throughput: {self.events / elapsed:,.0f} events/s  "
+          f"handling only: {self.events / self.busy if self.busy else 0:,.0f} events/s")
+    print(f"games: {self.games[GameState.EndWin]} won, {self.games[GameState.EndLose]} lost  "
+          f"outcomes: " + ", ".join(f"{name} {count:,}" for name, count in sorted(self.counts.items())))
+    print(f"{'kind':10} {'events':>10} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'p99.9':>9} {'max':>9}  (us)")
+    for kind, histogram in sorted(self.latencies.items()):
+      print(f"{kind:10} {histogram.count:>10,} {histogram.mean:>9.1f} {histogram.percentile(50):>9.1f} "
+            f"{histogram.percentile(90):>9.1f} {histogram.percentile(99):>9.1f} {histogram.percentile(99.9):>9.1f} "
+            f"{histogram.max:>9.1f}")
+    print(f"invariant checks: {self.checks:,} board checks, {self.violation_count} violations")
+    for message in self.violations:
+      print(f"  {message}")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Synthetic input load for InputHandler and the UI event pipeline")
+  parser.add_argument("--rows", type=int, default=ui.BOARD_SIZE)
+  parser.add_argument("--cols", type=int, default=ui.BOARD_SIZE)
+  parser.add_argument("--events", type=int, default=100000, help="events to send (random input)")
+  parser.add_argument("--duration", type=float, help="stop after this many seconds instead")
+  parser.add_argument("--seed", type=int, default=0, help="seed for the random input and the boards")
+  parser.add_argument("--script", help="read events from this file instead of generating them")
+  parser.add_argument("--repeat", type=int, default=1, help="times to play the script")
+  parser.add_argument("--render", action="store_true", help="also redraw what each event changed, offscreen")
+  parser.add_argument("--check-every", type=int, default=1000, help="events between full board checks, 0 for none")
+  parser.add_argument("--trace-memory", action="store_true", help="report memory allocated while handling events")
+  args = parser.parse_args()
+
+  pygame.display.init()
+  driver = InputLoadDriver(args.rows, args.cols, args.seed, args.render, args.check_every)
+  if args.script:
+    with open(args.script) as file:
+      events = script_events(driver, file.read().splitlines(), args.repeat)
+    count = None
+  else:
+    events = random_events(driver, random.Random(args.seed))
+    count = None if args.duration is not None else args.events
+
+  if args.trace_memory:
+    tracemalloc.start()
+  start = time.perf_counter()
+  try:
+    driver.run(events, count, args.duration)
+  except ValueError as error: # bad script line
+    parser.error(str(error))
+  elapsed = time.perf_counter() - start
+  driver.report(elapsed)
+  if args.trace_memory:
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory: {current / 1024:,.0f} KiB still allocated, {peak / 1024:,.0f} KiB peak")
+  pygame.quit()
+  sys.exit(1 if driver.violation_count else 0)
+
+
+if __name__ == "__main__":
+  main()
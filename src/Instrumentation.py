@@ -0,0 +1,174 @@
+'''
+Instrumentation.py
+Description: Optional low-overhead instrumentation for the game. Collects per-frame section timings, game counters
+             (cells uncovered per click, flood fill sizes, board generation time) and input-to-render latency into
+             fixed-size log-scale histograms, formats them for the in-game debug overlay and periodically dumps them
+             to a JSON file. Nothing here runs unless a Metrics object is created, callers keep a None reference
+             while instrumentation is off so the hot paths only pay for a None check.
+Inputs: Timings from the UI loop, GameLogic actions
+Outputs: Overlay text lines, JSON metric dumps
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import json
+import math
+import time
+
+from GameLogic import Action
+
+
+BUCKETS_PER_DOUBLING = 4 # histogram resolution, bucket edges grow by 2 ** (1 / 4) (about 19%)
+BUCKET_COUNT = 128 # covers 1 to 2 ** 32 units
+DUMP_INTERVAL = 5.0 # seconds between periodic dumps
+
+
+class Histogram:
+  '''log-scale histogram with a fixed number of buckets, values below 1 share the first bucket'''
+  __slots__ = ("buckets", "count", "total", "max", "last")
+
+  def __init__(self):
+    self.buckets = [0] * BUCKET_COUNT
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+    self.last = 0.0
+
+  def record(self, value):
+    index = int(math.log2(value) * BUCKETS_PER_DOUBLING) + 1 if value >= 1 else 0
+    self.buckets[min(index, BUCKET_COUNT - 1)] += 1
+    self.count += 1
+    self.total += value
+    self.last = value
+    if value > self.max:
+      self.max = value
+
+  @property
+  def mean(self):
+    return self.total / self.count if self.count else 0.0
+
+  def percentile(self, p):
+    '''upper edge of the bucket holding the p-th percentile (0-100), capped at the largest value seen'''
+    if not self.count:
+      return 0.0
+    rank = self.count * p / 100
+    seen = 0
+    for index, count in enumerate(self.buckets):
+      seen += count
+      if seen >= rank and count:
+        return min(2 ** (index / BUCKETS_PER_DOUBLING), self.max)
+    return self.max
+
+  def summary(self):
+    return {
+      "count": self.count,
+      "mean": self.mean,
+      "p50": self.percentile(50),
+      "p90": self.percentile(90),
+      "p99": self.percentile(99),
+      "max": self.max,
+      "last": self.last,
+    }
+
+
+class Metrics:
+  '''named counters and histograms, times are recorded in microseconds'''
+  def __init__(self, dump_path=None, dump_interval=DUMP_INTERVAL):
+    self.counters = {}
+    self.histograms = {}
+    self.started = time.perf_counter()
+    self.dump_path = dump_path
+    self.dump_interval = dump_interval
+    self.next_dump = self.started + dump_interval
+    self.game = None
+
+  def count(self, name, amount=1):
+    self.counters[name] = self.counters.get(name, 0) + amount
+
+  def record(self, name, value):
+    histogram = self.histograms.get(name)
+    if histogram is None:
+      histogram = self.histograms[name] = Histogram()
+    histogram.record(value)
+
+  def elapsed(self, name, start):
+    '''record the time since start (a time.perf_counter value) under name'''
+    self.record(name, (time.perf_counter() - start) * 1e6)
+
+  # Game hooks
+
+  def attach(self, game):
+    '''count uncovered cells and flood fills through a GameLogic observer, and time board generation through its
+    generation hooks, which report the time taken wherever the board was laid out'''
+    self.detach()
+    self.game = game
+    game.add_observer(self.observe)
+    game.generation_hooks.append(self.generated)
+
+  def detach(self):
+    game = self.game
+    if game is not None:
+      game.remove_observer(self.observe)
+      game.generation_hooks.remove(self.generated)
+      self.game = None
+
+  def generated(self, game, source, seconds):
+    self.record("board_generation", seconds * 1e6)
+    self.count("boards_" + source)
+
+  def observe(self, game, action, row, col, changed):
+    if action == Action.Uncover:
+      opened = len(changed)
+      self.count("clicks")
+      self.count("cells_uncovered", opened)
+      self.record("cells_per_click", opened)
+      if opened > 1:
+        self.record("flood_fill_size", opened)
+    elif action == Action.Flag or action == Action.Unflag:
+      self.count("flag_toggles")
+    elif action == Action.Start:
+      self.count("games")
+    elif action == Action.Undo or action == Action.Redo:
+      self.count(action.name.lower() + "s")
+
+  # Output
+
+  def snapshot(self):
+    '''all metrics as a JSON-serializable dict'''
+    return {
+      "uptime": time.perf_counter() - self.started,
+      "counters": dict(self.counters),
+      "histograms": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+    }
+
+  def dump(self, path=None):
+    with open(path or self.dump_path, "w") as file:
+      json.dump(self.snapshot(), file, indent=2)
+
+  def maybe_dump(self, now):
+    '''dump to dump_path if the interval has passed since the last dump'''
+    if self.dump_path is not None and now >= self.next_dump:
+      self.dump()
+      self.next_dump = now + self.dump_interval
+
+  def overlay_lines(self):
+    '''short text lines for the debug overlay'''
+    def ms(name, p=None):
+      histogram = self.histograms.get(name)
+      if histogram is None:
+        return "-"
+      value = histogram.last if p is None else histogram.percentile(p)
+      return f"{value / 1000:.2f}"
+
+    frames = self.histograms.get("frame")
+    fps = frames.count / (time.perf_counter() - self.started) if frames else 0.0
+    cells = self.histograms.get("cells_per_click")
+    flood = self.histograms.get("flood_fill_size")
+    return [
+      f"fps {fps:.0f}  frame {ms('frame')} ms  p99 {ms('frame', 99)}",
+      f"events {ms('events')}  logic {ms('logic')}  render {ms('render')}  present {ms('present')} ms",
+      f"input latency p50 {ms('input_latency', 50)}  p99 {ms('input_latency', 99)} ms",
+      f"last click {cells.last if cells else 0:.0f} cells  largest flood {flood.max if flood else 0:.0f}",
+      f"board generation {ms('board_generation')} ms  clicks {self.counters.get('clicks', 0)}",
+    ]
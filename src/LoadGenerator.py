@@ -0,0 +1,109 @@
+'''
+LoadGenerator.py
+Description: Load generator for GameServer. Opens many concurrent connections, each playing random games through
+             the JSON protocol, and reports requests per second and request latency percentiles.
+Inputs: Command line options (server address, connections, duration, board size, mines, seed)
+Outputs: Throughput and latency summary printed to stdout
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+from GameServer import DEFAULT_PORT
+
+
+class Client:
+  '''one connection sending requests one at a time'''
+  def __init__(self, reader, writer, latencies):
+    self.reader = reader
+    self.writer = writer
+    self.latencies = latencies
+    self.errors = Counter() # error message -> replies
+
+  async def request(self, **request):
+    start = time.perf_counter()
+    self.writer.write(json.dumps(request).encode() + b"\n")
+    response = json.loads(await self.reader.readline())
+    self.latencies.append(time.perf_counter() - start)
+    if not response["ok"]:
+      self.errors[response.get("error")] += 1
+    return response
+
+
+async def play(host, port, deadline, rows, cols, mines, seed, latencies):
+  '''play random games on one connection until deadline, returns (games, Counter of error replies)
+  a game that gets an error reply is given up and the session reset'''
+  reader, writer = await asyncio.open_connection(host, port)
+  client = Client(reader, writer, latencies)
+  rng = random.Random(seed)
+  games = 0
+  try:
+    response = await client.request(op="create", rows=rows, cols=cols, mines=mines, seed=rng.randrange(1 << 63))
+    if not response["ok"]:
+      return games, client.errors
+    session = response["session"]
+    while time.perf_counter() < deadline:
+      games += 1
+      covered = set(range(rows * cols)) # cells the client has not seen uncovered yet
+      while response["ok"] and response["state"] == "Playing" and time.perf_counter() < deadline:
+        i = rng.choice(tuple(covered)) if len(covered) < 64 else rng.randrange(rows * cols)
+        if rng.random() < 0.1:
+          response = await client.request(op="flag", session=session, row=i // cols, col=i % cols)
+          response = await client.request(op="flag", session=session, row=i // cols, col=i % cols)
+        else:
+          response = await client.request(op="uncover", session=session, row=i // cols, col=i % cols)
+          for row, col, _ in response.get("uncovered", ()):
+            covered.discard(row * cols + col)
+      response = await client.request(op="reset", session=session, seed=rng.randrange(1 << 63))
+    await client.request(op="close", session=session)
+  finally:
+    writer.close()
+  return games, client.errors
+
+
+def percentile(ordered, p):
+  return ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)] if ordered else 0.0
+
+
+async def run(host, port, connections, duration, rows, cols, mines, seed):
+  latencies = []
+  start = time.perf_counter()
+  deadline = start + duration
+  results = await asyncio.gather(*(play(host, port, deadline, rows, cols, mines, seed * 1000003 + k, latencies)
+                                   for k in range(connections)))
+  elapsed = time.perf_counter() - start
+
+  latencies.sort()
+  games = sum(games for games, _ in results)
+  errors = sum((errors for _, errors in results), Counter())
+  print(f"connections: {connections}  requests: {len(latencies)}  games: {games}  errors: {sum(errors.values())}")
+  for message, count in errors.most_common(5):
+    print(f"  {count} x {message}")
+  print(f"throughput: {len(latencies) / elapsed:,.0f} requests/s")
+  print("latency: " + "  ".join(f"p{p} {percentile(latencies, p) * 1000:.2f}ms" for p in (50, 90, 99, 99.9))
+        + f"  max {latencies[-1] * 1000 if latencies else 0:.2f}ms")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Load generator for the Minesweeper game server")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+  parser.add_argument("--connections", type=int, default=100, help="concurrent connections, one session each")
+  parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+  parser.add_argument("--rows", type=int, default=16)
+  parser.add_argument("--cols", type=int, default=16)
+  parser.add_argument("--mines", type=int, default=40)
+  parser.add_argument("--seed", type=int, default=0)
+  args = parser.parse_args()
+  asyncio.run(run(args.host, args.port, args.connections, args.duration, args.rows, args.cols, args.mines, args.seed))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,341 @@
+'''
+MoveLog.py
+Description: Compact binary log of every action that goes through GameLogic, and a replay engine that rebuilds any
+             game state from it without a UI. Each action is one fixed-width 16 byte record, an undo or redo is followed by
+             one record per cell it restored. Periodic checkpoints of
+             the full game state let replay fast-forward to any move index without starting from move zero.
+Inputs: GameLogic (recording), log files (replay)
+Outputs: Log files, replayed GameLogic instances
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import argparse
+import multiprocessing
+import struct
+
+from GameLogic import GameLogic, GameState, Action
+
+
+MAGIC = b"MSLG"
+VERSION = 2
+CHECKPOINT_INTERVAL = 256 # events between checkpoints
+
+# file header: magic, version, rows, cols, event count, checkpoint count
+HEADER = struct.Struct("<4sHHIII")
+# one event: action, then three values
+#   Uncover/Flag/Unflag: row, col, 0
+#   Start: total mines, low and high 32 bits of the seed
+#   Reset: 0, 0, 0
+#   Undo/Redo: cells restored, state and flags remaining after it, followed by that many CELL records
+#   CELL: flat index, covered, flagged, the values an Undo or Redo left in one cell
+EVENT = struct.Struct("<B3xIII")
+CELL = 255 # record kind of restored cells, not an Action
+# checkpoint: event index, state, board dealt, total mines, flags remaining, covered cells, seed, rng position
+CHECKPOINT = struct.Struct("<IBBIIIQI")
+# Mersenne Twister state words stored with every checkpoint
+RNG_WORDS = struct.Struct("<624I")
+
+
+class Checkpoint:
+  '''full game state after the first index events of a log'''
+  __slots__ = ("index", "state", "dealt", "total_mines", "flags_remaining", "covered_cells", "seed", "rng_state",
+               "planes")
+
+  def __init__(self, index, state, dealt, total_mines, flags_remaining, covered_cells, seed, rng_state, planes):
+    self.index = index
+    self.state = state
+    self.dealt = dealt
+    self.total_mines = total_mines
+    self.flags_remaining = flags_remaining
+    self.covered_cells = covered_cells
+    self.seed = seed
+    self.rng_state = rng_state
+    self.planes = planes # covered, flagged, mines, counts concatenated
+
+  @classmethod
+  def capture(cls, game, index):
+    '''snapshot game after index events'''
+    board = game.board
+    planes = bytes(board.covered) + bytes(board.flagged) + bytes(board.mines) + bytes(board.counts)
+    return cls(index, game.state.value, game.dealt, game.total_mines, game.flags_remaining, game.covered_cells,
+               game.seed, game.rng.getstate(), planes)
+
+  def restore(self, game):
+    '''overwrite game with this snapshot'''
+    board = game.board
+    size = board.size
+    board.covered[:] = self.planes[0:size]
+    board.flagged[:] = self.planes[size:2 * size]
+    board.mines[:] = self.planes[2 * size:3 * size]
+    board.counts[:] = self.planes[3 * size:4 * size]
+    game.state = GameState(self.state)
+    game.dealt = bool(self.dealt)
+    game.total_mines = self.total_mines
+    game.flags_remaining = self.flags_remaining
+    game.covered_cells = self.covered_cells
+    game.seed = self.seed
+    game.rng.setstate(self.rng_state)
+
+
+def record_kind(kind):
+  '''the Action of a record kind, or CELL'''
+  return CELL if kind == CELL else Action(kind)
+
+
+class MoveLog:
+  '''fixed-width binary event log for games on one board size'''
+  def __init__(self, rows, cols, checkpoint_interval=CHECKPOINT_INTERVAL):
+    self.rows = rows
+    self.cols = cols
+    self.checkpoint_interval = checkpoint_interval
+    self.events = bytearray()
+    self.checkpoints = [] # ordered by index
+
+  def __len__(self):
+    return len(self.events) // EVENT.size
+
+  def append(self, action, a=0, b=0, c=0):
+    '''add one event record'''
+    self.events += EVENT.pack(action.value, a, b, c)
+
+  def append_cell(self, index, covered, flagged):
+    '''add one CELL record'''
+    self.events += EVENT.pack(CELL, index, covered, flagged)
+
+  def event(self, index):
+    '''decode event index as (action or CELL, a, b, c)'''
+    kind, a, b, c = EVENT.unpack_from(self.events, index * EVENT.size)
+    return record_kind(kind), a, b, c
+
+  # Persistence
+
+  def save(self, path):
+    '''write the log and its checkpoints to path'''
+    with open(path, "wb") as file:
+      file.write(HEADER.pack(MAGIC, VERSION, self.rows, self.cols, len(self), len(self.checkpoints)))
+      file.write(self.events)
+      for checkpoint in self.checkpoints:
+        version, words, _ = checkpoint.rng_state
+        file.write(CHECKPOINT.pack(checkpoint.index, checkpoint.state, checkpoint.dealt, checkpoint.total_mines,
+                                   checkpoint.flags_remaining, checkpoint.covered_cells, checkpoint.seed, words[624]))
+        file.write(RNG_WORDS.pack(*words[:624]))
+        file.write(checkpoint.planes)
+
+  @classmethod
+  def load(cls, path):
+    '''read a log written by save'''
+    with open(path, "rb") as file:
+      data = file.read()
+    magic, version, rows, cols, event_count, checkpoint_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+      raise ValueError(f"{path} is not a version {VERSION} move log")
+    log = cls(rows, cols)
+    offset = HEADER.size
+    log.events = bytearray(data[offset:offset + event_count * EVENT.size])
+    offset += event_count * EVENT.size
+
+    plane_bytes = 4 * rows * cols
+    for _ in range(checkpoint_count):
+      index, state, dealt, total_mines, flags_remaining, covered_cells, seed, position = \
+        CHECKPOINT.unpack_from(data, offset)
+      offset += CHECKPOINT.size
+      words = RNG_WORDS.unpack_from(data, offset) + (position,)
+      offset += RNG_WORDS.size
+      planes = bytes(data[offset:offset + plane_bytes])
+      offset += plane_bytes
+      log.checkpoints.append(Checkpoint(index, state, dealt, total_mines, flags_remaining, covered_cells, seed,
+                                        (3, words, None), planes))
+    return log
+
+
+class MoveRecorder:
+  '''GameLogic observer that appends every action to a MoveLog and takes periodic checkpoints'''
+  def __init__(self, game, log=None):
+    self.game = game
+    self.log = log or MoveLog(game.board.rows, game.board.cols)
+    # the game may already be in progress, so start from a checkpoint of where it is now
+    self.log.checkpoints.append(Checkpoint.capture(game, len(self.log)))
+    game.add_observer(self.observe)
+
+  def detach(self):
+    '''stop recording'''
+    self.game.remove_observer(self.observe)
+
+  def observe(self, game, action, row, col, changed):
+    log = self.log
+    if action == Action.Start:
+      log.append(action, game.total_mines, game.seed & 0xFFFFFFFF, game.seed >> 32)
+    elif action == Action.Reset:
+      log.append(action)
+    elif action == Action.Undo or action == Action.Redo:
+      # the cells it restored, with the values they were left with, a cell changed by several moves once
+      cells = dict.fromkeys(changed)
+      log.append(action, len(cells), game.state.value, game.flags_remaining)
+      covered, flagged = game.board.covered, game.board.flagged
+      for i in cells:
+        log.append_cell(i, covered[i], flagged[i])
+    else:
+      log.append(action, row, col)
+    if len(log) - log.checkpoints[-1].index >= log.checkpoint_interval:
+      log.checkpoints.append(Checkpoint.capture(game, len(log)))
+
+
+def apply_event(game, action, a, b, c):
+  '''perform one logged action on game'''
+  if action == Action.Uncover:
+    game.uncover_cell(a, b)
+  elif action == Action.Flag or action == Action.Unflag:
+    game.toggle_flagged_cell(a, b)
+  elif action == Action.Start:
+    # the seed in effect when the game started reproduces its board and first click
+    game.reseed(b | (c << 32))
+    game.set_mines(a)
+    game.start_game()
+  elif action == Action.Reset:
+    # the next Start record carries the seed, so the fresh one picked here never matters
+    game.reset_game(seed=0)
+  elif action == Action.Undo or action == Action.Redo:
+    # the CELL records after it write the cells back
+    game.state = GameState(b)
+    game.flags_remaining = c
+  elif action == CELL:
+    board = game.board
+    game.covered_cells += b - board.covered[a]
+    board.covered[a] = b
+    board.flagged[a] = c
+
+
+def replay(log, upto=None, game=None):
+  '''rebuild the game after the first upto events (all of them by default)
+  starts from the latest checkpoint at or before upto instead of from move zero'''
+  if upto is None:
+    upto = len(log)
+  if not 0 <= upto <= len(log):
+    raise IndexError("move index out of range")
+  game = game or GameLogic(log.rows, log.cols)
+
+  start = 0
+  for checkpoint in reversed(log.checkpoints):
+    if checkpoint.index <= upto:
+      checkpoint.restore(game)
+      start = checkpoint.index
+      break
+
+  events, size = log.events, EVENT.size
+  unpack = EVENT.unpack_from
+  for index in range(start, upto):
+    kind, a, b, c = unpack(events, index * size)
+    apply_event(game, record_kind(kind), a, b, c)
+  return game
+
+
+def verify(log, expected_state=None):
+  '''replay a whole log from move zero and check every checkpoint matches, returns the final game'''
+  game = GameLogic(log.rows, log.cols)
+  checkpoints = iter(log.checkpoints)
+  checkpoint = next(checkpoints, None)
+  if checkpoint is not None and checkpoint.index == 0:
+    checkpoint.restore(game)
+    checkpoint = next(checkpoints, None)
+
+  events, size = log.events, EVENT.size
+  unpack = EVENT.unpack_from
+  for index in range(len(log)):
+    kind, a, b, c = unpack(events, index * size)
+    apply_event(game, record_kind(kind), a, b, c)
+    if checkpoint is not None and checkpoint.index == index + 1:
+      if Checkpoint.capture(game, index + 1).planes != checkpoint.planes:
+        raise AssertionError(f"replay diverged from the recorded game at move {index + 1}")
+      checkpoint = next(checkpoints, None)
+
+  if expected_state is not None and game.state != expected_state:
+    raise AssertionError(f"replay ended in {game.state.name}, expected {expected_state.name}")
+  return game
+
+
+def self_check(seed=0, moves=400):
+  '''record a random game with undos and redos in between its moves, then check that the log verifies and
+  replays to the same board, both as recorded and after a save and load round trip'''
+  import os
+  import random
+  import tempfile
+  from UndoHistory import UndoHistory
+
+  rng = random.Random(seed)
+  game = GameLogic(16, 16, seed=seed)
+  recorder = MoveRecorder(game, MoveLog(16, 16, checkpoint_interval=32))
+  history = UndoHistory(game)
+  game.set_mines(40)
+  game.start_game()
+  game.uncover_cell(8, 8)
+  history.undo() # the first click can be undone too, the board stays as it was dealt
+  if game.covered_cells != game.board.size:
+    raise AssertionError("the first click was not undone")
+  for _ in range(moves):
+    if game.state != GameState.Playing:
+      history.undo() # step back from a loss, or a win, and keep playing
+      continue
+    roll = rng.random()
+    if roll < 0.15:
+      history.undo(rng.randint(1, 4))
+    elif roll < 0.25:
+      history.redo(rng.randint(1, 3))
+    elif roll < 0.4:
+      game.toggle_flagged_cell(rng.randrange(16), rng.randrange(16))
+    else:
+      game.uncover_cell(rng.randrange(16), rng.randrange(16))
+  log = recorder.log
+  if not any(log.event(index)[0] in (Action.Undo, Action.Redo) for index in range(len(log))):
+    raise AssertionError("the game recorded no undo or redo")
+
+  fd, path = tempfile.mkstemp(suffix=".mslog")
+  os.close(fd)
+  try:
+    log.save(path)
+    logs = (log, MoveLog.load(path))
+  finally:
+    os.unlink(path)
+  for checked in logs:
+    for replayed in (verify(checked, game.state), replay(checked)):
+      if ((replayed.board.covered, replayed.board.flagged, replayed.covered_cells, replayed.flags_remaining)
+          != (game.board.covered, game.board.flagged, game.covered_cells, game.flags_remaining)):
+        raise AssertionError("replayed board differs from the played one")
+  return len(log)
+
+
+def verify_file(path):
+  '''load and verify one log file, returns (path, error message or None)'''
+  try:
+    verify(MoveLog.load(path))
+  except (AssertionError, ValueError) as error:
+    return path, str(error)
+  return path, None
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Replay and verify Minesweeper move logs")
+  parser.add_argument("paths", nargs="*", help="log files written by MoveLog.save")
+  parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+  parser.add_argument("--self-check", action="store_true", help="record, verify and replay a game with undo and redo")
+  args = parser.parse_args()
+
+  if args.self_check:
+    print(f"self check passed, {self_check()} events")
+  if not args.paths:
+    if not args.self_check:
+      parser.error("no log files given")
+    return
+
+  failures = 0
+  with multiprocessing.Pool(args.workers) as pool:
+    for path, error in pool.imap_unordered(verify_file, args.paths, chunksize=64):
+      if error is not None:
+        failures += 1
+        print(f"{path}: {error}")
+  print(f"verified {len(args.paths) - failures}/{len(args.paths)} logs")
+
+
+if __name__ == "__main__":
+  main()
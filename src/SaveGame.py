@@ -0,0 +1,145 @@
+'''
+SaveGame.py
+Description: Save/load format for game states. A small fixed header (board size, game counters, seed and random
+             generator state) is followed by the four board state planes (covered, flagged, mines, counts) stored as
+             contiguous page-aligned byte arrays, so a saved board can be opened through mmap without reading it.
+Inputs: GameLogic (saving), save files (loading)
+Outputs: Save files, GameLogic instances backed by memory-mapped planes
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import mmap
+import os
+import struct
+import tempfile
+
+from BoardManager import BoardManager
+from GameLogic import GameLogic, GameState
+
+
+MAGIC = b"MSSV"
+VERSION = 2
+PAGE = mmap.ALLOCATIONGRANULARITY # planes start on allocation boundaries so each can be mapped on its own
+
+# magic, version, rows, cols, state, board dealt, total mines, flags remaining, covered cells, seed, rng position
+HEADER = struct.Struct("<4sHIIBBIQQQI")
+# Mersenne Twister state words, stored right after the header
+RNG_WORDS = struct.Struct("<624I")
+PLANES = ("covered", "flagged", "mines", "counts")
+
+
+def align(offset):
+  '''round offset up to the next PAGE boundary'''
+  return (offset + PAGE - 1) // PAGE * PAGE
+
+
+def plane_offsets(size):
+  '''byte offset of each plane in a save file for a board of size cells'''
+  first = align(HEADER.size + RNG_WORDS.size)
+  stride = align(size)
+  return [first + k * stride for k in range(len(PLANES))]
+
+
+def file_mode():
+  '''permissions of a newly created file under the current umask'''
+  umask = os.umask(0)
+  os.umask(umask)
+  return 0o666 & ~umask
+
+
+def save_game(game, path):
+  '''write game to path, the game can be continued exactly from the file with load_game
+  saving over the file a game was loaded from is safe: a memory-mapped game is moved into memory (see close_game)
+  before the file is replaced, a write-through game can use flush_game instead'''
+  board = game.board
+  _, words, _ = game.rng.getstate()
+  offsets = plane_offsets(board.size)
+  # written next to path and then moved over it, the planes may be mapped from the file being replaced
+  directory, filename = os.path.split(os.path.abspath(path))
+  fd, temporary = tempfile.mkstemp(prefix=filename + ".", suffix=".tmp", dir=directory)
+  try:
+    with os.fdopen(fd, "wb") as file:
+      file.write(HEADER.pack(MAGIC, VERSION, board.rows, board.cols, game.state.value, game.dealt,
+                             game.total_mines, game.flags_remaining, game.covered_cells, game.seed, words[624]))
+      file.write(RNG_WORDS.pack(*words[:624]))
+      for plane, offset in zip(PLANES, offsets):
+        file.seek(offset)
+        file.write(getattr(board, plane))
+      file.truncate(offsets[-1] + align(board.size))
+    os.chmod(temporary, file_mode()) # mkstemp creates the file readable by its owner only
+    close_game(game) # a mapped file cannot be replaced on Windows
+    os.replace(temporary, path)
+  except BaseException:
+    os.unlink(temporary)
+    raise
+
+
+def load_game(path, use_mmap=True, write_through=False):
+  '''open a game saved by save_game
+  with use_mmap the planes stay in the file and are paged in only where they are read, so opening is near
+  instant whatever the board size. moves go to private copy-on-write pages unless write_through is set, in which
+  case they are written back to the file (flush with flush_game). close_game releases the file'''
+  with open(path, "r+b" if write_through else "rb") as file:
+    header = file.read(HEADER.size + RNG_WORDS.size)
+    magic, version, rows, cols, state, dealt, total_mines, flags_remaining, covered_cells, seed, position = \
+      HEADER.unpack_from(header, 0)
+    if magic != MAGIC or version != VERSION:
+      raise ValueError(f"{path} is not a version {VERSION} save file")
+    words = RNG_WORDS.unpack_from(header, HEADER.size) + (position,)
+    size = rows * cols
+    offsets = plane_offsets(size)
+
+    if use_mmap and size:
+      access = mmap.ACCESS_WRITE if write_through else mmap.ACCESS_COPY
+      mapping = mmap.mmap(file.fileno(), 0, access=access)
+      view = memoryview(mapping)
+      planes = [view[offset:offset + size] for offset in offsets]
+    else:
+      mapping = None
+      planes = []
+      for offset in offsets:
+        file.seek(offset)
+        planes.append(bytearray(file.read(size)))
+
+  board = BoardManager(rows, cols, planes=planes)
+  board.mapping = mapping
+  game = GameLogic(rows, cols, seed=seed, board=board)
+  game.state = GameState(state)
+  game.dealt = bool(dealt)
+  game.total_mines = total_mines
+  game.flags_remaining = flags_remaining
+  game.covered_cells = covered_cells
+  game.rng.setstate((3, words, None))
+  return game
+
+
+def flush_game(game):
+  '''write a write-through game's counters and dirty pages back to its file'''
+  mapping = game.board.mapping
+  if mapping is None:
+    raise ValueError("game is not backed by a memory-mapped save file")
+  _, words, _ = game.rng.getstate()
+  board = game.board
+  HEADER.pack_into(mapping, 0, MAGIC, VERSION, board.rows, board.cols, game.state.value, game.dealt,
+                   game.total_mines, game.flags_remaining, game.covered_cells, game.seed, words[624])
+  RNG_WORDS.pack_into(mapping, HEADER.size, *words[:624])
+  mapping.flush()
+
+
+def close_game(game, keep=True):
+  '''release the mmap behind a game opened by load_game, nothing to do for a game held in memory
+  with keep the planes are copied into memory first so the game can still be played and saved, otherwise its
+  board can no longer be used. flush a write-through game with flush_game first to keep its counters'''
+  board = game.board
+  mapping = board.mapping
+  if mapping is None:
+    return
+  views = [getattr(board, plane) for plane in PLANES]
+  for plane, view in zip(PLANES, views):
+    setattr(board, plane, bytearray(view) if keep else None)
+  for view in views:
+    view.release()
+  mapping.close()
+  board.mapping = None
@@ -0,0 +1,195 @@
+'''
+Simulator.py
+Description: Headless game engine. Plays complete games on GameLogic/BoardManager with a pluggable move
+             policy and no display, spreads games across a process pool with per-worker seeds, and
+             aggregates win rates, move counts and timings.
+Inputs: Command line options (games, board size, mines, policy, workers, seed)
+Outputs: Aggregate statistics printed to stdout, optionally every game recorded in a GameStats database
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import argparse
+import multiprocessing
+import random
+import time
+
+from GameLogic import GameLogic, GameState
+from GameStats import GameStats, StatsRecorder
+
+
+# a move is (action, row, col), action is one of these
+UNCOVER = 0
+FLAG = 1
+
+
+# Move policies
+# A policy is a top-level function policy(game, rng) -> (action, row, col) so it can be sent to worker processes.
+# It is only called while game.state is GameState.Playing.
+
+def random_policy(game, rng):
+  '''uncover a random covered, unflagged cell'''
+  board = game.board
+  covered, flagged = board.covered, board.flagged
+  size, cols = board.size, board.cols
+  while True:
+    i = rng.randrange(size)
+    if covered[i] and not flagged[i]:
+      return UNCOVER, i // cols, i % cols
+
+
+def first_corner_policy(game, rng):
+  '''uncover the top left corner first, then play randomly'''
+  if game.covered_cells == game.board.size:
+    return UNCOVER, 0, 0
+  return random_policy(game, rng)
+
+
+POLICIES = {
+  "random": random_policy,
+  "corner": first_corner_policy,
+}
+
+
+class SimulationResult:
+  '''aggregate statistics over a batch of simulated games'''
+  def __init__(self, games=0, wins=0, moves=0, game_seconds=0.0, elapsed=0.0):
+    self.games: int = games
+    self.wins: int = wins
+    self.moves: int = moves
+    self.game_seconds: float = game_seconds # time spent inside games, summed over all workers
+    self.elapsed: float = elapsed # wall clock time for the whole batch
+    self.records: list = None # GameStats records of the batch's games, when they are being recorded
+
+  def merge(self, other, stats=None):
+    '''add another result's counts into this one, and its game records to stats (a GameStats) if given'''
+    self.games += other.games
+    self.wins += other.wins
+    self.moves += other.moves
+    self.game_seconds += other.game_seconds
+    if stats is not None and other.records:
+      stats.add_many(other.records)
+
+  @property
+  def win_rate(self) -> float:
+    return self.wins / self.games if self.games else 0.0
+
+  @property
+  def moves_per_game(self) -> float:
+    return self.moves / self.games if self.games else 0.0
+
+  @property
+  def seconds_per_game(self) -> float:
+    return self.game_seconds / self.games if self.games else 0.0
+
+  @property
+  def games_per_second(self) -> float:
+    return self.games / self.elapsed if self.elapsed else 0.0
+
+  def summary(self) -> str:
+    return (f"games: {self.games}  wins: {self.wins} ({self.win_rate:.2%})  "
+            f"moves/game: {self.moves_per_game:.2f}  time/game: {self.seconds_per_game * 1e6:.1f}us  "
+            f"throughput: {self.games_per_second:,.0f} games/s")
+
+
+def play_game(game, policy, mines, rng):
+  '''play one game to completion on a reused GameLogic, returns (won, moves)
+  the board seed is drawn from rng, so GameLogic.from_seed(game.seed, ...) rebuilds the game afterwards'''
+  game.reset_game(seed=rng.randrange(1 << 63))
+  game.set_mines(mines)
+  game.start_game()
+
+  moves = 0
+  while game.state == GameState.Playing:
+    action, row, col = policy(game, rng)
+    if action == UNCOVER:
+      game.uncover_cell(row, col)
+    else:
+      game.toggle_flagged_cell(row, col)
+    moves += 1
+
+  return game.state == GameState.EndWin, moves
+
+
+def run_batch(task):
+  '''worker entry point, plays a batch of games from its own seed and returns their SimulationResult'''
+  games, rows, cols, mines, policy_name, seed, record = task
+  policy = POLICIES[policy_name]
+
+  # game seeds and policy choices both come from the batch seed, so every batch is reproducible
+  rng = random.Random(seed)
+  game = GameLogic(rows, cols)
+  result = SimulationResult()
+  clock = time.perf_counter
+  if record: # records go back to the parent, which writes them in batches
+    result.records = []
+    StatsRecorder(game, result.records.append)
+
+  for _ in range(games):
+    start = clock()
+    won, moves = play_game(game, policy, mines, rng)
+    result.game_seconds += clock() - start
+    result.games += 1
+    result.wins += won
+    result.moves += moves
+
+  return result
+
+
+def simulate(games, rows=10, cols=10, mines=10, policy="random", workers=None, seed=0, batch_size=1000, stats=None):
+  '''play games across a process pool, returns the aggregate SimulationResult
+  every game is also added to stats (a GameStats) when one is given'''
+  if policy not in POLICIES:
+    raise ValueError(f"unknown policy {policy!r}, expected one of {sorted(POLICIES)}")
+  if not 0 < mines < rows * cols:
+    raise ValueError("mine count must leave at least one safe cell")
+
+  # split the games into batches, each with its own seed derived from the run seed
+  tasks = []
+  remaining = games
+  batch = 0
+  while remaining > 0:
+    count = min(batch_size, remaining)
+    tasks.append((count, rows, cols, mines, policy, seed * 1000003 + batch, stats is not None))
+    remaining -= count
+    batch += 1
+
+  total = SimulationResult()
+  start = time.perf_counter()
+  if workers == 1:
+    for task in tasks:
+      total.merge(run_batch(task), stats)
+  else:
+    with multiprocessing.Pool(workers) as pool:
+      for result in pool.imap_unordered(run_batch, tasks):
+        total.merge(result, stats)
+  if stats is not None:
+    stats.flush()
+  total.elapsed = time.perf_counter() - start
+  return total
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Headless Minesweeper simulation")
+  parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+  parser.add_argument("--rows", type=int, default=10)
+  parser.add_argument("--cols", type=int, default=10)
+  parser.add_argument("--mines", type=int, default=10)
+  parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+  parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--batch-size", type=int, default=1000, help="games per worker task")
+  parser.add_argument("--stats-db", help="record every game in this GameStats database")
+  args = parser.parse_args()
+
+  stats = GameStats(args.stats_db) if args.stats_db else None
+  result = simulate(args.games, args.rows, args.cols, args.mines, args.policy,
+                    args.workers, args.seed, args.batch_size, stats)
+  print(result.summary())
+  if stats is not None:
+    stats.close()
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,558 @@
+'''
+Solver.py
+Description: Constraint propagation solver for a GameLogic instance. Finds forced safe and forced mine cells from
+             the numbers shown on the board, falls back to exact (or sampled) mine probabilities when nothing is
+             forced, and updates incrementally from GameLogic's observer notifications instead of rescanning.
+Inputs: GameLogic
+Outputs: Safe cells, mine cells, per-cell mine probabilities
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import math
+import random
+import time
+from array import array
+
+from GameLogic import Action, GameState
+
+
+# components with more unknown cells than this are sampled instead of enumerated
+MAX_EXACT_CELLS = 24
+# number of random consistent assignments drawn for a sampled component
+SAMPLE_COUNT = 2000
+# samples drawn between the steps estimates() yields
+SAMPLE_BATCH = 100
+
+
+class Solver:
+  '''deduces safe and mine cells on a GameLogic board, kept up to date through game.add_observer
+  the solver only reads what a player can see: which cells are uncovered and the numbers on them
+  flags placed by the player are not trusted, the solver keeps its own set of deduced mines'''
+  def __init__(self, game):
+    self.game = game
+    self.board = game.board
+    size = self.board.size
+    self.known_mine = bytearray(size) # 1 where the solver has proven a mine
+    self.known_safe = bytearray(size) # 1 where the solver has proven a covered cell safe
+    self.safe = set() # proven safe cells that are still covered
+    self.mines = set() # proven mines
+    self.frontier = set() # uncovered numbered cells that still touch unknown cells
+    self.pending = set() # frontier cells whose constraint must be rechecked
+    self.touched = set() # cells whose constraint changed since the last subset pass
+    # observations are numbered so an undo knows which deductions came after the cells it covers again
+    self.epoch = 1
+    self.uncovered_at = array("I", bytes(4 * size)) # epoch each uncovered cell was uncovered in, 0 if covered
+    self.proofs = [] # (cell, epoch) of every deduction, in the order they were made
+    game.add_observer(self.observe)
+    self.rebuild()
+
+  def detach(self):
+    '''stop following the game'''
+    self.game.remove_observer(self.observe)
+
+  # Board helpers
+
+  def neighbors(self, i):
+    '''flat indices of the neighbors of flat index i, from the board's topology table'''
+    return self.board.topology.neighbors(i)
+
+  def unknown_neighbors(self, i):
+    '''covered neighbors of i that are neither proven safe nor proven mines, and how many proven mines touch i'''
+    covered = self.board.covered
+    known_mine, known_safe = self.known_mine, self.known_safe
+    unknown = []
+    mines = 0
+    for n in self.neighbors(i):
+      if known_mine[n]:
+        mines += 1
+      elif covered[n] and not known_safe[n]:
+        unknown.append(n)
+    return unknown, mines
+
+  # Incremental updates
+
+  def clear(self):
+    '''forget every deduction'''
+    size = self.board.size
+    self.known_mine[:] = bytes(size)
+    self.known_safe[:] = bytes(size)
+    self.safe.clear()
+    self.mines.clear()
+    self.frontier.clear()
+    self.pending.clear()
+    self.touched.clear()
+    self.uncovered_at = array("I", bytes(4 * size))
+    self.proofs.clear()
+
+  def rebuild(self):
+    '''forget everything and rescan the board, only needed when attaching to a game in progress'''
+    self.clear()
+    covered, counts = self.board.covered, self.board.counts
+    for i in range(self.board.size):
+      if not covered[i]:
+        self.uncovered_at[i] = self.epoch
+        if counts[i]:
+          self.pending.add(i)
+    self.propagate()
+
+  def observe(self, game, action, row, col, changed):
+    '''GameLogic observer, queues only the constraints around the cells that changed'''
+    if action == Action.Reset:
+      self.board = game.board # reset_game may have swapped in a different board
+      self.clear() # every cell is covered again, there is nothing to scan
+      return
+    if action != Action.Uncover and action != Action.Undo and action != Action.Redo:
+      return # flags are not trusted, so they change nothing
+    self.epoch += 1
+    if action == Action.Undo:
+      self.forget(changed)
+      self.propagate()
+      return
+
+    covered, counts = self.board.covered, self.board.counts
+    for i in changed:
+      if covered[i]:
+        continue # a flag a redo put back
+      self.uncovered_at[i] = self.epoch
+      if self.known_safe[i]:
+        self.known_safe[i] = 0
+        self.safe.discard(i)
+      if counts[i]:
+        self.pending.add(i)
+      # the neighbors' unknown sets just lost a cell
+      for n in self.neighbors(i):
+        if not covered[n] and counts[n]:
+          self.pending.add(n)
+    self.propagate()
+
+  def forget(self, changed):
+    '''drop the deductions an undo may have taken away and requeue the constraints that could prove them again
+    a deduction only rests on cells uncovered before it was made, so the ones made since the earliest cell the undo
+    covered again was uncovered are dropped, and the rest stand'''
+    covered, uncovered_at = self.board.covered, self.uncovered_at
+    since = None
+    requeue = []
+    for i in changed:
+      if not covered[i] or not uncovered_at[i]:
+        continue # a flag the undo took back
+      since = uncovered_at[i] if since is None else min(since, uncovered_at[i])
+      uncovered_at[i] = 0
+      self.frontier.discard(i)
+      self.touched.discard(i)
+      requeue.append(i)
+    if since is None:
+      return
+    proofs = self.proofs
+    while proofs and proofs[-1][1] >= since:
+      i = proofs.pop()[0]
+      if self.known_safe[i]:
+        self.known_safe[i] = 0
+        self.safe.discard(i)
+      elif self.known_mine[i]:
+        self.known_mine[i] = 0
+        self.mines.discard(i)
+      requeue.append(i)
+    for i in requeue:
+      self.requeue_around(i)
+
+  def mark_safe(self, i):
+    '''record a proven safe cell and requeue the constraints around it'''
+    if self.known_safe[i] or self.known_mine[i]:
+      return
+    self.known_safe[i] = 1
+    self.safe.add(i)
+    self.proofs.append((i, self.epoch))
+    self.requeue_around(i)
+
+  def mark_mine(self, i):
+    '''record a proven mine and requeue the constraints around it'''
+    if self.known_mine[i] or self.known_safe[i]:
+      return
+    self.known_mine[i] = 1
+    self.mines.add(i)
+    self.proofs.append((i, self.epoch))
+    self.requeue_around(i)
+
+  def requeue_around(self, i):
+    '''queue every uncovered numbered neighbor of i'''
+    covered, counts = self.board.covered, self.board.counts
+    for n in self.neighbors(i):
+      if not covered[n] and counts[n]:
+        self.pending.add(n)
+
+  def propagate(self):
+    '''apply the single constraint rules, then the subset rule, until nothing new is proven'''
+    counts = self.board.counts
+    while True:
+      while self.pending:
+        i = self.pending.pop()
+        unknown, mines = self.unknown_neighbors(i)
+        if not unknown:
+          self.frontier.discard(i)
+          continue
+        self.frontier.add(i)
+        self.touched.add(i)
+        need = counts[i] - mines
+        if need == 0: # every other neighbor is safe
+          for n in unknown:
+            self.mark_safe(n)
+        elif need == len(unknown): # every other neighbor is a mine
+          for n in unknown:
+            self.mark_mine(n)
+
+      if not self.subset_pass():
+        return
+
+  def subset_pass(self):
+    '''compare each recently changed constraint against nearby ones, returns True if anything was proven
+    if A's unknown cells are a subset of B's, the cells only in B hold exactly need(B) - need(A) mines'''
+    touched, self.touched = self.touched, set()
+    progress = False
+    for a in touched:
+      if a not in self.frontier:
+        continue
+      # only constraints sharing a cell with a can be subsets of it or contain it
+      for b in self.frontier_near(a):
+        if b != a and (self.apply_subset(a, b) or self.apply_subset(b, a)):
+          progress = True
+    return progress or bool(self.pending)
+
+  def apply_subset(self, a, b):
+    '''apply the subset rule with a as the smaller constraint, returns True if anything was proven'''
+    counts = self.board.counts
+    unknown_a, mines_a = self.unknown_neighbors(a)
+    unknown_b, mines_b = self.unknown_neighbors(b)
+    if not unknown_a or len(unknown_b) <= len(unknown_a):
+      return False
+    set_b = set(unknown_b)
+    if not set_b.issuperset(unknown_a):
+      return False
+    rest = set_b.difference(unknown_a)
+    need = (counts[b] - mines_b) - (counts[a] - mines_a)
+    if need == 0:
+      for n in rest:
+        self.mark_safe(n)
+      return True
+    if need == len(rest):
+      for n in rest:
+        self.mark_mine(n)
+      return True
+    return False
+
+  def frontier_near(self, i):
+    '''frontier cells that share a neighbor with flat index i'''
+    neighbors, frontier = self.board.topology.neighbors, self.frontier
+    result = set()
+    for n in neighbors(i):
+      for m in neighbors(n):
+        if m in frontier:
+          result.add(m)
+    return result
+
+  # Queries
+
+  def safe_cells(self):
+    '''covered cells proven safe, as (row, col)'''
+    cols = self.board.cols
+    return [divmod(i, cols) for i in self.safe]
+
+  def mine_cells(self):
+    '''cells proven to be mines, as (row, col)'''
+    cols = self.board.cols
+    return [divmod(i, cols) for i in self.mines]
+
+  def probabilities(self, max_exact=MAX_EXACT_CELLS, samples=SAMPLE_COUNT, rng=None):
+    '''mine probability of every covered cell, as {flat index: probability}
+    frontier cells come from enumerating the assignments that satisfy every shown number, weighted by how
+    many ways the remaining mines fit into the cells away from the frontier
+    components larger than max_exact cells are estimated from random consistent assignments instead'''
+    for estimate in self.estimates(max_exact, samples, rng):
+      if estimate is not None:
+        result, rest = estimate
+    if rest is not None:
+      covered = self.board.covered
+      for i in range(self.board.size):
+        if covered[i] and i not in result:
+          result[i] = rest
+    return result
+
+  def estimates(self, max_exact=MAX_EXACT_CELLS, samples=SAMPLE_COUNT, rng=None, interval=None):
+    '''the work of probabilities() one component (or batch of samples) at a time, for callers that show results
+    while they are being computed or give up on them
+    yields None after each step, and (probabilities, rest) estimates: probabilities maps proven and frontier cells to
+    their chance of being a mine, rest is the chance for every other covered cell (None if there are none)
+    the first estimate has only the proven cells, with the rest at the mine density, later ones come at most every
+    interval seconds and count the components not worked out yet as unconstrained cells, the last one is final'''
+    rng = rng or random.Random(0)
+    known = dict.fromkeys(self.mines, 1.0)
+    known.update(dict.fromkeys(self.safe, 0.0))
+
+    # split the unknown frontier cells into independent components
+    components = self.components()
+
+    # proven cells are all covered, so the game's covered count less the proven ones leaves the unknown cells
+    unknown = self.game.covered_cells - len(self.mines) - len(self.safe)
+    remaining = self.game.total_mines - len(self.mines)
+    yield dict(known), (remaining / unknown if unknown else None)
+
+    # per component: {mine total: (weight, {cell: weight with a mine there})}
+    tallies = []
+    loose = unknown # cells counted as unconstrained, the interior and unfinished components
+    shown = time.perf_counter()
+    for cells, constraints in components:
+      if len(cells) <= max_exact:
+        tallies.append(self.enumerate(cells, constraints))
+      else:
+        tally = {}
+        tallies.append(tally)
+        for done in range(0, samples, SAMPLE_BATCH):
+          if done:
+            yield None
+          self.sample(cells, constraints, min(SAMPLE_BATCH, samples - done), rng, tally)
+      loose -= len(cells)
+      if len(tallies) == len(components):
+        break
+      if interval is not None and time.perf_counter() - shown >= interval:
+        yield self.combine(known, components, tallies, remaining, loose)
+        shown = time.perf_counter()
+      else:
+        yield None
+    yield self.combine(known, components, tallies, remaining, loose)
+
+  def combine(self, known, components, tallies, remaining, outside):
+    '''(probabilities, rest) from the tallies of the first len(tallies) components, with outside unconstrained
+    cells holding the mines the components leave over'''
+    result = dict(known)
+
+    def combined(skip):
+      '''distribution of total mines over every tally except skip, as {mines: weight}'''
+      total = {0: 1}
+      for k, tally in enumerate(tallies):
+        if k == skip:
+          continue
+        merged = {}
+        for m1, w1 in total.items():
+          for m2, (w2, _) in tally.items():
+            merged[m1 + m2] = merged.get(m1 + m2, 0) + w1 * w2
+        total = merged
+      return total
+
+    def fill(m):
+      '''ways to place the mines left over after m frontier mines into the unconstrained cells'''
+      left = remaining - m
+      if left < 0 or left > outside:
+        return 0
+      return math.comb(outside, left)
+
+    everything = combined(None)
+    norm = sum(w * fill(m) for m, w in everything.items())
+    if norm == 0:
+      return result, None
+
+    for k, tally in enumerate(tallies):
+      others = combined(k)
+      weights = {}
+      for m, (_, cell_weights) in tally.items():
+        rest = sum(w * fill(m + m2) for m2, w in others.items())
+        if rest == 0:
+          continue
+        for cell, w in cell_weights.items():
+          weights[cell] = weights.get(cell, 0) + w * rest
+      for cell in components[k][0]:
+        result[cell] = weights.get(cell, 0) / norm
+
+    if not outside:
+      return result, None
+    expected = sum(w * fill(m) * (remaining - m) for m, w in everything.items())
+    return result, expected / norm / outside
+
+  def components(self):
+    '''group frontier constraints that share unknown cells, returns [(cells, [(need, cells)])]'''
+    counts = self.board.counts
+    owner = {} # unknown cell -> component id
+    groups = []
+    for i in self.frontier:
+      unknown, mines = self.unknown_neighbors(i)
+      if not unknown:
+        continue
+      constraint = (counts[i] - mines, unknown)
+      ids = {owner[n] for n in unknown if n in owner}
+      if not ids:
+        groups.append(([constraint], set(unknown)))
+        gid = len(groups) - 1
+      else:
+        gid = min(ids)
+        for other in ids - {gid}:
+          groups[gid][0].extend(groups[other][0])
+          groups[gid][1].update(groups[other][1])
+          for n in groups[other][1]:
+            owner[n] = gid
+          groups[other] = ([], set())
+        groups[gid][0].append(constraint)
+        groups[gid][1].update(unknown)
+      for n in unknown:
+        owner[n] = gid
+    return [(sorted(cells), constraints) for constraints, cells in groups if cells]
+
+  def enumerate(self, cells, constraints):
+    '''count every assignment of mines to cells that satisfies the constraints, grouped by mine total'''
+    order, watchers = self.plan(cells, constraints)
+    needs = [need for need, _ in constraints]
+    # unassigned cells left in each constraint
+    open_cells = [len(members) for _, members in constraints]
+    assignment = [0] * len(order)
+    tally = {}
+
+    def search(k, mines):
+      if k == len(order):
+        weight, cell_weights = tally.get(mines, (0, {}))
+        for j, cell in enumerate(order):
+          if assignment[j]:
+            cell_weights[cell] = cell_weights.get(cell, 0) + 1
+        tally[mines] = (weight + 1, cell_weights)
+        return
+      for value in (0, 1):
+        ok = True
+        for c in watchers[k]:
+          needs[c] -= value
+          open_cells[c] -= 1
+          if needs[c] < 0 or needs[c] > open_cells[c]:
+            ok = False
+        if ok:
+          assignment[k] = value
+          search(k + 1, mines + value)
+        for c in watchers[k]:
+          needs[c] += value
+          open_cells[c] += 1
+
+    search(0, 0)
+    return tally
+
+  def sample(self, cells, constraints, samples, rng, tally=None):
+    '''estimate the tally of a large component from weighted random consistent assignments, added to tally if given
+    every weight is the number of choices the draw had, so its expected value over draws is the number of consistent
+    assignments with that outcome, the same counts enumerate() finds (scaled by samples, which cancels out)'''
+    order, watchers = self.plan(cells, constraints)
+    tally = {} if tally is None else tally
+    for _ in range(samples):
+      needs = [need for need, _ in constraints]
+      open_cells = [len(members) for _, members in constraints]
+      drawn = self.random_assignment(order, watchers, needs, open_cells, rng)
+      if drawn is None:
+        continue
+      assignment, draw_weight = drawn
+      mines = sum(assignment)
+      weight, cell_weights = tally.get(mines, (0, {}))
+      for j, cell in enumerate(order):
+        if assignment[j]:
+          cell_weights[cell] = cell_weights.get(cell, 0) + draw_weight
+      tally[mines] = (weight + draw_weight, cell_weights)
+    return tally
+
+  def random_assignment(self, order, watchers, needs, open_cells, rng):
+    '''assign the cells in order, each one a value picked at random from those its constraints still allow
+    returns (assignment, weight), weight being the product of the number of values allowed at each step, or None when
+    a cell is left with no allowed value (the draw then counts with weight 0)
+    picking uniformly at each step alone favors assignments reached through fewer choices, the weight undoes that'''
+    assignment = [0] * len(order)
+    weight = 1
+    for k in range(len(order)):
+      allowed = []
+      for value in (0, 1):
+        for c in watchers[k]:
+          left = needs[c] - value
+          if left < 0 or left > open_cells[c] - 1:
+            break
+        else:
+          allowed.append(value)
+      if not allowed:
+        return None
+      value = allowed[0] if len(allowed) == 1 else rng.randrange(2)
+      weight *= len(allowed)
+      assignment[k] = value
+      for c in watchers[k]:
+        needs[c] -= value
+        open_cells[c] -= 1
+    return assignment, weight
+
+  def plan(self, cells, constraints):
+    '''order cells so constraints close early, and list which constraints watch each cell'''
+    watching = {cell: [] for cell in cells}
+    for c, (_, members) in enumerate(constraints):
+      for n in members:
+        watching[n].append(c)
+    # breadth first over shared constraints keeps neighboring cells next to each other
+    order = []
+    seen = set()
+    for start in cells:
+      if start in seen:
+        continue
+      seen.add(start)
+      queue = [start]
+      while queue:
+        cell = queue.pop(0)
+        order.append(cell)
+        for c in watching[cell]:
+          for n in constraints[c][1]:
+            if n not in seen:
+              seen.add(n)
+              queue.append(n)
+    watchers = [watching[cell] for cell in order]
+    return order, watchers
+
+  def best_move(self):
+    '''the cell to uncover next as (row, col): a proven safe cell if there is one, otherwise the least likely mine'''
+    cols = self.board.cols
+    if self.safe:
+      return divmod(next(iter(self.safe)), cols)
+    probabilities = self.probabilities()
+    if not probabilities:
+      return None
+    best = min(probabilities, key=probabilities.get)
+    return divmod(best, cols)
+
+
+def play_forced(game, solver=None):
+  '''keep uncovering proven safe cells until none are left, returns True if that wins the game
+  a game that is won this way from its first click needs no guessing'''
+  solver = solver or Solver(game)
+  cols = game.board.cols
+  while game.state == GameState.Playing and solver.safe:
+    i = next(iter(solver.safe))
+    game.uncover_cell(i // cols, i % cols)
+  return game.state == GameState.EndWin
+
+
+def check_sampling(positions=20, samples=20000, tolerance=0.06):
+  '''compare sampled probabilities against exact enumeration on expert-sized positions small enough to enumerate,
+  with sampling forced for every component, returns the largest difference seen'''
+  from GameLogic import GameLogic
+  worst = 0.0
+  checked = 0
+  seed = 0
+  while checked < positions:
+    game = GameLogic.from_seed(seed, 16, 30, 99, (8, 15))
+    solver = Solver(game)
+    seed += 1
+    while checked < positions:
+      play_forced(game, solver)
+      components = solver.components()
+      if game.state != GameState.Playing or not components or max(len(cells) for cells, _ in components) > 20:
+        break
+      exact = solver.probabilities()
+      sampled = solver.probabilities(max_exact=0, samples=samples, rng=random.Random(seed))
+      error = max(abs(exact[i] - sampled.get(i, -1.0)) for i in exact)
+      if error > tolerance:
+        raise AssertionError(f"sampled probabilities are off by {error:.3f} (seed {seed - 1}, position {checked})")
+      worst = max(worst, error)
+      checked += 1
+      # continue from the least likely mine that is really safe, the game keeps going either way
+      safe = [i for i in exact if not game.board.mines[i]]
+      game.uncover_cell(*divmod(min(safe, key=exact.get), game.board.cols))
+  return worst
+
+
+if __name__ == "__main__":
+  print(f"sampling check passed, largest difference from exact enumeration {check_sampling():.3f}")
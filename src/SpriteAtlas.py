@@ -0,0 +1,73 @@
+'''
+SpriteAtlas.py
+Description: Tile sprites packed into one image. The separate source PNGs are large (256px and up) and loading and
+             scaling them one by one slows down startup, so they are scaled down once, ahead of time, into a grid of
+             equal tiles saved as assets/atlas.png. The game loads that single image and cuts the sprites out of it
+             as subsurfaces, which share the atlas pixels. Run this file to rebuild the atlas after changing a sprite.
+Inputs: Sprite PNGs in the assets folder
+Outputs: assets/atlas.png, sprite surfaces by name
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import os
+import sys
+
+import pygame
+
+
+# sprite names in atlas order, each one is assets/<name>.png before packing
+SPRITES = ["tile", "unexplored_tile", "mine", "flagged_tile", "exploding_mine",
+           "0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
+ATLAS_FILE = "atlas.png"
+ATLAS_COLUMNS = 5
+TILE_SIZE = 96 # at least the largest sprite size the viewport zooms to, so zooming only ever scales down
+
+
+def tile_rect(index):
+  '''area of the atlas holding sprite number index'''
+  row, col = divmod(index, ATLAS_COLUMNS)
+  return pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+
+
+def pack(images):
+  '''one surface holding every sprite in SPRITES order, each scaled to a TILE_SIZE square'''
+  rows = -(-len(SPRITES) // ATLAS_COLUMNS)
+  atlas = pygame.Surface((ATLAS_COLUMNS * TILE_SIZE, rows * TILE_SIZE), pygame.SRCALPHA)
+  for index, name in enumerate(SPRITES):
+    # smoothscale needs 32 bit pixels, copying onto an alpha surface converts any source format without a window
+    source = pygame.Surface(images[name].get_size(), pygame.SRCALPHA)
+    source.blit(images[name], (0, 0))
+    atlas.blit(pygame.transform.smoothscale(source, (TILE_SIZE, TILE_SIZE)), tile_rect(index))
+  return atlas
+
+
+def load_sources(directory):
+  return {name: pygame.image.load(os.path.join(directory, f"{name}.png")) for name in SPRITES}
+
+
+def build(directory):
+  '''pack the sprite PNGs in directory and save the atlas next to them'''
+  atlas = pack(load_sources(directory))
+  path = os.path.join(directory, ATLAS_FILE)
+  pygame.image.save(atlas, path)
+  return path
+
+
+def load(directory):
+  '''sprites by name, cut from the atlas in directory, or packed from the separate PNGs when there is no atlas'''
+  path = os.path.join(directory, ATLAS_FILE)
+  if os.path.exists(path):
+    atlas = pygame.image.load(path)
+  else:
+    atlas = pack(load_sources(directory))
+  # in the display's pixel format blits are plain copies, conversion needs a window though (benchmarks draw offscreen)
+  if pygame.display.get_init() and pygame.display.get_surface() is not None:
+    atlas = atlas.convert_alpha()
+  return {name: atlas.subsurface(tile_rect(index)) for index, name in enumerate(SPRITES)}
+
+
+if __name__ == "__main__":
+  assets = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+  print(f"wrote {build(assets)}")
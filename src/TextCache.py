@@ -0,0 +1,95 @@
+'''
+TextCache.py
+Description: Text rendering layer for the UI. Fonts are looked up once and kept, rendered text surfaces are cached
+             by (font, text, color) and evicted least recently used first, and DigitField draws a number into fixed
+             width digit slots so a changing counter only redraws the digits that changed.
+Inputs: Font names and sizes, strings, colors
+Outputs: Cached pygame surfaces, changed screen rectangles
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import time
+from collections import OrderedDict
+
+import pygame
+
+
+MAX_CACHED_SURFACES = 512
+
+
+class TextCache:
+  '''fonts and rendered text surfaces, shared by everything that draws text'''
+  def __init__(self, max_surfaces=MAX_CACHED_SURFACES):
+    self.max_surfaces = max_surfaces
+    self.fonts = {} # (name, size) -> pygame font
+    self.surfaces = OrderedDict() # (font, text, color, antialias) -> surface, least recently used first
+    self.hits = 0
+    self.misses = 0
+    self.font_seconds = 0.0 # spent looking up fonts, the first system font lookup scans the installed fonts
+
+  def font(self, name, size):
+    '''system font name at size, looked up the first time it is asked for (starting pygame.font if needed)'''
+    key = (name, size)
+    font = self.fonts.get(key)
+    if font is None:
+      start = time.perf_counter()
+      if not pygame.font.get_init():
+        pygame.font.init()
+      font = self.fonts[key] = pygame.font.SysFont(name, size)
+      self.font_seconds += time.perf_counter() - start
+    return font
+
+  def render(self, font, text, color, antialias=True):
+    '''font.render(text, antialias, color), rendered once and reused while it stays in the cache'''
+    key = (font, text, color, antialias)
+    surfaces = self.surfaces
+    surface = surfaces.get(key)
+    if surface is not None:
+      surfaces.move_to_end(key)
+      self.hits += 1
+      return surface
+    self.misses += 1
+    surface = surfaces[key] = font.render(text, antialias, color)
+    if len(surfaces) > self.max_surfaces:
+      surfaces.popitem(last=False)
+    return surface
+
+  def clear(self):
+    self.surfaces.clear()
+
+
+class DigitField:
+  '''a non-negative number drawn left aligned into fixed width digit slots at a screen position'''
+  def __init__(self, cache, font, color, background, slots, topleft):
+    self.cache = cache
+    self.font = font
+    self.color = color
+    self.background = background
+    self.slots = slots
+    # every slot is as wide as the widest digit so digits never shift when the number changes
+    self.slot_width = max(font.size(digit)[0] for digit in "0123456789")
+    self.height = font.get_height()
+    self.rect = pygame.Rect(topleft, (self.slot_width * slots, self.height))
+    self.drawn = None # padded digits currently on screen
+
+  def slot_rect(self, slot):
+    return pygame.Rect(self.rect.x + slot * self.slot_width, self.rect.y, self.slot_width, self.height)
+
+  def draw(self, surface, value, full=False):
+    '''draw value, redrawing only the slots whose digit changed unless full, returns the changed rects'''
+    digits = str(value).ljust(self.slots)[:self.slots]
+    drawn = self.drawn if not full and self.drawn is not None else " " * self.slots
+    changed = []
+    for slot, (old, new) in enumerate(zip(drawn, digits)):
+      if old == new and not full:
+        continue
+      rect = self.slot_rect(slot)
+      surface.fill(self.background, rect)
+      if new != " ":
+        glyph = self.cache.render(self.font, new, self.color)
+        surface.blit(glyph, glyph.get_rect(center=rect.center))
+      changed.append(rect)
+    self.drawn = digits
+    return changed
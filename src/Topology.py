@@ -0,0 +1,133 @@
+'''
+Topology.py
+Description: Precomputed neighbor tables for board geometries. A Topology lists, for every cell of a rows x cols
+             board, the flat index offsets of its neighbors, with edges and wraparound already resolved, so counting,
+             flood fill and the solver never bounds check. Cells whose neighborhoods look the same (every interior
+             cell of a square grid, for example) share one offset tuple: the table is stored as a row class per row
+             and a column class per column, which keeps it at O(rows + cols) memory instead of a list per cell.
+             Built in geometries: square (the classic 8 neighbors), torus (square with wraparound), hex (odd rows
+             shifted right), knight (chess knight moves) and custom neighborhoods from any list of (dr, dc) moves.
+Inputs: Board dimensions, geometry name or neighbor moves
+Outputs: Topology tables
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+from functools import lru_cache
+
+
+SQUARE_MOVES = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+KNIGHT_MOVES = [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]
+# "odd-r" hex layout: odd rows sit half a cell to the right, so the diagonal neighbors depend on row parity
+HEX_EVEN_MOVES = [(-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)]
+HEX_ODD_MOVES = [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1)]
+
+
+class Topology:
+  '''neighbor table for a rows x cols board
+  the neighbors of flat index i = r * cols + c are i + d for d in row_tables[r][col_classes[r][c]]'''
+  def __init__(self, name, rows, cols, patterns, wrap=False):
+    '''patterns holds one list of (dr, dc) moves per row parity class, row r uses patterns[r % len(patterns)]'''
+    self.name = name
+    self.rows = rows
+    self.cols = cols
+    self.wrap = wrap
+    self.row_tables = [None] * rows # per row: offset tuples indexed by column class
+    self.col_classes = [None] * rows # per row: column class of every column (shared by rows with the same pattern)
+
+    def part(position, delta, length):
+      '''offset along one axis, or None if the move leaves the board'''
+      target = position + delta
+      if wrap:
+        return target % length - position
+      return target - position if 0 <= target < length else None
+
+    tables = {} # (pattern, row parts) -> offset tuples by column class, shared between rows
+    for p, moves in enumerate(patterns):
+      # columns with the same per-move column offsets behave the same
+      signatures = {}
+      classes = [0] * cols
+      col_parts = []
+      for c in range(cols):
+        signature = tuple(part(c, dc, cols) for _, dc in moves)
+        if signature not in signatures:
+          signatures[signature] = len(col_parts)
+          col_parts.append(signature)
+        classes[c] = signatures[signature]
+      for r in range(p, rows, len(patterns)):
+        row_parts = tuple(part(r, dr, rows) for dr, _ in moves)
+        key = (p, row_parts)
+        table = tables.get(key)
+        if table is None:
+          table = tables[key] = [self.combine(row_parts, parts) for parts in col_parts]
+        self.row_tables[r] = table
+        self.col_classes[r] = classes
+    # largest neighborhood, counts are stored in bytes so it must stay below 255
+    self.degree = max((len(offsets) for table in tables.values() for offsets in table), default=0)
+
+  def combine(self, row_parts, col_parts):
+    '''flat offsets of the moves that stay on the board, without duplicates or the cell itself
+    (on tiny wrapped boards several moves can land on the same cell)'''
+    cols = self.cols
+    offsets = {}
+    for dr, dc in zip(row_parts, col_parts):
+      if dr is not None and dc is not None:
+        offset = dr * cols + dc
+        if offset != 0:
+          offsets[offset] = None
+    return tuple(offsets)
+
+  def offsets(self, i):
+    '''flat index offsets of the neighbors of flat index i'''
+    r, c = divmod(i, self.cols)
+    return self.row_tables[r][self.col_classes[r][c]]
+
+  def neighbors(self, i):
+    '''flat indices of the neighbors of flat index i'''
+    r, c = divmod(i, self.cols)
+    return [i + d for d in self.row_tables[r][self.col_classes[r][c]]]
+
+
+# Geometries, each built once per board size and shared between boards
+
+@lru_cache(maxsize=64)
+def square(rows, cols):
+  return Topology("square", rows, cols, [SQUARE_MOVES])
+
+
+@lru_cache(maxsize=64)
+def torus(rows, cols):
+  return Topology("torus", rows, cols, [SQUARE_MOVES], wrap=True)
+
+
+@lru_cache(maxsize=64)
+def hexagonal(rows, cols):
+  return Topology("hex", rows, cols, [HEX_EVEN_MOVES, HEX_ODD_MOVES])
+
+
+@lru_cache(maxsize=64)
+def knight(rows, cols):
+  return Topology("knight", rows, cols, [KNIGHT_MOVES])
+
+
+def custom(rows, cols, moves, wrap=False, name="custom"):
+  '''topology from any list of (dr, dc) moves'''
+  if len(moves) >= 255:
+    raise ValueError("neighborhoods are limited to 254 cells")
+  return Topology(name, rows, cols, [list(moves)], wrap)
+
+
+GEOMETRIES = {
+  "square": square,
+  "torus": torus,
+  "hex": hexagonal,
+  "knight": knight,
+}
+
+
+def build(name, rows, cols):
+  '''built in geometry by name'''
+  if name not in GEOMETRIES:
+    raise ValueError(f"unknown topology {name!r}, expected one of {sorted(GEOMETRIES)}")
+  return GEOMETRIES[name](rows, cols)
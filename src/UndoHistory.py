@@ -0,0 +1,227 @@
+'''
+UndoHistory.py
+Description: Unlimited undo and redo of uncover and flag actions, losing clicks included. Moves are recorded through a
+             GameLogic observer as the cells each one changed, so undoing or redoing a move writes only those cells
+             and costs about as much as the move did, with no copy of the board. After the recorded moves have
+             changed about a board's worth of cells, a compressed checkpoint of the covered and flagged planes is
+             kept, so jumping many moves back or forward restores the nearest checkpoint instead of walking every move
+             in between. Memory use is capped, the oldest moves are dropped first.
+Inputs: GameLogic
+Outputs: Undone and redone moves, as ChangeSets
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import bisect
+import zlib
+from array import array
+
+from GameLogic import Action, ChangeSet
+
+
+MAX_BYTES = 64 << 20 # history memory cap
+MOVE_BYTES = 128 # rough cost of one recorded move besides its cells
+EVICT_TO = 0.75 # fraction of the cap kept after evicting, so eviction runs in batches
+
+
+class Move:
+  '''one recorded action: the cells it uncovered or whose flag it toggled, and the game state around it'''
+  __slots__ = ("action", "row", "col", "cells", "state_before", "state_after")
+
+  def __init__(self, action, row, col, cells, state_before, state_after):
+    self.action = action
+    self.row = row
+    self.col = col
+    self.cells = cells # array of flat indices
+    self.state_before = state_before
+    self.state_after = state_after
+
+
+class Checkpoint:
+  '''covered and flagged planes and the counters at one history position
+  mines and counts never change during a game, so they are not stored'''
+  __slots__ = ("position", "state", "flags_remaining", "covered_cells", "planes")
+
+  def __init__(self, position, state, flags_remaining, covered_cells, planes):
+    self.position = position
+    self.state = state
+    self.flags_remaining = flags_remaining
+    self.covered_cells = covered_cells
+    self.planes = planes # zlib compressed covered + flagged, mostly long runs so they compress well
+
+  @classmethod
+  def capture(cls, game, position):
+    board = game.board
+    planes = zlib.compress(bytes(board.covered) + bytes(board.flagged), 1)
+    return cls(position, game.state, game.flags_remaining, game.covered_cells, planes)
+
+  def restore(self, game):
+    board = game.board
+    size = board.size
+    planes = memoryview(zlib.decompress(self.planes))
+    board.covered[:] = planes[:size]
+    board.flagged[:] = planes[size:]
+    game.state = self.state
+    game.flags_remaining = self.flags_remaining
+    game.covered_cells = self.covered_cells
+
+
+class UndoHistory:
+  '''undo and redo for a GameLogic, kept up to date through game.add_observer
+  positions count recorded moves since the history was last cleared, moves[k - base] takes position k to k + 1'''
+  def __init__(self, game, max_bytes=MAX_BYTES):
+    self.game = game
+    self.max_bytes = max_bytes
+    self.clear()
+    self.state = game.state # game state after the last action seen, the state before the next one
+    game.add_observer(self.observe)
+
+  def clear(self):
+    '''forget every move, done when a game starts or resets'''
+    self.moves = []
+    self.totals = [0] # totals[k - base]: cells changed by the recorded moves before position k
+    self.base = 0 # oldest position that can still be undone to
+    self.position = 0 # current position, moves from here on can be redone
+    self.checkpoints = [] # ordered by position
+    self.nbytes = 0
+    self.since_checkpoint = 0 # cells changed by the moves since the last checkpoint
+
+  def detach(self):
+    '''stop recording'''
+    self.game.remove_observer(self.observe)
+
+  @property
+  def end(self):
+    return self.base + len(self.moves)
+
+  def can_undo(self):
+    return self.position > self.base
+
+  def can_redo(self):
+    return self.position < self.end
+
+  def cells_between(self, a, b):
+    '''cells changed by the moves between positions a and b'''
+    return abs(self.totals[b - self.base] - self.totals[a - self.base])
+
+  # Recording
+
+  def observe(self, game, action, row, col, changed):
+    if action == Action.Start or action == Action.Reset:
+      self.clear()
+    elif action in (Action.Uncover, Action.Flag, Action.Unflag):
+      self.record(Move(action, row, col, array("I", changed), self.state, game.state))
+    self.state = game.state
+
+  def record(self, move):
+    if self.can_redo(): # a new move replaces the moves that were undone
+      self.truncate()
+    cells = len(move.cells)
+    self.moves.append(move)
+    self.totals.append(self.totals[-1] + cells)
+    self.position += 1
+    self.nbytes += MOVE_BYTES + cells * move.cells.itemsize
+    self.since_checkpoint += cells
+    # walking past this many cells costs more than restoring a checkpoint
+    if self.since_checkpoint >= self.game.board.size:
+      checkpoint = Checkpoint.capture(self.game, self.position)
+      self.checkpoints.append(checkpoint)
+      self.nbytes += len(checkpoint.planes)
+      self.since_checkpoint = 0
+    if self.nbytes > self.max_bytes:
+      self.evict()
+
+  def truncate(self):
+    '''drop the moves after the current position'''
+    keep = self.position - self.base
+    for move in self.moves[keep:]:
+      self.nbytes -= MOVE_BYTES + len(move.cells) * move.cells.itemsize
+    del self.moves[keep:]
+    del self.totals[keep + 1:]
+    while self.checkpoints and self.checkpoints[-1].position > self.position:
+      self.nbytes -= len(self.checkpoints.pop().planes)
+    last = self.checkpoints[-1].position if self.checkpoints else self.base
+    self.since_checkpoint = self.cells_between(last, self.position)
+
+  def evict(self):
+    '''drop the oldest moves until the history is back under its cap, a batch at a time'''
+    target = self.max_bytes * EVICT_TO
+    count = 0
+    while self.nbytes > target and self.base + count < self.position:
+      move = self.moves[count]
+      self.nbytes -= MOVE_BYTES + len(move.cells) * move.cells.itemsize
+      count += 1
+      while self.checkpoints and self.checkpoints[0].position < self.base + count:
+        self.nbytes -= len(self.checkpoints.pop(0).planes)
+    del self.moves[:count]
+    del self.totals[:count]
+    self.base += count
+
+  # Undo and redo
+
+  def undo(self, steps=1):
+    '''undo up to steps moves, returns the ChangeSet, or None if there was nothing to undo'''
+    return self.seek(max(self.position - steps, self.base))
+
+  def redo(self, steps=1):
+    '''redo up to steps undone moves, returns the ChangeSet, or None if there was nothing to redo'''
+    return self.seek(min(self.position + steps, self.end))
+
+  def seek(self, target):
+    '''move the game to history position target by undoing or redoing moves, or from the nearest checkpoint when
+    that writes fewer cells, returns a ChangeSet with every cell the moves in between changed'''
+    if not self.base <= target <= self.end:
+      raise IndexError("history position out of range")
+    if target == self.position:
+      return None
+    game = self.game
+    state_before, flags_before, covered_before = game.state, game.flags_remaining, game.covered_cells
+    action = Action.Undo if target < self.position else Action.Redo
+    first, last = min(target, self.position), max(target, self.position)
+
+    checkpoint = self.nearest_checkpoint(target)
+    if checkpoint is not None and (game.board.size + self.cells_between(checkpoint.position, target)
+                                   < self.cells_between(self.position, target)):
+      checkpoint.restore(game)
+      self.position = checkpoint.position
+    while self.position > target:
+      self.position -= 1
+      self.apply(self.moves[self.position - self.base], undo=True)
+    while self.position < target:
+      self.apply(self.moves[self.position - self.base], undo=False)
+      self.position += 1
+    self.state = game.state
+
+    changed = array("I")
+    for move in self.moves[first - self.base:last - self.base]:
+      changed.extend(move.cells)
+    changed = changed.tolist()
+    move = self.moves[first - self.base] if action == Action.Undo else self.moves[last - 1 - self.base]
+    game.notify(action, move.row, move.col, changed)
+    return ChangeSet(game, action, move.row, move.col, changed, state_before, flags_before, covered_before)
+
+  def nearest_checkpoint(self, target):
+    '''the reachable checkpoint closest to target in changed cells, or None'''
+    checkpoints = self.checkpoints
+    k = bisect.bisect_left([checkpoint.position for checkpoint in checkpoints], target)
+    candidates = checkpoints[max(k - 1, 0):k + 1]
+    return min(candidates, key=lambda checkpoint: self.cells_between(checkpoint.position, target), default=None)
+
+  def apply(self, move, undo):
+    '''write one move's cells and counters, backwards when undo'''
+    game, board = self.game, self.game.board
+    cells = move.cells
+    if move.action == Action.Uncover:
+      covered = board.covered
+      value = 1 if undo else 0
+      for i in cells:
+        covered[i] = value
+      game.covered_cells += len(cells) if undo else -len(cells)
+    else:
+      flagged = board.flagged
+      value = 1 if (move.action == Action.Flag) != undo else 0
+      for i in cells:
+        flagged[i] = value
+      game.flags_remaining += -len(cells) if value else len(cells)
+    game.state = move.state_before if undo else move.state_after
@@ -9,13 +9,21 @@ Author: Hale Coffman
 Creation Date: 09/07/25
 """
 
+import time
+STARTED = time.perf_counter() # start of the import, for --startup-time
+
 import sys, os
+import argparse
 import pygame
 from GameLogic import GameLogic
+from GameStats import GameStats, StatsRecorder, DEFAULT_PATH as STATS_PATH
+from BoardPrefetcher import BoardPrefetcher
 from InputHandler import InputHandler
-
-game = GameLogic()
-input_handler = InputHandler()
+from Instrumentation import Metrics
+import SpriteAtlas
+from TextCache import TextCache, DigitField
+from UndoHistory import UndoHistory
+from Viewport import Viewport
 
 # game variables
 SCREEN_WIDTH = 1200
@@ -25,27 +33,61 @@ DISTANCE_BETWEEN_CELLS = 36 # asset size + 4 pixels for gaps
 BOARD_SIZE = 10 # 10 x 10 board
 BOARD_DISTANCE_DOWN = 300 # distance from top of screen to board
 BOARD_DISTANCE_LEFT = (SCREEN_WIDTH // 2) - (DISTANCE_BETWEEN_CELLS*(BOARD_SIZE / 2)) # center of screen - half of total board length
+# screen area the board is drawn in, boards larger than this scroll and zoom inside it
+BOARD_AREA = pygame.Rect(40, BOARD_DISTANCE_DOWN, SCREEN_WIDTH - 80, SCREEN_LENGTH - BOARD_DISTANCE_DOWN - 20)
+PAN_STEP = 4 * DISTANCE_BETWEEN_CELLS # pixels scrolled per arrow key press
+FRAME_RATE = 60 # most frames drawn per second, input arriving faster is handled in batches
+IDLE_TIMEOUT = 1000 # ms the loop sleeps without input before waking to refresh the overlay and metric dumps
+HINT_EVENT = pygame.USEREVENT + 1 # posted by the hint worker when a new estimate arrives, wakes the loop to show it
+HEAT_SHADES = 16 # shades of red in the mine probability heatmap
+
+# optional board size from the command line, e.g. python src/UserInterface.py --rows 500 --cols 500
+arg_parser = argparse.ArgumentParser(description="Minesweeper")
+arg_parser.add_argument("--rows", type=int, default=BOARD_SIZE)
+arg_parser.add_argument("--cols", type=int, default=BOARD_SIZE)
+# instrumentation is off unless asked for, F3 also turns it on and toggles the debug overlay
+arg_parser.add_argument("--profile", action="store_true", help="collect timings and show the debug overlay")
+arg_parser.add_argument("--metrics-file", help="collect timings and dump them to this JSON file every few seconds")
+arg_parser.add_argument("--no-guess", action="store_true", help="only deal boards that can be solved without guessing")
+arg_parser.add_argument("--poll", action="store_true", help="poll for input every frame instead of sleeping until it arrives")
+arg_parser.add_argument("--startup-time", action="store_true", help="print the time to the first frame and exit")
+# finished games are recorded for the statistics screen (F2)
+arg_parser.add_argument("--stats-db", default=STATS_PATH, help="game statistics database")
+arg_parser.add_argument("--no-stats", action="store_true", help="do not record finished games")
+
+
+# area cleared and redrawn when only the mine counter changes
+MINE_COUNTER_AREA = pygame.Rect(SCREEN_WIDTH // 2 - 150, 160, 300, 30)
+# debug overlay in the top left corner
+OVERLAY_AREA = pygame.Rect(0, 0, 520, 90)
+# statistics screen, drawn over the board
+STATS_AREA = BOARD_AREA.inflate(-200, -40)
 
 
 # colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 RED   = (200, 50, 50)
-
-
-# initialize ui
-pygame.init()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_LENGTH))
-pygame.display.set_caption("MineSweeper")
-screen.fill("white") 
-clock = pygame.time.Clock()
-
-
-# fonts
-title_font = pygame.font.SysFont("arialblack", 60)
-mine_count_font = pygame.font.SysFont("arialblack", 15)
-mine_prompt_font = pygame.font.SysFont("arialblack", 15)
-win_loss_font = pygame.font.SysFont("arialblack", 30)
+GREEN = (40, 170, 60)
+ORANGE = (240, 150, 20)
+
+
+# fonts by use, each one is looked up the first time something is drawn with it and then shared through the
+# text cache, which also keeps rendered text surfaces
+FONTS = {
+    "title": ("arialblack", 60),
+    "mine_count": ("arialblack", 15),
+    "mine_prompt": ("arialblack", 15),
+    "win_loss": ("arialblack", 30),
+    "hint": ("arialblack", 20),
+    "overlay": ("monospace", 14),
+    "stats_title": ("arialblack", 20),
+    "stats": ("arialblack", 14),
+}
+text_cache = TextCache()
+
+def font(name):
+    return text_cache.font(*FONTS[name])
 
 def resource_path(rel_path: str) -> str:
     """
@@ -60,94 +102,255 @@ def resource_path(rel_path: str) -> str:
     return os.path.join(base_path, rel_path)
 
 
-# function to load all assets in assets folder into a dict that scores path to png
+# tile sprites by name, cut from the prescaled atlas in the assets folder the first time a board is drawn
+# the viewport scales them once per zoom level
 def load_assets():
-    assets = {}
-    pngs = ["tile", "unexplored_tile", "mine", "flagged_tile", "exploding_mine", "0", "1", "2", "3", "4", "5", "6", "7", "8", "9"]
-    for png in pngs:
-        path = resource_path(os.path.join("assets", f"{png}.png"))
-        asset = pygame.image.load(path)
-        asset = pygame.transform.scale(asset, CELL_SIZE) # resize asset to cell size
-        assets[png] = asset
-    return assets
-
+    global raw_assets, sprite_seconds
+    if raw_assets is None:
+        start = time.perf_counter()
+        raw_assets = SpriteAtlas.load(resource_path("assets"))
+        sprite_seconds = time.perf_counter() - start
+    return raw_assets
 
-# iterate through game board to render 10 x 10 grid on screen
-def render_board():
-    
-    y = BOARD_DISTANCE_DOWN
 
-    for row in range(10):
+# draw a single cell based on its current state
+def render_cell(row, col):
+    x, y = viewport.cell_rect(row, col).topleft
+    cell = game.board.grid[row][col]
 
-        x = BOARD_DISTANCE_LEFT
+    # render all uncovered mines on game start
+    if game.state.name == "Start":
+        screen.blit(assets["unexplored_tile"], (x,y))
 
-        for col in range(10):
 
-            # render all uncovered mines on game start
-            if game.state.name == "Start":
-                screen.blit(assets["unexplored_tile"], (x,y))
+    else:
+        # flagged = True -> render flagged tile asset
+        if cell.flagged:
+            screen.blit(assets["flagged_tile"], (x,y))
+        # is_covered = True -> render unexplored tile
+        elif cell.is_covered: 
+            screen.blit(assets["unexplored_tile"], (x,y))
+
+        # NOTE: This assumes that if neighbor_count is 0, then that cell is not an uncovered cell adjacent to a covered cell
+        # In other words, if neighbor_count is > 0, I am assuming it will render as a number cell, not an explored cell
+        # if cell has neighboring bombs, display # of bombs
+        elif cell.neighbor_count > 0:
+            screen.blit(number_sprites()[cell.neighbor_count], (x,y)) # sprite for the number of neighboring mines
+
+        # is_covered = False -> render explored tile
+        elif not cell.is_covered:
+            screen.blit(assets["tile"], (x,y))
+        
+        # win or lose game, reveal all bombs
+        if game.state.name == "EndLose" or game.state.name == "EndWin":
+            if cell.is_mine: 
+                screen.blit(assets["tile"], (x,y)) # reset to blank tile 
+                screen.blit(assets["mine"], (x,y)) # add mine over tile
+
+        # mine probability shading over covered cells, and the hint outline
+        index = row * game.board.cols + col
+        if show_heatmap and cell.is_covered and not cell.flagged:
+            shade = heat_shade(index)
+            if shade is not None:
+                screen.blit(shade, (x,y))
+        if index == shown_hint():
+            render_hint(index)
+
+
+# iterate through the visible part of the game board and render it on screen
+def render_board():
+    global assets
+    assets = viewport.sprites(load_assets()) # tile sprites scaled for the current zoom
+    first_row, end_row, first_col, end_col = viewport.visible_range()
 
+    if first_row >= end_row or first_col >= end_col:
+        return
 
+    # same rules as render_cell, but reading the board planes directly and blitting in one batch
+    board = game.board
+    covered, flagged, mines, counts = board.covered, board.flagged, board.mines, board.counts
+    started = game.state.name != "Start"
+    reveal = game.state.name in ("EndLose", "EndWin")
+    unexplored, flagged_tile, tile, mine = assets["unexplored_tile"], assets["flagged_tile"], assets["tile"], assets["mine"]
+    numbers = number_sprites()
+
+    pitch = viewport.pitch
+    x_start, y = viewport.cell_rect(first_row, first_col).topleft
+    blits = []
+    for row in range(first_row, end_row):
+        x = x_start
+        base = row * board.cols
+        for i in range(base + first_col, base + end_col):
+            if not started or (covered[i] and not flagged[i]):
+                blits.append((unexplored, (x, y)))
+            elif flagged[i]:
+                blits.append((flagged_tile, (x, y)))
             else:
-                # flagged = True -> render flagged tile asset
-                if game.board.grid[row][col].flagged:
-                    screen.blit(assets["flagged_tile"], (x,y))
-                # is_covered = True -> render unexplored tile
-                elif game.board.grid[row][col].is_covered: 
-                    screen.blit(assets["unexplored_tile"], (x,y))
-
-                # NOTE: This assumes that if neighbor_count is 0, then that cell is not an uncovered cell adjacent to a covered cell
-                # In other words, if neighbor_count is > 0, I am assuming it will render as a number cell, not an explored cell
-                # if cell has neighboring bombs, display # of bombs
-                elif game.board.grid[row][col].neighbor_count > 0:
-                    num = str(game.board.grid[row][col].neighbor_count) # sets num to str of asset name for number of neighboring mines
-                    screen.blit(assets[num], (x,y)) # need to account for all nums
-
-                # is_covered = False -> render explored tile
-                elif not game.board.grid[row][col].is_covered:
-                    screen.blit(assets["tile"], (x,y))
-                
-                # win or lose game, reveal all bombs
-                if game.state.name == "EndLose" or game.state.name == "EndWin":
-                    if game.board.grid[row][col].is_mine: 
-                        screen.blit(assets["tile"], (x,y)) # reset to blank tile 
-                        screen.blit(assets["mine"], (x,y)) # add mine over tile
-            
-            x += DISTANCE_BETWEEN_CELLS
-        
-        y += DISTANCE_BETWEEN_CELLS
+                blits.append((numbers[counts[i]], (x, y)))
+            if reveal and mines[i]: # win or lose game, reveal all bombs
+                blits.append((tile, (x, y)))
+                blits.append((mine, (x, y)))
+            x += pitch
+        y += pitch
+
+    # mine probability shading over the covered cells, from the hint worker's latest estimate
+    plane = hints.plane if show_heatmap and hints is not None else None
+    if plane is not None:
+        shades = heat_shades()
+        y = viewport.cell_rect(first_row, first_col).y
+        for row in range(first_row, end_row):
+            x = x_start
+            base = row * board.cols
+            for i in range(base + first_col, base + end_col):
+                if covered[i] and not flagged[i] and shades[plane[i]] is not None:
+                    blits.append((shades[plane[i]], (x, y)))
+                x += pitch
+            y += pitch
+
+    screen.set_clip(BOARD_AREA) # cells at the edge of the area are only partly visible
+    screen.blits(blits, doreturn=False)
+    hint = shown_hint()
+    if hint is not None and viewport.is_visible(*divmod(hint, board.cols)):
+        render_hint(hint)
+    screen.set_clip(None)
+
+
+# translucent squares drawn over covered cells by chance of a mine, one per plane value (see HintWorker.LEVELS),
+# green for proven safe cells and darker red for likelier mines, built once per sprite size
+# sprite per neighbor count up to the topology's largest neighborhood, 0 is the explored tile
+# the atlas stops at 9, larger counts (custom neighborhoods) are drawn as text on an explored tile
+def number_sprites():
+    degree = game.board.topology.degree
+    key = (viewport.sprite_size, degree)
+    numbers = number_cache.get(key)
+    if numbers is None:
+        tile = assets["tile"]
+        numbers = [tile] + [assets[str(n)] for n in range(1, 10)]
+        for n in range(10, degree + 1):
+            sprite = tile.copy()
+            label = text_cache.render(font("mine_count"), str(n), BLACK)
+            if label.get_width() > sprite.get_width():
+                scale = sprite.get_width() / label.get_width()
+                label = pygame.transform.smoothscale(label, (sprite.get_width(), int(label.get_height() * scale)))
+            sprite.blit(label, label.get_rect(center=sprite.get_rect().center))
+            numbers.append(sprite)
+        number_cache[key] = numbers
+    return numbers
+
+
+def heat_shades():
+    size = viewport.sprite_size
+    shades = heat_cache.get(size)
+    if shades is None:
+        from HintWorker import LEVELS
+        reds = []
+        for k in range(HEAT_SHADES):
+            shade = pygame.Surface((size, size), pygame.SRCALPHA)
+            shade.fill((*RED, 40 + 160 * k // (HEAT_SHADES - 1)))
+            reds.append(shade)
+        safe = pygame.Surface((size, size), pygame.SRCALPHA)
+        safe.fill((*GREEN, 110))
+        shades = [safe] + [reds[(value - 1) * HEAT_SHADES // LEVELS] for value in range(1, LEVELS + 1)]
+        shades += [None] * (256 - len(shades)) # uncovered cells and cells not estimated yet
+        heat_cache[size] = shades
+    return shades
+
+
+def heat_shade(index):
+    plane = hints.plane if hints is not None else None
+    return heat_shades()[plane[index]] if plane is not None else None
+
+
+# the cell suggested by the hint key, until the player moves
+def shown_hint():
+    if hints is None or hint_job != hints.job:
+        return None
+    return hints.hint
+
+
+def render_hint(hint):
+    row, col = divmod(hint, game.board.cols)
+    plane = hints.plane
+    color = GREEN if plane is not None and plane[hint] == 0 else ORANGE # proven safe, or only the least likely mine
+    pygame.draw.rect(screen, color, viewport.cell_rect(row, col), 3)
+
+
+# redraw only the given cells (flat indices from the actions' ChangeSets) and the counter if it changed,
+# and queue their rects for display.update
+def render_changes(cells):
+    global assets
+    if metrics is not None:
+        start = time.perf_counter()
+    assets = viewport.sprites(load_assets())
+    first_row, end_row, first_col, end_col = viewport.visible_range()
+    cols = game.board.cols
+
+    screen.set_clip(BOARD_AREA)
+    for index in cells:
+        row, col = divmod(index, cols)
+        if first_row <= row < end_row and first_col <= col < end_col: # off-screen changes show up when scrolled to
+            render_cell(row, col)
+            dirty_rects.append(viewport.cell_rect(row, col).clip(BOARD_AREA))
+    screen.set_clip(None)
+
+    if game.flags_remaining != drawn_flags_remaining:
+        dirty_rects.extend(update_mine_counter(full=False))
+    if metrics is not None:
+        metrics.elapsed("render", start)
+
+
+# scroll with the arrow keys or a middle button drag, zoom with the mouse wheel
+# returns True if the view changed and the board needs to be redrawn
+def handle_view_event(event):
+    if event.type == pygame.KEYDOWN:
+        steps = {pygame.K_LEFT: (-PAN_STEP, 0), pygame.K_RIGHT: (PAN_STEP, 0),
+                 pygame.K_UP: (0, -PAN_STEP), pygame.K_DOWN: (0, PAN_STEP)}
+        if event.key in steps:
+            return viewport.pan(*steps[event.key])
+    elif event.type == pygame.MOUSEWHEEL:
+        return viewport.zoom(event.y, pygame.mouse.get_pos())
+    elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+        dx, dy = event.rel
+        return viewport.pan(-dx, -dy)
+    return False
+
+
+# push pending drawing to the window, the whole window after a full redraw, otherwise only the changed rects
+def present():
+    global full_redraw
+    if full_redraw:
+        pygame.display.flip()
+    elif dirty_rects:
+        pygame.display.update(dirty_rects)
+    full_redraw = False
+    dirty_rects.clear()
 
              
 def coords_to_index(coords):
-    x_start = BOARD_DISTANCE_LEFT
-    y_start = BOARD_DISTANCE_DOWN
-
-    x_click, y_click = coords
-
-    row = int((x_click - x_start) // DISTANCE_BETWEEN_CELLS)
-    col = int((y_click - y_start) // DISTANCE_BETWEEN_CELLS)
-
-    # if clicked within grid return coords
-    if 0 <= row <= 9 and 0 <= col <= 9:
-        return(row, col)
-    else:
+    # returns (column, row) of the clicked cell, or False outside the board
+    cell = viewport.cell_at(coords)
+    if cell is None:
         return False
+    row, col = cell
+    return (col, row)
     
 def restart_to_start():
     #Return to the Start screen (prompt for mine count again)
     global game, text, message, cover_color
-    game.reset_game()     # your GameLogic.reset_game()
+    if prefetcher is not None:
+        prefetcher.restart() # swaps in the board prepared during the last game
+    else:
+        game.reset_game()     # your GameLogic.reset_game()
     text = ""             # clear input buffer
     message = ""          # clear any prior message
     cover_color = "BLACK" # so the start UI text boxes render
-    render_ui()
     
 
 def draw_title():
     title_text = "Minesweeper"
     
-    title_surface = title_font.render(title_text, True, RED)
-    shadow_surface = title_font.render(title_text, True, BLACK) # shadow for added effect
+    title_surface = text_cache.render(font("title"), title_text, RED)
+    shadow_surface = text_cache.render(font("title"), title_text, BLACK) # shadow for added effect
 
     title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 90))
     shadow_rect = shadow_surface.get_rect(center=(SCREEN_WIDTH // 2 + 2, 92))  # slight offset for shadow
@@ -156,15 +359,31 @@ def draw_title():
     screen.blit(title_surface, title_rect)
 
 
-def update_mine_counter():
-    text = f"Mines Remaining: {game.flags_remaining}"
+# draw "Mines Remaining: N", after a full draw only the digits that changed are redrawn
+# returns the screen rects that changed
+def update_mine_counter(full=True):
+    global drawn_flags_remaining, mine_counter_digits
+    if not full and mine_counter_digits is not None:
+        drawn_flags_remaining = game.flags_remaining
+        return mine_counter_digits.draw(screen, game.flags_remaining)
 
-    mine_counter = mine_count_font.render(text, True, BLACK)
-    mine_counter_rect = mine_counter.get_rect(center=(SCREEN_WIDTH // 2, 175))
+    screen.fill(WHITE, MINE_COUNTER_AREA)
+    label = text_cache.render(font("mine_count"), "Mines Remaining: ", BLACK)
 
-    pygame.draw.rect(screen, WHITE, mine_counter_rect, 10)
+    # one digit slot per digit of the mine count, the label and digits are centered together
+    slots = max(len(str(game.total_mines)), len(str(game.flags_remaining)))
+    if mine_counter_digits is None or mine_counter_digits.slots != slots:
+        mine_counter_digits = DigitField(text_cache, font("mine_count"), BLACK, WHITE, slots, (0, 0))
+    digits = mine_counter_digits
+    label_rect = label.get_rect()
+    label_rect.left = SCREEN_WIDTH // 2 - (label_rect.width + digits.rect.width) // 2
+    label_rect.centery = 175
+    digits.rect.midleft = label_rect.midright
 
-    screen.blit(mine_counter, mine_counter_rect)
+    screen.blit(label, label_rect)
+    digits.draw(screen, game.flags_remaining, full=True)
+    drawn_flags_remaining = game.flags_remaining
+    return [MINE_COUNTER_AREA]
 
 
 def render_win_or_loss():
@@ -175,33 +394,116 @@ def render_win_or_loss():
     else:
         return
 
-    result = win_loss_font.render(title, True, BLACK)
+    result = text_cache.render(font("win_loss"), title, BLACK)
     result_rect = result.get_rect(center=(SCREEN_WIDTH // 2, 250))
     screen.blit(result, result_rect)
 
-    hint_font = pygame.font.SysFont("arialblack", 20)
-    hint = hint_font.render("Press R to restart", True, BLACK)
+    hint = text_cache.render(font("hint"), "Press R to restart", BLACK)
     screen.blit(hint, hint.get_rect(center=(SCREEN_WIDTH // 2, 285)))
 
 
 
 def render_ui():
+    global full_redraw
+    if metrics is not None:
+        start = time.perf_counter()
     # reset screen with updated ui
     screen.fill(WHITE)              
     draw_title()
     render_board()
     update_mine_counter()
     render_win_or_loss()
+    full_redraw = True
+    if metrics is not None:
+        metrics.elapsed("render", start)
+
+
+# turn instrumentation on, it stays on for the rest of the session
+def enable_metrics(dump_path=None):
+    global metrics
+    if metrics is None:
+        metrics = Metrics(dump_path)
+        metrics.attach(game)
+    return metrics
+
+
+# draw the debug overlay over whatever is in the top left corner
+def render_overlay():
+    overlay_font = font("overlay")
+    screen.fill(BLACK, OVERLAY_AREA)
+    y = OVERLAY_AREA.y + 4
+    for line in metrics.overlay_lines():
+        screen.blit(overlay_font.render(line, True, WHITE), (OVERLAY_AREA.x + 6, y)) # changes every frame, not cached
+        y += 17
+    dirty_rects.append(OVERLAY_AREA)
+
+
+# the statistics database is opened the first time a game finishes or the statistics screen is shown
+def open_stats():
+    global stats
+    if stats is None:
+        stats = GameStats(board_args.stats_db, batch_size=1) # a game every few minutes, written as it finishes
+    return stats
+
+
+def record_game(record):
+    open_stats().add(record)
+
+
+# the hint worker process is started the first time a hint or the heatmap is asked for
+def open_hints():
+    global hints
+    if hints is None:
+        from HintWorker import HintWorker # only imported when used, it pulls in multiprocessing
+        # results arrive on the worker's listener thread, posting an event wakes the loop to draw them
+        hints = HintWorker(game, on_result=lambda: pygame.event.post(pygame.event.Event(HINT_EVENT)))
+    return hints
+
+
+# lines of the statistics screen for the current board size and mine count
+def stats_lines():
+    store = open_stats()
+    rows, cols, mines = game.board.rows, game.board.cols, game.total_mines or None
+    totals = store.totals(rows, cols, mines)
+    title = f"Statistics: {rows} x {cols}" + (f", {mines} mines" if mines else ", all mine counts")
+    lines = [(title, "stats_title"),
+             (f"Games: {totals['games']}   Wins: {totals['wins']} ({totals['win_rate']:.0%})   "
+              f"Average: {totals['mean_duration']:.1f}s, {totals['mean_clicks']:.0f} clicks", "stats")]
+    if totals["wins"]:
+        percentiles = store.duration_percentiles(rows, cols, mines)
+        lines.append(("Win times: " + "   ".join(f"p{p} {seconds:.1f}s" for p, seconds in percentiles.items()), "stats"))
+    if mines:
+        best = store.best_times(rows, cols, mines, limit=5)
+        if best:
+            lines.append(("Best times: " + "   ".join(f"{duration:.1f}s" for duration, _, _, _ in best), "stats"))
+    by_density = store.win_rate_by_density(step=0.05)
+    if by_density:
+        lines.append(("Win rate by mine density (all boards):", "stats"))
+        for density, games, rate in by_density[:8]:
+            lines.append((f"{density:.0%} - {density + 0.05:.0%}:   {rate:.0%} of {games} games", "stats"))
+    lines.append(("Press F2 to close", "stats"))
+    return lines
+
+
+# draw the statistics screen over the board
+def render_stats():
+    screen.fill(WHITE, STATS_AREA)
+    pygame.draw.rect(screen, BLACK, STATS_AREA, 2)
+    y = STATS_AREA.y + 16
+    for line, font_name in stats_lines():
+        surface = text_cache.render(font(font_name), line, BLACK)
+        screen.blit(surface, surface.get_rect(midtop=(STATS_AREA.centerx, y)))
+        y += surface.get_height() + 8
 
 
 def render_start_ui(text, message, cover_color):
     # write text box that states invalid input
-    message_box = mine_prompt_font.render(message, True, cover_color)
+    message_box = text_cache.render(font("mine_prompt"), message, cover_color)
     message_rect = message_box.get_rect(center=(SCREEN_WIDTH//2, 700))
     screen.blit(message_box, message_rect)
     
     # write text box that states "Enter number of mines (10-20), then press ENTER:"
-    label = mine_prompt_font.render("Enter number of mines (10-20), then press ENTER:", True, cover_color)
+    label = text_cache.render(font("mine_prompt"), "Enter number of mines (10-20), then press ENTER:", cover_color)
     label_rect = label.get_rect(center=(SCREEN_WIDTH//2, 220))
     screen.blit(label, label_rect)
 
@@ -210,7 +512,7 @@ def render_start_ui(text, message, cover_color):
     pygame.draw.rect(screen, cover_color, mine_input_box, 2)
 
     # render text inside the box
-    txt_surface = mine_prompt_font.render(text, True, BLACK)
+    txt_surface = text_cache.render(font("mine_prompt"), text, BLACK)
     text_rect = txt_surface.get_rect(center=(SCREEN_WIDTH // 2, 265))
     screen.blit(txt_surface, text_rect)
 
@@ -220,53 +522,252 @@ text = '' #user input
 message = '' #response from user input
 cover_color = 'BLACK' # used to cover objects after game is initialized
 
-assets = load_assets() # load assets from asset folder
-
-render_ui() # initial render 
-
-running = True
-while running: # game event loop
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT: # exit loop if game is terminated
-            running = False
-
-        if game.state.name == "Start": # before starting game
-
-            render_ui() # refresh screen
-
-            if event.type == pygame.KEYDOWN: # when a key is pressed
-
-                response = input_handler.handle_keyboard_input(game, event, text) # send event to input handler 
-                text = response.message # get input from input handler's response
-                
-                if response.response_code.value == 0: # if input is sucessful
-                    cover_color = "WHITE" # change cover color to white to clear initial UI text boxes
-                    text = "Start by Clicking Any Tile"
-                    render_ui() # refresh screen for updated mine count
-                    game.start_game() # start game
-
-                elif response.response_code.value == 1: # if input is invalid
-                    message = text # set message to invalid response text
-                    text = "" # clear user input
-
-            render_start_ui(text, message, cover_color) # render all of the pre-game ui elements
-                
-        elif game.state.name == "Playing": # once game has started   
-                
-            if event.type == pygame.MOUSEBUTTONDOWN: 
-                coords = coords_to_index(event.pos) # convert click to coords on grid
-                if coords: # if valid coords
-                    x, y = coords
-                    response = input_handler.handle_click(game, event, x, y) # send input to input handler
-
-                render_ui() # after input is sent and handled, render board, update mine counter, check for win/loss
-
-        elif game.state.name in ("EndLose", "EndWin"):
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
-                restart_to_start()  # sets state back to Start, clears UI vars
-            render_ui()  # shows end screen; your render_board() reveals bombs while in End*
-
-    pygame.display.flip()
-    clock.tick(60)
+full_redraw = False # whole window needs to be pushed on the next present()
+dirty_rects = [] # screen rects changed since the last present()
+drawn_flags_remaining = None # mine counter value currently on screen
+mine_counter_digits = None # DigitField for the mine counter, sized for the current mine count
+
+metrics = None # Instrumentation.Metrics while instrumentation is on
+show_overlay = False # debug overlay visible
+stats = None # GameStats, opened when first needed
+show_stats = False # statistics screen visible
+hints = None # HintWorker, started when first needed
+show_heatmap = False # mine probability heatmap visible
+hint_job = None # hint worker job the hint key asked for, the hint is shown while that job is current
+heat_cache = {} # sprite size -> heatmap shade per plane value
+number_cache = {} # (sprite size, largest neighborhood) -> sprite per neighbor count
+
+# created by setup(), nothing is initialized or opened when this module is only imported
+board_args = None # parsed command line
+game = None
+prefetcher = None # BoardPrefetcher, None for no-guess games
+history = None # UndoHistory of the game's uncovers and flags
+input_handler = None
+screen = None
+clock = None
+viewport = None
+raw_assets = None # sprites at atlas size, loaded by load_assets() the first time a board is drawn
+assets = None # sprites scaled for the current zoom level
+sprite_seconds = 0.0 # time spent loading the sprites, reported by --startup-time
+
+
+# create the game and open the window
+def setup(args):
+    global board_args, game, prefetcher, history, input_handler, screen, clock, viewport
+    board_args = args
+    if args.no_guess: # boards are generated in background processes and dealt on the first click
+        from BoardPool import BoardPool, NoGuessGame # only imported for these games, it pulls in multiprocessing
+        game = NoGuessGame(args.rows, args.cols, BoardPool())
+    else:
+        game = GameLogic(args.rows, args.cols)
+    # the next board is prepared in the background during each game so restarting is instant
+    prefetcher = BoardPrefetcher(game) if not args.no_guess else None
+    history = UndoHistory(game)
+    if not args.no_stats:
+        StatsRecorder(game, record_game)
+    input_handler = InputHandler()
+
+    # only the display is started here, fonts start with the first text drawn and the game has no sound
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_LENGTH))
+    pygame.display.set_caption("MineSweeper")
+    screen.fill("white")
+    clock = pygame.time.Clock()
+    viewport = Viewport(BOARD_AREA, game.board.rows, game.board.cols, DISTANCE_BETWEEN_CELLS)
+
+
+def print_startup_time(setup_start, frame_start, shown):
+    print(f"time to first frame: {(shown - STARTED) * 1000:.1f}ms")
+    print(f"  imports      {(setup_start - STARTED) * 1000:8.1f}ms")
+    print(f"  setup        {(frame_start - setup_start) * 1000:8.1f}ms")
+    print(f"  first frame  {(shown - frame_start) * 1000:8.1f}ms"
+          f"  (sprites {sprite_seconds * 1000:.1f}ms, fonts {text_cache.font_seconds * 1000:.1f}ms)")
+
+# sleep until input arrives, then take everything queued so a burst of events is handled as one batch
+def wait_for_events():
+    if board_args.poll:
+        return pygame.event.get()
+    event = pygame.event.wait(IDLE_TIMEOUT)
+    if event.type == pygame.NOEVENT: # timed out
+        return []
+    return [event] + pygame.event.get()
+
+
+# run the game until the window is closed
+# the screen is only redrawn after events that change something, and at most once per batch of events
+def main(argv=None):
+    global text, message, cover_color, show_overlay, show_stats, show_heatmap, hint_job
+    setup_start = time.perf_counter()
+    setup(arg_parser.parse_known_args(argv)[0])
+    if board_args.profile or board_args.metrics_file:
+        enable_metrics(board_args.metrics_file)
+        show_overlay = board_args.profile
+    frame_start = time.perf_counter()
+    render_ui() # initial render 
+    render_start_ui(text, message, cover_color)
+    if board_args.startup_time:
+        present()
+        print_startup_time(setup_start, frame_start, time.perf_counter())
+        pygame.quit()
+        return
 
-pygame.quit()
+    running = True
+    while running: # game event loop
+        events = wait_for_events()
+        frame_start = time.perf_counter() # read even while metrics are off, F3 can turn them on mid-frame
+        had_input = False
+
+        redraw = False # whole screen needs to be redrawn
+        start_ui = False # start prompt needs to be drawn over the redrawn screen
+        changed_cells = [] # cells changed by clicks, redrawn on their own when nothing else needs a redraw
+        for event in events:
+            if event.type == pygame.QUIT: # exit loop if game is terminated
+                running = False
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3: # debug overlay
+                enable_metrics()
+                show_overlay = not show_overlay
+                redraw = True # clears the overlay when it is hidden
+                start_ui = game.state.name == "Start"
+                continue
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2 and not board_args.no_stats: # statistics
+                show_stats = not show_stats
+                redraw = True
+                start_ui = game.state.name == "Start"
+                continue
+
+            if event.type == HINT_EVENT: # the hint worker has a new estimate, shown on the next redraw
+                if (show_heatmap or shown_hint() is not None) and not show_stats:
+                    redraw = True
+                continue
+
+            if show_stats and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL): # the board is covered
+                continue
+
+            if metrics is not None and event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL):
+                had_input = True
+
+            # ctrl+z undoes the last uncover or flag, a losing click included, ctrl+y redoes it
+            if event.type == pygame.KEYDOWN and event.key in (pygame.K_z, pygame.K_y) and event.mod & pygame.KMOD_CTRL:
+                changes = history.undo() if event.key == pygame.K_z else history.redo()
+                if changes is not None and changes.state_changed: # back from or into a win or loss
+                    redraw = True
+                    start_ui = False
+                elif changes is not None:
+                    changed_cells.extend(changes.cells)
+                continue
+
+            if game.state.name == "Start": # before starting game
+
+                if event.type == pygame.KEYDOWN: # when a key is pressed
+
+                    response = input_handler.handle_keyboard_input(game, event, text) # send event to input handler 
+                    text = response.message # get input from input handler's response
+
+                    if response.response_code.value == 0: # if input is sucessful
+                        cover_color = "WHITE" # change cover color to white to clear initial UI text boxes
+                        text = "Start by Clicking Any Tile"
+                        game.start_game() # start game
+                        if prefetcher is not None:
+                            prefetcher.prepare(game.total_mines) # next game's board, most players keep the mine count
+
+                    elif response.response_code.value == 1: # if input is invalid
+                        message = text # set message to invalid response text
+                        text = "" # clear user input
+
+                    redraw = start_ui = True # render all of the pre-game ui elements
+
+            elif game.state.name == "Playing": # once game has started   
+
+                if handle_view_event(event): # scrolled or zoomed
+                    redraw = True
+                    start_ui = False
+
+                # h outlines the safest cell, p toggles the mine probability heatmap, both are worked out in the
+                # background and drawn when ready
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    open_hints().request()
+                    hint_job = hints.job
+                    redraw = True
+
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                    show_heatmap = not show_heatmap
+                    open_hints().follow(show_heatmap)
+                    redraw = True
+
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3): 
+                    coords = coords_to_index(event.pos) # convert click to coords on grid
+                    if coords: # if valid coords
+                        x, y = coords
+                        if metrics is not None:
+                            logic_start = time.perf_counter()
+                        response = input_handler.handle_click(game, event, x, y) # send input to input handler
+                        if metrics is not None:
+                            metrics.elapsed("logic", logic_start)
+
+                        if response.changes.state_changed: # win or loss, redraw everything to reveal mines and show result
+                            redraw = True
+                            start_ui = False
+                        else: # otherwise only redraw the cells and counter that changed
+                            changed_cells.extend(response.changes.cells)
+
+            elif game.state.name in ("EndLose", "EndWin"):
+                if handle_view_event(event): # the revealed board can still be scrolled and zoomed
+                    redraw = True
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+                    restart_to_start()  # sets state back to Start, clears UI vars
+                    redraw = start_ui = True
+
+        if show_stats and changed_cells: # undone cells under the statistics screen, redraw it on top
+            redraw = True
+        if redraw:
+            render_ui()
+            if start_ui:
+                render_start_ui(text, message, cover_color)
+            if show_stats:
+                render_stats()
+        elif changed_cells:
+            render_changes(changed_cells)
+
+        if metrics is None:
+            present()
+        else:
+            if not events and not show_overlay and metrics.dump_path is None:
+                continue
+            # events handled includes the logic and render time spent on them
+            events_done = time.perf_counter()
+            if events:
+                metrics.record("events", (events_done - frame_start) * 1e6)
+            if show_overlay:
+                render_overlay()
+            present_start = time.perf_counter()
+            present()
+            now = time.perf_counter()
+            if redraw or changed_cells:
+                metrics.record("present", (now - present_start) * 1e6)
+                metrics.record("frame", (now - frame_start) * 1e6)
+            # events are read as soon as they arrive, so this is the time from receiving an input to showing it
+            if had_input:
+                metrics.record("input_latency", (now - frame_start) * 1e6)
+            metrics.maybe_dump(now)
+
+        if redraw or changed_cells or board_args.poll:
+            clock.tick(FRAME_RATE) # cap the frame rate, input arriving meanwhile is batched into the next frame
+
+    if metrics is not None and metrics.dump_path is not None:
+        metrics.dump()
+    if board_args.no_guess:
+        game.pool.close()
+    if stats is not None:
+        stats.close()
+    if hints is not None:
+        hints.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    if getattr(sys, "frozen", False): # packaged builds start the no-guess pool workers from this executable
+        import multiprocessing
+        multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,119 @@
+'''
+Viewport.py
+Description: Camera over the game board for boards larger than the window. Tracks the scroll offset and zoom level,
+             maps between board cells and screen pixels, reports which cells are visible so only those are drawn,
+             and caches the tile sprites scaled for each zoom level.
+Inputs: Screen area for the board, board dimensions, raw tile images
+Outputs: Visible cell ranges, cell rectangles, scaled sprites
+Author: Team 26
+External Sources Used: None, all code is original
+Creation Date: 10/18/2026
+'''
+
+import pygame
+
+
+DEFAULT_PITCH = 36 # distance between cell origins in pixels at the default zoom (32px sprite + 4px gap)
+MIN_PITCH = 8
+MAX_PITCH = 96
+SPRITE_RATIO = 32 / 36 # fraction of the pitch covered by the sprite, the rest is the gap
+ZOOM_STEP = 1.25
+MAX_CACHED_ZOOMS = 8 # scaled sprite sets kept around
+
+
+class Viewport:
+  '''scroll and zoom state for drawing a rows x cols board inside a screen area'''
+  def __init__(self, area, rows, cols, pitch=DEFAULT_PITCH):
+    self.area = pygame.Rect(area)
+    self.rows = rows
+    self.cols = cols
+    self.pitch = pitch
+    # board pixel shown at the top left corner of the area
+    self.offset_x = 0
+    self.offset_y = 0
+    self.sprite_cache = {} # sprite size -> {name: scaled surface}, in insertion order for eviction
+    self.clamp()
+
+  @property
+  def sprite_size(self):
+    return max(1, round(self.pitch * SPRITE_RATIO))
+
+  def clamp(self):
+    '''keep the view on the board, a board narrower than the area is centered and a shorter one is top aligned'''
+    width, height = self.cols * self.pitch, self.rows * self.pitch
+    if width <= self.area.width:
+      self.offset_x = -((self.area.width - width) // 2)
+    else:
+      self.offset_x = min(max(self.offset_x, 0), width - self.area.width)
+    if height <= self.area.height:
+      self.offset_y = 0
+    else:
+      self.offset_y = min(max(self.offset_y, 0), height - self.area.height)
+
+  def pan(self, dx, dy):
+    '''scroll by (dx, dy) screen pixels, returns True if the view moved'''
+    before = (self.offset_x, self.offset_y)
+    self.offset_x += dx
+    self.offset_y += dy
+    self.clamp()
+    return (self.offset_x, self.offset_y) != before
+
+  def zoom(self, steps, anchor=None):
+    '''zoom in (steps > 0) or out around the screen point anchor, returns True if the zoom changed'''
+    pitch = self.pitch
+    for _ in range(abs(steps)):
+      pitch = max(pitch + 1, round(pitch * ZOOM_STEP)) if steps > 0 else min(pitch - 1, round(pitch / ZOOM_STEP))
+    pitch = min(max(pitch, MIN_PITCH), MAX_PITCH)
+    if pitch == self.pitch:
+      return False
+
+    # keep the board point under the anchor in place
+    ax, ay = anchor if anchor is not None else self.area.center
+    board_x = (ax - self.area.x + self.offset_x) / self.pitch
+    board_y = (ay - self.area.y + self.offset_y) / self.pitch
+    self.pitch = pitch
+    self.offset_x = round(board_x * pitch) - (ax - self.area.x)
+    self.offset_y = round(board_y * pitch) - (ay - self.area.y)
+    self.clamp()
+    return True
+
+  def visible_range(self):
+    '''(first row, end row, first col, end col) of the cells at least partly inside the area'''
+    pitch = self.pitch
+    first_col = max(self.offset_x // pitch, 0)
+    end_col = min(-(-(self.offset_x + self.area.width) // pitch), self.cols)
+    first_row = max(self.offset_y // pitch, 0)
+    end_row = min(-(-(self.offset_y + self.area.height) // pitch), self.rows)
+    return first_row, end_row, first_col, end_col
+
+  def is_visible(self, row, col):
+    first_row, end_row, first_col, end_col = self.visible_range()
+    return first_row <= row < end_row and first_col <= col < end_col
+
+  def cell_rect(self, row, col):
+    '''screen rectangle of the sprite for (row, col)'''
+    size = self.sprite_size
+    return pygame.Rect(self.area.x + col * self.pitch - self.offset_x,
+                       self.area.y + row * self.pitch - self.offset_y, size, size)
+
+  def cell_at(self, pos):
+    '''(row, col) of the cell under screen position pos, or None outside the board'''
+    x, y = pos
+    if not self.area.collidepoint(x, y):
+      return None
+    col = (x - self.area.x + self.offset_x) // self.pitch
+    row = (y - self.area.y + self.offset_y) // self.pitch
+    if 0 <= row < self.rows and 0 <= col < self.cols:
+      return int(row), int(col)
+    return None
+
+  def sprites(self, images):
+    '''images scaled to the current sprite size, scaled once per zoom level and then reused'''
+    size = self.sprite_size
+    scaled = self.sprite_cache.get(size)
+    if scaled is None:
+      scaled = {name: pygame.transform.scale(image, (size, size)) for name, image in images.items()}
+      self.sprite_cache[size] = scaled
+      if len(self.sprite_cache) > MAX_CACHED_ZOOMS:
+        del self.sprite_cache[next(iter(self.sprite_cache))] # drop the oldest zoom level
+    return scaled